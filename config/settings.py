@@ -46,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'outcomes.middleware.RequestMetricsMiddleware',
+    'outcomes.middleware.RequestRecorderMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,6 +55,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'outcomes.middleware.NPlusOneMiddleware',
+    'outcomes.middleware.CalculationCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -95,6 +99,68 @@ DATABASES = {
 
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The 'calculations' cache must be shared by all worker processes so that
+# identical concurrent calculations run only once (see outcomes/caching.py).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'calculations': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'calculations',
+    },
+}
+
+# Directory holding the cross-process single-flight lock files
+SINGLE_FLIGHT_LOCK_DIR = BASE_DIR / '.cache' / 'locks'
+
+# Seconds a coalesced result stays available to late-arriving callers
+SINGLE_FLIGHT_TIMEOUT = 60
+
+# Maximum number of sub-requests accepted by POST /api/batch/
+BATCH_MAX_REQUESTS = 50
+
+# GET /api/changes/: entries per batch by default and at most (?limit=)
+CHANGE_FEED_BATCH_SIZE = 500
+CHANGE_FEED_MAX_BATCH_SIZE = 5000
+
+# Letter grade cut points default to outcomes.grading.GRADE_CUTOFFS; set
+# GRADE_CUTOFFS = [(minimum, grade), ...] (best first) to replace them.
+# POST /api/offerings/{id}/compute_grades/ may override single ones
+
+# Server-sent event streams: seconds between keepalive comments and
+# seconds before a stream closes (clients reconnect automatically)
+SSE_HEARTBEAT = 15
+SSE_MAX_DURATION = 300
+
+# Per-request SQL/serializer/calculation metrics log (one JSON line per
+# request, rotated by size); None is off and only sends Server-Timing headers
+REQUEST_METRICS_LOG = None  # e.g. BASE_DIR / 'logs' / 'request_metrics.log'
+REQUEST_METRICS_LOG_MAX_BYTES = 10 * 1024 * 1024
+REQUEST_METRICS_LOG_BACKUPS = 5
+
+# Traffic recording for replay_requests: one JSON line per request (rotated
+# by size) for a REQUEST_RECORDER_SAMPLE_RATE share of requests; None is off.
+# Paths starting with a REQUEST_RECORDER_EXCLUDE prefix are never recorded
+REQUEST_RECORDER_LOG = None  # e.g. BASE_DIR / 'logs' / 'requests.jsonl'
+REQUEST_RECORDER_LOG_MAX_BYTES = 50 * 1024 * 1024
+REQUEST_RECORDER_LOG_BACKUPS = 5
+REQUEST_RECORDER_SAMPLE_RATE = 1.0
+REQUEST_RECORDER_MAX_BODY = 64 * 1024
+REQUEST_RECORDER_EXCLUDE = ['/admin/', '/api/stream/']
+
+# N+1 query detection: 'off', 'log' (warning with stack trace) or 'raise'.
+# Requests use NPLUSONE_MODE, tests run by NPlusOneTestRunner use
+# NPLUSONE_TEST_MODE; a SELECT repeated NPLUSONE_THRESHOLD times is reported
+NPLUSONE_MODE = 'log' if DEBUG else 'off'
+NPLUSONE_TEST_MODE = 'raise'
+NPLUSONE_THRESHOLD = 3
+TEST_RUNNER = 'outcomes.nplusone.NPlusOneTestRunner'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
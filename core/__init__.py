@@ -0,0 +1,5 @@
+"""
+Model and queryset support shared by the apps. It depends on Django only, so
+``students``, ``courses``, ``professors`` and ``outcomes`` can all build on
+it without importing each other.
+"""
@@ -0,0 +1,20 @@
+"""
+Model support for denormalized columns that only set-based code writes.
+"""
+
+
+class ProtectedColumnsMixin:
+    """
+    Leaves ``protected_columns`` out of ``save()`` on existing rows, so that a
+    stale instance never overwrites counters maintained with ``F()`` updates
+    (see ``outcomes.counters``).
+    """
+    protected_columns = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.protected_columns
+            ]
+        super().save(*args, **kwargs)
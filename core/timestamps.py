@@ -0,0 +1,40 @@
+"""
+``updated_at`` maintenance for the models served to delta-sync clients
+(``?updated_since=``, see ``outcomes.sync``).
+
+``TimestampedMixin`` sets it on every save of an existing row, including
+``save(update_fields=...)``; ``TimestampedQuerySet`` sets it on ``update()``
+and ``bulk_update()``, which bypass ``save()``. Raw SQL writes and the
+``SET_NULL`` updates Django runs when a related row is deleted leave it
+alone.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class TimestampedQuerySet(models.QuerySet):
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if 'updated_at' not in fields:
+            now = timezone.now()
+            for obj in objs:
+                obj.updated_at = now
+            fields = [*fields, 'updated_at']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
+
+
+class TimestampedMixin:
+    """Model mixin; the model defines ``updated_at`` and uses a ``TimestampedQuerySet``."""
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding and (update_fields is None or update_fields):
+            self.updated_at = timezone.now()
+            if update_fields is not None and 'updated_at' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'updated_at']
+        super().save(*args, **kwargs)
@@ -0,0 +1,74 @@
+"""
+Signals for the bulk write paths, which bypass ``save()`` and with it
+``post_save`` and ``post_delete``.
+
+Models whose derived state has to follow every write use a
+``TrackedQuerySet``. It sends
+
+* ``rows_created`` after ``bulk_create()``, with the created ``objs`` and
+  ``conflicts``, true when ``ignore_conflicts`` or ``update_conflicts`` was
+  given (some of the rows may then have been updated or left alone);
+* ``rows_updating`` before ``update()``, which ``bulk_update()`` runs per
+  batch, with the ``queryset`` and the ``values`` it writes. A receiver
+  reads what it needs while the filter still matches the old rows and may
+  return a callable, which is called without arguments once the UPDATE ran.
+
+Raw SQL writes are not seen.
+"""
+from django.db.models import Value
+from django.dispatch import Signal
+
+from .timestamps import TimestampedQuerySet
+
+
+rows_created = Signal()
+rows_updating = Signal()
+
+
+def update_transitions(queryset, values, fields):
+    """
+    ``{pk: (old, new)}`` for ``queryset.update(**values)``: the ``fields`` of
+    each row before and after it, read in one query before the UPDATE runs.
+    """
+    opts = queryset.model._meta
+    annotations = {}
+    for name, value in values.items():
+        field = opts.get_field(name)
+        if field.name not in fields:
+            continue
+        if not hasattr(value, 'resolve_expression'):
+            value = Value(getattr(value, 'pk', value), output_field=field.target_field if field.is_relation else field)
+        annotations[f'new_{field.name}'] = value
+    attnames = [opts.get_field(name).attname for name in fields]
+    rows = queryset.order_by().annotate(**annotations).values_list('pk', *attnames, *annotations)
+    transitions = {}
+    for pk, *row in rows:
+        old = tuple(row[:len(fields)])
+        new_values = dict(zip(annotations, row[len(fields):]))
+        new = tuple(new_values.get(f'new_{name}', value) for name, value in zip(fields, old))
+        transitions[pk] = (old, new)
+    return transitions
+
+
+def updated_fields(model, values):
+    """Names of the fields ``update(**values)`` writes (``values`` may use attnames)."""
+    return {model._meta.get_field(name).name for name in values}
+
+
+class TrackedQuerySet(TimestampedQuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        conflicts = bool(kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'))
+        rows_created.send(sender=self.model, objs=objs, conflicts=conflicts)
+        return objs
+
+    def update(self, **kwargs):
+        followers = [
+            response for _, response in rows_updating.send(sender=self.model, queryset=self, values=kwargs)
+            if callable(response)
+        ]
+        rows = super().update(**kwargs)
+        for follow in followers:
+            follow()
+        return rows
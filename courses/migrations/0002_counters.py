@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='assessment_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Assessments of all offerings'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='enrolled_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Enrollments in all terms'),
+        ),
+    ]
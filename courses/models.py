@@ -2,8 +2,12 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from core.denormalized import ProtectedColumnsMixin
+from core.timestamps import TimestampedMixin
+from core.tracking import TrackedQuerySet
 
-class Course(models.Model):
+
+class Course(TimestampedMixin, ProtectedColumnsMixin, models.Model):
     name = models.CharField(max_length=200)
     code = models.CharField(max_length=20, unique=True)
     credit = models.IntegerField(
@@ -29,8 +33,14 @@ class Course(models.Model):
     )
     is_elective = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    enrolled_count = models.IntegerField(default=0, editable=False, help_text="Enrollments in all terms")
+    assessment_count = models.IntegerField(default=0, editable=False, help_text="Assessments of all offerings")
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TrackedQuerySet.as_manager()
+
+    protected_columns = ('enrolled_count', 'assessment_count')
 
     class Meta:
         ordering = ['code']
@@ -39,3 +49,10 @@ class Course(models.Model):
 
     def __str__(self):
         return f"{self.code} - {self.name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the post_save receiver skip the credit recount when credit is unchanged
+        instance._loaded_credit = instance.__dict__.get('credit')
+        return instance
@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from outcomes.expand import ExpandableSerializerMixin
+from outcomes.instrumentation import TimedSerializerMixin
 from .models import Course
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'prerequisites': 'courses.serializers.CourseSerializer',
+        'learning_outcomes': 'outcomes.serializers.LearningOutcomeSerializer',
+    }
+
     prerequisite_codes = serializers.SerializerMethodField()
     
     class Meta:
@@ -10,7 +17,7 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'code', 'credit', 'description', 'course_level',
             'prerequisites', 'prerequisite_codes', 'is_elective', 'is_active',
-            'created_at', 'updated_at'
+            'enrolled_count', 'assessment_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
     
@@ -1,9 +1,11 @@
 from rest_framework import viewsets
 from .models import Course
+from outcomes.expand import ExpandMixin
+from outcomes.sync import UpdatedSinceMixin
 from .serializers import CourseSerializer
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all()
+class CourseViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
+    queryset = Course.objects.prefetch_related('prerequisites').all()
     serializer_class = CourseSerializer
 
 # Create your views here.
@@ -25,6 +25,7 @@ class ProgramLearningOutcomeAdmin(admin.ModelAdmin):
 @admin.register(Enrollment)
 class EnrollmentAdmin(admin.ModelAdmin):
     list_display = ['student', 'course', 'semester', 'year', 'grade', 'status']
+    list_select_related = ['student', 'course']
     list_filter = ['semester', 'year', 'status', 'grade']
     search_fields = ['student__name', 'course__code', 'course__name']
     raw_id_fields = ['student', 'course']
@@ -33,6 +34,7 @@ class EnrollmentAdmin(admin.ModelAdmin):
 @admin.register(CourseOffering)
 class CourseOfferingAdmin(admin.ModelAdmin):
     list_display = ['course', 'professor', 'semester', 'year', 'section', 'capacity', 'is_active']
+    list_select_related = ['course', 'professor']
     list_filter = ['semester', 'year', 'is_active']
     search_fields = ['course__code', 'course__name', 'professor__name']
     raw_id_fields = ['course', 'professor']
@@ -41,6 +43,7 @@ class CourseOfferingAdmin(admin.ModelAdmin):
 @admin.register(CoursePLOMapping)
 class CoursePLOMappingAdmin(admin.ModelAdmin):
     list_display = ['course', 'plo', 'contribution_level', 'weight_percentage']
+    list_select_related = ['course', 'plo']
     list_filter = ['contribution_level']
     search_fields = ['course__code', 'plo__short_name']
     raw_id_fields = ['course', 'plo']
@@ -49,6 +52,7 @@ class CoursePLOMappingAdmin(admin.ModelAdmin):
 @admin.register(StudentPLOAchievement)
 class StudentPLOAchievementAdmin(admin.ModelAdmin):
     list_display = ['student', 'plo', 'enrollment', 'achievement_level', 'score', 'assessed_at']
+    list_select_related = ['student', 'plo', 'enrollment__student', 'enrollment__course']
     list_filter = ['achievement_level', 'assessed_at']
     search_fields = ['student__name', 'plo__short_name']
     raw_id_fields = ['student', 'plo', 'enrollment']
@@ -58,6 +62,7 @@ class StudentPLOAchievementAdmin(admin.ModelAdmin):
 @admin.register(LearningOutcome)
 class LearningOutcomeAdmin(admin.ModelAdmin):
     list_display = ['code', 'course', 'bloom_level', 'plo', 'weight_percentage', 'is_active']
+    list_select_related = ['course', 'plo']
     list_filter = ['bloom_level', 'is_active', 'course']
     search_fields = ['code', 'description', 'course__code', 'course__name']
     raw_id_fields = ['course', 'plo']
@@ -76,6 +81,7 @@ class ProgramOutcomeAdmin(admin.ModelAdmin):
 @admin.register(Assessment)
 class AssessmentAdmin(admin.ModelAdmin):
     list_display = ['name', 'course_offering', 'assessment_type', 'max_score', 'weight_percentage', 'due_date', 'is_graded']
+    list_select_related = ['course_offering__course']
     list_filter = ['assessment_type', 'is_graded', 'due_date']
     search_fields = ['name', 'description', 'course_offering__course__code']
     raw_id_fields = ['course_offering']
@@ -87,6 +93,7 @@ class AssessmentAdmin(admin.ModelAdmin):
 @admin.register(AssessmentLOMapping)
 class AssessmentLOMappingAdmin(admin.ModelAdmin):
     list_display = ['assessment', 'learning_outcome', 'contribution_percentage']
+    list_select_related = ['assessment__course_offering__course', 'learning_outcome__course']
     search_fields = ['assessment__name', 'learning_outcome__code']
     raw_id_fields = ['assessment', 'learning_outcome']
 
@@ -94,6 +101,7 @@ class AssessmentLOMappingAdmin(admin.ModelAdmin):
 @admin.register(LOPOMapping)
 class LOPOMappingAdmin(admin.ModelAdmin):
     list_display = ['learning_outcome', 'program_outcome', 'weight']
+    list_select_related = ['learning_outcome__course', 'program_outcome']
     list_filter = ['weight']
     search_fields = ['learning_outcome__code', 'program_outcome__code']
     raw_id_fields = ['learning_outcome', 'program_outcome']
@@ -102,6 +110,7 @@ class LOPOMappingAdmin(admin.ModelAdmin):
 @admin.register(StudentAssessmentScore)
 class StudentAssessmentScoreAdmin(admin.ModelAdmin):
     list_display = ['student', 'assessment', 'score', 'normalized_score_display', 'graded_at']
+    list_select_related = ['student', 'assessment__course_offering__course']
     list_filter = ['graded_at', 'assessment__assessment_type']
     search_fields = ['student__name', 'assessment__name']
     raw_id_fields = ['student', 'assessment', 'enrollment']
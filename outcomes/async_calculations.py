@@ -0,0 +1,184 @@
+"""
+Async counterparts of the calculation functions in ``outcomes/models.py``.
+
+The formulas are the same; the difference is that independent lookups (one
+per program outcome, per course and per LO mapping) are awaited together with
+``asyncio.gather`` through Django's async ORM instead of one after another,
+and each LO score fetches the student's assessment scores in one query.
+Results are accumulated in the same order as the synchronous versions, so
+both produce identical numbers.
+"""
+import asyncio
+
+from .models import (
+    AssessmentLOMapping,
+    Enrollment,
+    LOPOMapping,
+    ProgramOutcome,
+    StudentAssessmentScore,
+    _build_po_summary,
+)
+
+
+async def alatest_completed_enrollment(student, course):
+    return await Enrollment.objects.filter(
+        student=student,
+        course=course,
+        status='COMPLETED'
+    ).order_by('-term_key').afirst()
+
+
+async def acalculate_lo_score(learning_outcome, student, enrollment=None):
+    """Async version of ``calculate_lo_score``."""
+    if enrollment is None:
+        enrollment = await alatest_completed_enrollment(student, learning_outcome.course_id)
+        if not enrollment:
+            return 0.0
+
+    lo_mappings = AssessmentLOMapping.objects.filter(
+        learning_outcome=learning_outcome
+    ).select_related('assessment')
+    if enrollment.course_offering_id:
+        lo_mappings = lo_mappings.filter(assessment__course_offering_id=enrollment.course_offering_id)
+
+    lo_mappings = [mapping async for mapping in lo_mappings]
+    if not lo_mappings:
+        return 0.0
+
+    # Only the columns of score_by_enrollment_idx, so the index covers the lookup
+    student_scores = {
+        score.assessment_id: score async for score in StudentAssessmentScore.objects.filter(
+            student=student,
+            enrollment=enrollment,
+            assessment_id__in=[mapping.assessment_id for mapping in lo_mappings]
+        ).only('assessment_id', 'normalized').order_by()
+    }
+
+    total_score = 0.0
+    total_weight = 0.0
+
+    for mapping in lo_mappings:
+        student_score = student_scores.get(mapping.assessment_id)
+        if student_score is None:
+            continue
+
+        student_score.assessment = mapping.assessment
+        weight = mapping.contribution_percentage / 100.0
+
+        total_score += student_score.normalized_score() * weight
+        total_weight += weight
+
+    if total_weight > 0:
+        return total_score / total_weight
+
+    return 0.0
+
+
+async def _amapping_contribution(mapping, student):
+    lo = mapping.learning_outcome
+    enrollment = await alatest_completed_enrollment(student, lo.course_id)
+    if not enrollment:
+        return 0.0
+    return await acalculate_lo_score(lo, student, enrollment)
+
+
+async def acalculate_po_score(program_outcome, student, course=None):
+    """Async version of ``calculate_po_score``."""
+    lo_po_mappings = LOPOMapping.objects.filter(
+        program_outcome=program_outcome
+    ).select_related('learning_outcome', 'learning_outcome__course')
+
+    if course:
+        lo_po_mappings = lo_po_mappings.filter(learning_outcome__course=course)
+
+    lo_po_mappings = [mapping async for mapping in lo_po_mappings]
+    if not lo_po_mappings:
+        return 0.0
+
+    lo_scores = await asyncio.gather(*(
+        _amapping_contribution(mapping, student) for mapping in lo_po_mappings
+    ))
+
+    weighted_sum = 0.0
+    total_weight = 0.0
+
+    for mapping, lo_score in zip(lo_po_mappings, lo_scores):
+        if lo_score > 0:
+            weighted_sum += lo_score * mapping.weight
+            total_weight += mapping.weight
+
+    if total_weight > 0:
+        return weighted_sum / total_weight
+
+    return 0.0
+
+
+async def _acourse_po_score(program_outcome, student, course):
+    completed = await Enrollment.objects.filter(
+        student=student,
+        course=course,
+        status='COMPLETED'
+    ).aexists()
+    if not completed:
+        return None
+    return await acalculate_po_score(program_outcome, student, course)
+
+
+async def _afinal_po_score(program_outcome, student, use_credits):
+    lo_mappings = LOPOMapping.objects.filter(
+        program_outcome=program_outcome
+    ).select_related('learning_outcome', 'learning_outcome__course')
+
+    courses = list(set([mapping.learning_outcome.course async for mapping in lo_mappings]))
+    if not courses:
+        return 0.0
+
+    course_scores = await asyncio.gather(*(
+        _acourse_po_score(program_outcome, student, course) for course in courses
+    ))
+
+    if use_credits:
+        weighted_sum = 0.0
+        total_credits = 0.0
+
+        for course, po_score in zip(courses, course_scores):
+            if po_score is not None and po_score > 0:
+                weighted_sum += po_score * course.credit
+                total_credits += course.credit
+
+        if total_credits > 0:
+            return weighted_sum / total_credits
+        return 0.0
+
+    po_scores = [score for score in course_scores if score is not None and score > 0]
+    if po_scores:
+        return sum(po_scores) / len(po_scores)
+    return 0.0
+
+
+async def acalculate_all_po_scores(student, use_credits=True):
+    """Async version of ``calculate_all_po_scores``."""
+    program_outcomes = [po async for po in ProgramOutcome.objects.filter(is_active=True)]
+
+    scores = await asyncio.gather(*(
+        _afinal_po_score(po, student, use_credits) for po in program_outcomes
+    ))
+
+    return dict(zip(program_outcomes, scores))
+
+
+async def aget_student_po_summary(student):
+    """Async version of ``get_student_po_summary``."""
+    counters = type(student).objects.filter(pk=student.pk).values_list('completed_courses', 'completed_credits')
+
+    po_scores, (completed_courses, total_credits) = await asyncio.gather(
+        acalculate_all_po_scores(student, use_credits=True),
+        counters.aget(),
+    )
+
+    return _build_po_summary(
+        student,
+        po_scores,
+        completed_courses=completed_courses,
+        total_credits=total_credits
+    )
@@ -0,0 +1,119 @@
+"""
+Async (ASGI) versions of the heavy calculation endpoints.
+
+These are plain Django async views rather than DRF actions because DRF views
+are synchronous. Payloads match the corresponding StudentAssessmentScoreViewSet
+and StudentPLOAchievementViewSet actions.
+"""
+import json
+
+from django.db.models import Avg, Count, Q
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from students.models import Student
+from .async_calculations import acalculate_all_po_scores, aget_student_po_summary
+from .instrumentation import timed
+from .models import StudentPLOAchievement
+from .nplusone import allow_repeated_queries
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def _aget_student(data):
+    student_id = data.get('student_id')
+    if not student_id:
+        return None, JsonResponse({'error': 'student_id is required'}, status=400)
+    try:
+        return await Student.objects.aget(id=student_id), None
+    except (Student.DoesNotExist, ValueError):
+        return None, JsonResponse({'error': 'Student not found'}, status=404)
+
+
+@csrf_exempt
+@require_POST
+async def calculate_po_scores(request):
+    """
+    Calculate PO scores for a student.
+    POST body: {"student_id": 1, "use_credits": true}
+    """
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    student, error = await _aget_student(data)
+    if error:
+        return error
+
+    use_credits = data.get('use_credits', True)
+    # The fan-out issues one query per mapping on purpose, as cached_call allows
+    with timed('calc'), allow_repeated_queries():
+        po_scores = await acalculate_all_po_scores(student, use_credits=use_credits)
+
+    return JsonResponse({
+        'student': student.name,
+        'use_credits': use_credits,
+        'po_scores': [
+            {
+                'po_code': po.code,
+                'title': po.title,
+                'score': round(score, 2)
+            }
+            for po, score in po_scores.items()
+        ]
+    })
+
+
+@csrf_exempt
+@require_POST
+async def student_po_summary(request):
+    """
+    Get comprehensive PO summary for a student.
+    POST body: {"student_id": 1}
+    """
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    student, error = await _aget_student(data)
+    if error:
+        return error
+
+    with timed('calc'), allow_repeated_queries():
+        summary = await aget_student_po_summary(student)
+
+    return JsonResponse({
+        'student': {
+            'id': student.id,
+            'name': student.name,
+            'student_number': student.student_number
+        },
+        'po_scores': summary['po_scores'],
+        'statistics': summary['statistics']
+    })
+
+
+@require_GET
+async def plo_statistics(request):
+    """Get overall statistics for a specific PLO across all students"""
+    plo_id = request.GET.get('plo_id')
+    if not plo_id:
+        return JsonResponse({'error': 'plo_id is required'}, status=400)
+
+    stats = await StudentPLOAchievement.objects.filter(plo_id=plo_id).aaggregate(
+        avg_score=Avg('score'),
+        total_students=Count('student', distinct=True),
+        not_achieved=Count('id', filter=Q(achievement_level='NOT_ACHIEVED')),
+        partially=Count('id', filter=Q(achievement_level='PARTIALLY')),
+        achieved=Count('id', filter=Q(achievement_level='ACHIEVED')),
+        exceeded=Count('id', filter=Q(achievement_level='EXCEEDED'))
+    )
+
+    return JsonResponse(stats)
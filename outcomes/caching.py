@@ -0,0 +1,233 @@
+"""
+Sharing of calculation results between concurrent callers.
+
+Every write to outcome data bumps a global *data version* (see
+``outcomes/signals.py``), the queryset ``update()``, ``bulk_update()`` and
+``bulk_create()`` paths included. ``single_flight`` keys each computation on
+(function, arguments, data version) so that identical concurrent requests
+run the calculation only once:
+
+* threads in the same process wait on the in-flight call and receive its
+  result directly;
+* worker processes on the same host serialize on a file lock and pick the
+  result up from the ``calculations`` cache once the first worker stored it.
+
+``request_cache`` additionally memoizes calculations for the duration of one
+request (or one batch of sub-requests), so serializers that compute the same
+LO/PO scores for different rows or endpoints only do it once.
+
+Results are shared objects - callers must treat them as read-only.
+"""
+import hashlib
+import os
+import threading
+import uuid
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+
+from .instrumentation import timed
+from .nplusone import allow_repeated_queries
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+CACHE_ALIAS = 'calculations'
+DATA_VERSION_KEY = 'outcomes:data_version'
+LOCK_STRIPES = 64
+
+_MISSING = object()
+
+_request_store = ContextVar('outcomes_request_cache', default=None)
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_data_version():
+    """Return the current outcome data version token."""
+    cache = _cache()
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def bump_data_version():
+    """
+    Invalidate every result computed so far.
+
+    A fresh random token is used instead of a counter so that results left in
+    a persistent cache by an earlier database can never be mistaken for
+    current ones.
+    """
+    _cache().set(DATA_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def _key_part(value):
+    if isinstance(value, models.Model):
+        return f"{value._meta.label_lower}:{value.pk}"
+    return repr(value)
+
+
+def _call_key(func, args, kwargs):
+    parts = [f"{func.__module__}.{func.__qualname__}"]
+    parts.extend(_key_part(arg) for arg in args)
+    parts.extend(f"{name}={_key_part(value)}" for name, value in sorted((kwargs or {}).items()))
+    return '|'.join(parts)
+
+
+def make_key(func, args=(), kwargs=None):
+    """Build the cache key for ``func(*args, **kwargs)`` at the current data version."""
+    key = f"{get_data_version()}|{_call_key(func, args, kwargs)}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return f"singleflight:{digest}"
+
+
+@contextmanager
+def request_cache():
+    """
+    Memoize ``cached_call`` and ``single_flight`` results inside this block.
+
+    Nested blocks share the outermost store, so sub-requests of a batch see
+    the batch's cache.
+    """
+    if _request_store.get() is not None:
+        yield
+        return
+    token = _request_store.set({})
+    try:
+        yield
+    finally:
+        _request_store.reset(token)
+
+
+def cached_call(func, *args, **kwargs):
+    """Call ``func`` once per distinct arguments within the current ``request_cache``."""
+    store = _request_store.get()
+    if store is None:
+        with timed('calc'), allow_repeated_queries():
+            return func(*args, **kwargs)
+    key = _call_key(func, args, kwargs)
+    result = store.get(key, _MISSING)
+    if result is _MISSING:
+        with timed('calc'), allow_repeated_queries():
+            result = store[key] = func(*args, **kwargs)
+    return result
+
+
+@contextmanager
+def _process_lock(key):
+    """
+    Hold an exclusive lock shared by all worker processes on this host.
+
+    Keys are hashed onto a fixed set of lock files so the lock directory does
+    not grow with the number of distinct calculations.
+    """
+    lock_dir = getattr(settings, 'SINGLE_FLIGHT_LOCK_DIR', None)
+    if lock_dir is None:
+        lock_dir = os.path.join(settings.BASE_DIR, '.cache', 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+
+    stripe = zlib.crc32(key.encode('utf-8')) % LOCK_STRIPES
+    path = os.path.join(lock_dir, f"singleflight-{stripe:02d}.lock")
+    with open(path, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _Call:
+    """An in-flight computation that other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _compute_shared(key, func, args, kwargs):
+    cache = _cache()
+    result = cache.get(key, _MISSING)
+    if result is not _MISSING:
+        return result
+
+    with _process_lock(key):
+        # Another process may have finished while we were waiting for the lock
+        result = cache.get(key, _MISSING)
+        if result is not _MISSING:
+            return result
+
+        result = func(*args, **kwargs)
+        cache.set(key, result, timeout=getattr(settings, 'SINGLE_FLIGHT_TIMEOUT', 60))
+    return result
+
+
+def single_flight(func, *args, **kwargs):
+    """
+    Call ``func(*args, **kwargs)`` unless an identical call is already running.
+
+    Model instances in the arguments are identified by their primary key.
+    Concurrent callers with the same key block until the first caller
+    finishes and then receive its result (or its exception).
+    """
+    store = _request_store.get()
+    with timed('calc'), allow_repeated_queries():
+        if store is not None:
+            local_key = _call_key(func, args, kwargs)
+            if local_key not in store:
+                store[local_key] = _single_flight(func, args, kwargs)
+            return store[local_key]
+        return _single_flight(func, args, kwargs)
+
+
+def _single_flight(func, args, kwargs):
+    key = make_key(func, args, kwargs)
+
+    with _inflight_lock:
+        call = _inflight.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _inflight[key] = _Call()
+
+    if not is_leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _compute_shared(key, func, args, kwargs)
+        return call.result
+    except BaseException as e:
+        # KeyboardInterrupt and SystemExit too, so that waiters never return a missing result
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
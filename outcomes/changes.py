@@ -0,0 +1,106 @@
+"""
+Append-only feed of the writes that affect outcome calculations.
+
+Every insert, update and delete of a model in ``FEED_FIELDS`` adds a
+``Change`` row. Its ``seq`` only ever grows (SQLite ``AUTOINCREMENT`` never
+reuses ids), so consumers read ``GET /api/changes/?after=<seq>`` in batches
+and remember the last ``seq`` they processed. Entries are written in the
+transaction of the change they record; SQLite runs one write transaction at
+a time, so ``seq`` order is commit order and a late commit is never skipped.
+
+An entry carries the ``FEED_FIELDS`` of the row after the change (the last
+values for deletes). ``update()`` and ``bulk_update()`` record the rows
+whose fields actually changed, through the ``core.tracking`` signals;
+``save()`` records any save that writes one of them. Rows ``bulk_create()``
+handled with ``ignore_conflicts`` or ``update_conflicts`` are recorded as
+updates, when their id is known.
+Raw SQL writes are not seen.
+"""
+from core.tracking import update_transitions, updated_fields
+
+
+INSERT, UPDATE, DELETE = 'INSERT', 'UPDATE', 'DELETE'
+
+# Models in the feed and the columns their entries carry; updates touching
+# none of them are left out
+FEED_FIELDS = {
+    'outcomes.StudentAssessmentScore': ('student', 'assessment', 'enrollment', 'score', 'normalized'),
+    'outcomes.AssessmentLOMapping': ('assessment', 'learning_outcome', 'contribution_percentage'),
+    'outcomes.LOPOMapping': ('learning_outcome', 'program_outcome', 'weight'),
+    'outcomes.Enrollment': ('student', 'course', 'course_offering', 'status', 'grade'),
+    'courses.Course': ('credit',),
+}
+
+# Entries per INSERT
+BATCH_SIZE = 500
+
+
+def entry_data(instance, fields):
+    opts = instance._meta
+    return {name: getattr(instance, opts.get_field(name).attname) for name in fields}
+
+
+def record(model, action, rows):
+    """Append ``rows`` (``(pk, data)`` pairs) of ``model`` to the feed."""
+    from .models import Change
+
+    label = model._meta.label
+    entries = [
+        Change(model_label=label, object_id=pk, action=action, data=data)
+        for pk, data in sorted(rows, key=lambda row: row[0])
+    ]
+    if entries:
+        Change.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+
+
+def read_changes(after, limit):
+    """``(entries, has_more)``: up to ``limit`` entries following ``seq`` ``after``, oldest first."""
+    from .models import Change
+
+    entries = list(
+        Change.objects.filter(seq__gt=after).order_by('seq')
+        .values('seq', 'model_label', 'object_id', 'action', 'data', 'changed_at')[:limit + 1]
+    )
+    return entries[:limit], len(entries) > limit
+
+
+def record_created(sender, objs, conflicts, **kwargs):
+    """``rows_created`` receiver: the rows of ``bulk_create()``."""
+    fields = FEED_FIELDS[sender._meta.label]
+    record(
+        sender, UPDATE if conflicts else INSERT,
+        [(obj.pk, entry_data(obj, fields)) for obj in objs if obj.pk is not None],
+    )
+
+
+def record_updating(sender, queryset, values, **kwargs):
+    """``rows_updating`` receiver: the rows of ``update()`` whose feed fields change."""
+    fields = FEED_FIELDS[sender._meta.label]
+    if not updated_fields(sender, values) & set(fields):
+        return None
+    # Read first: the filter may no longer match after the update
+    transitions = update_transitions(queryset, values, fields)
+    return lambda: record(sender, UPDATE, [
+        (pk, dict(zip(fields, new))) for pk, (old, new) in transitions.items() if old != new
+    ])
+
+
+def record_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    fields = FEED_FIELDS[sender._meta.label]
+    if raw or (not created and update_fields is not None and not set(update_fields) & set(fields)):
+        return
+    record(sender, INSERT if created else UPDATE, [(instance.pk, entry_data(instance, fields))])
+
+
+def record_deleted(sender, instance, **kwargs):
+    record(sender, DELETE, [(instance.pk, entry_data(instance, FEED_FIELDS[sender._meta.label]))])
+
+
+def course_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Only credit changes are recorded; runs before ``counters.course_saved`` resets ``_loaded_credit``."""
+    if not created and getattr(instance, '_loaded_credit', None) == instance.credit:
+        return
+    if created:
+        # As if loaded, so that later saves of this instance compare against it
+        instance._loaded_credit = instance.credit
+    record_saved(sender, instance, created, raw=raw, update_fields=update_fields, **kwargs)
@@ -0,0 +1,318 @@
+"""
+Denormalized counters on the rows dashboards list.
+
+* ``CourseOffering`` and ``Course``: ``enrolled_count`` (enrollments of any
+  status) and ``assessment_count``;
+* ``Student``: ``completed_courses`` and ``completed_credits``, the number
+  of completed enrollments and the sum of their course credits (a retaken
+  course counts once per completed enrollment).
+
+Writes adjust them with ``F()`` arithmetic in the writing transaction: the
+signal receivers below for single rows and for course credits changed in
+bulk, and the ``Enrollment`` and ``Assessment`` querysets for
+``bulk_create``, ``bulk_update`` and ``update()``. The counters are
+serialized, so a counter write stamps ``updated_at`` for ``?updated_since=``
+clients, but it sends no change feed entry or ``core.tracking`` signal.
+Raw SQL writes are not seen; ``repair_counters`` recomputes every counter
+from the rows and fixes the ones that drifted.
+"""
+from collections import Counter, defaultdict
+
+from django.db import models
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from courses.models import Course
+from students.models import Student
+
+from .models import Assessment, CourseOffering, Enrollment
+from .nplusone import allow_repeated_queries
+
+
+COMPLETED = 'COMPLETED'
+
+# Enrollment columns deciding which counters a row adds to
+ENROLLMENT_FIELDS = ('student', 'course', 'course_offering', 'status')
+
+# Counter columns by model label
+COUNTERS = {
+    'courses.Course': ('enrolled_count', 'assessment_count'),
+    'outcomes.CourseOffering': ('enrolled_count', 'assessment_count'),
+    'students.Student': ('completed_courses', 'completed_credits'),
+}
+
+# Rows per UPDATE, keeping the CASE within SQLite's parameter limit
+BATCH_SIZE = 500
+
+
+def enrollment_state(enrollment):
+    return (enrollment.student_id, enrollment.course_id, enrollment.course_offering_id, enrollment.status)
+
+
+def _write(queryset, **values):
+    """
+    ``queryset.update(**values)`` stamping ``updated_at`` in the same UPDATE,
+    but without the model's queryset overrides: the change feed and the
+    ``core.tracking`` signals are left alone.
+    """
+    values.setdefault('updated_at', timezone.now())
+    return models.QuerySet.update(queryset, **values)
+
+
+def course_credit(course_id):
+    """The course's credit, read inside the UPDATE that uses it."""
+    return Coalesce(Subquery(Course.objects.filter(pk=course_id).values('credit')[:1]), 0)
+
+
+def _apply(model, deltas):
+    """Add ``deltas`` (``{field: {pk: delta}}``) to ``model``'s counters with one UPDATE per batch of rows."""
+    deltas = {
+        field: {pk: delta for pk, delta in by_pk.items() if pk is not None and not (isinstance(delta, int) and delta == 0)}
+        for field, by_pk in deltas.items()
+    }
+    pks = sorted({pk for by_pk in deltas.values() for pk in by_pk})
+    for start in range(0, len(pks), BATCH_SIZE):
+        batch = pks[start:start + BATCH_SIZE]
+        values = {}
+        for field, by_pk in deltas.items():
+            whens = [When(pk=pk, then=by_pk[pk]) for pk in batch if pk in by_pk]
+            if whens:
+                values[field] = F(field) + Case(*whens, default=Value(0), output_field=IntegerField())
+        _write(model.objects.filter(pk__in=batch), **values)
+
+
+def enrollments_changed(changes, credit=None):
+    """
+    Adjust the counters for enrollments going from one state to another.
+
+    ``changes`` are ``(old, new)`` pairs of ``enrollment_state`` tuples, with
+    None for a created or deleted row. ``credit(course_id)`` gives a course's
+    credit; by default the credits are read in one query.
+    """
+    courses, offerings, completed = Counter(), Counter(), Counter()
+    for old, new in changes:
+        if old == new:
+            continue
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            student_id, course_id, offering_id, status = state
+            courses[course_id] += sign
+            offerings[offering_id] += sign
+            if status == COMPLETED:
+                completed[student_id, course_id] += sign
+
+    completed = {key: n for key, n in completed.items() if n}
+    if credit is None:
+        credits = {}
+        if completed:
+            # One read per bulk write, which callers may well issue in a loop
+            with allow_repeated_queries():
+                credits = dict(
+                    Course.objects.filter(pk__in={course_id for _, course_id in completed}).values_list('pk', 'credit')
+                )
+        credit = credits.__getitem__
+    completed_courses, completed_credits = defaultdict(int), defaultdict(int)
+    for (student_id, course_id), n in completed.items():
+        completed_courses[student_id] += n
+        completed_credits[student_id] += n * credit(course_id)
+
+    _apply(Course, {'enrolled_count': courses})
+    _apply(CourseOffering, {'enrolled_count': offerings})
+    _apply(Student, {'completed_courses': completed_courses, 'completed_credits': completed_credits})
+
+
+def assessments_changed(changes, course_of=None):
+    """
+    Adjust the counters for assessments moving between offerings.
+
+    ``changes`` are ``(old, new)`` pairs of offering ids, with None for a
+    created or deleted row. ``course_of`` maps offering ids to course
+    ids; without it each course is found by the UPDATE itself.
+    """
+    offerings = Counter()
+    for old, new in changes:
+        if old != new:
+            offerings[old] -= 1
+            offerings[new] += 1
+    offerings = {pk: n for pk, n in offerings.items() if n and pk is not None}
+    _apply(CourseOffering, {'assessment_count': offerings})
+    if course_of is None:
+        for pk, n in offerings.items():
+            _write(Course.objects.filter(offerings=pk), assessment_count=F('assessment_count') + n)
+        return
+    courses = Counter()
+    for pk, n in offerings.items():
+        courses[course_of[pk]] += n
+    _apply(Course, {'assessment_count': courses})
+
+
+def offering_courses(offering_ids):
+    """``{offering id: course id}``, read in one query."""
+    offering_ids = set(offering_ids) - {None}
+    if not offering_ids:
+        return {}
+    # One read per bulk write, like the credits in enrollments_changed()
+    with allow_repeated_queries():
+        return dict(CourseOffering.objects.filter(pk__in=offering_ids).values_list('pk', 'course_id'))
+
+
+def course_credits_changed(course_ids):
+    """Recompute ``completed_credits`` of the students who completed these courses, in one UPDATE."""
+    students = Student.objects.filter(
+        pk__in=Enrollment.objects.filter(course__in=course_ids, status=COMPLETED).values('student')
+    )
+    return recount_counters({'students.Student': students}, fields=['completed_credits'])
+
+
+def _count(queryset, key):
+    rows = queryset.filter(**{key: OuterRef('pk')}).order_by().values(key)
+    return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n')), 0)
+
+
+def counter_expressions(enrollments=None, assessments=None):
+    """
+    ``{label: {field: expression}}`` computing every counter from the rows.
+    Migrations pass the querysets of their historical models.
+    """
+    enrollments = Enrollment.objects.all() if enrollments is None else enrollments
+    assessments = Assessment.objects.all() if assessments is None else assessments
+    completed = enrollments.filter(status=COMPLETED, student=OuterRef('pk')).order_by().values('student')
+    return {
+        'courses.Course': {
+            'enrolled_count': _count(enrollments, 'course'),
+            'assessment_count': _count(assessments, 'course_offering__course'),
+        },
+        'outcomes.CourseOffering': {
+            'enrolled_count': _count(enrollments, 'course_offering'),
+            'assessment_count': _count(assessments, 'course_offering'),
+        },
+        'students.Student': {
+            'completed_courses': Coalesce(Subquery(completed.annotate(n=Count('pk')).values('n')), 0),
+            'completed_credits': Coalesce(Subquery(completed.annotate(n=Sum('course__credit')).values('n')), 0),
+        },
+    }
+
+
+def recount_counters(targets=None, fields=None, enrollments=None, assessments=None):
+    """
+    Recompute counters from the rows with one UPDATE per model and return
+    the number of rows written. ``targets`` maps model labels to querysets
+    of the rows to recount (every row of every model by default) and
+    ``fields`` limits the counters.
+    """
+    expressions = counter_expressions(enrollments, assessments)
+    if targets is None:
+        from django.apps import apps
+        targets = {label: apps.get_model(label).objects.all() for label in COUNTERS}
+    written = 0
+    for label, queryset in targets.items():
+        values = {
+            field: expression for field, expression in expressions[label].items()
+            if fields is None or field in fields
+        }
+        if values:
+            written += _write(queryset, **values)
+    return written
+
+
+def recount_enrollment_targets(states):
+    """Recount the courses, offerings and students of these ``enrollment_state`` tuples."""
+    student_ids, course_ids, offering_ids, _ = zip(*states) if states else ((), (), (), ())
+    return recount_counters({
+        'courses.Course': Course.objects.filter(pk__in=set(course_ids)),
+        'outcomes.CourseOffering': CourseOffering.objects.filter(pk__in=set(offering_ids) - {None}),
+        'students.Student': Student.objects.filter(pk__in=set(student_ids)),
+    }, fields=['enrolled_count', 'completed_courses', 'completed_credits'])
+
+
+def recount_assessment_targets(offering_ids):
+    """Recount ``assessment_count`` of these offerings and their courses."""
+    offering_ids = set(offering_ids)
+    return recount_counters({
+        'courses.Course': Course.objects.filter(
+            pk__in=CourseOffering.objects.filter(pk__in=offering_ids).values('course')
+        ),
+        'outcomes.CourseOffering': CourseOffering.objects.filter(pk__in=offering_ids),
+    }, fields=['assessment_count'])
+
+
+def counter_drift(label):
+    """Rows of ``label`` whose counters differ from the rows, annotated with ``expected_<field>``."""
+    from django.apps import apps
+
+    expressions = counter_expressions()[label]
+    drifted = Q()
+    for field in expressions:
+        drifted |= ~Q(**{field: F(f'expected_{field}')})
+    return apps.get_model(label).objects.annotate(
+        **{f'expected_{field}': expression for field, expression in expressions.items()}
+    ).filter(drifted).order_by('pk')
+
+
+def enrollment_saving(sender, instance, raw=False, **kwargs):
+    """Read the stored state of a row that was not loaded with all its counted columns."""
+    if raw or instance._state.adding or getattr(instance, '_counted', None) is not None:
+        return
+    instance._counted = Enrollment.objects.filter(pk=instance.pk).values_list(
+        'student_id', 'course_id', 'course_offering_id', 'status'
+    ).first()
+
+
+def enrollment_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    old = None if created else getattr(instance, '_counted', None)
+    new = enrollment_state(instance)
+    if old is not None and update_fields is not None:
+        # Columns left out of update_fields keep their stored value
+        saved = {instance._meta.get_field(name).name for name in update_fields}
+        new = tuple(
+            value if field in saved else stored
+            for field, value, stored in zip(ENROLLMENT_FIELDS, new, old)
+        )
+    enrollments_changed([(old, new)], credit=course_credit)
+    instance._counted = new
+
+
+def enrollment_deleted(sender, instance, **kwargs):
+    old = getattr(instance, '_counted', None) or enrollment_state(instance)
+    enrollments_changed([(old, None)], credit=course_credit)
+
+
+def assessment_saving(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or getattr(instance, '_counted', None) is not None:
+        return
+    instance._counted = Assessment.objects.filter(pk=instance.pk).values_list('course_offering_id', flat=True).first()
+
+
+def assessment_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    old = None if created else getattr(instance, '_counted', None)
+    if update_fields is not None and not {'course_offering', 'course_offering_id'} & set(update_fields):
+        return
+    assessments_changed([(old, instance.course_offering_id)])
+    instance._counted = instance.course_offering_id
+
+
+def assessment_deleted(sender, instance, **kwargs):
+    assessments_changed([(getattr(instance, '_counted', None) or instance.course_offering_id, None)])
+
+
+def courses_updating(sender, queryset, values, **kwargs):
+    """``rows_updating`` receiver: credit changes in bulk (``bulk_update()`` goes through ``update()`` too)."""
+    if 'credit' not in values:
+        return None
+    # Taken first: the filter may no longer match once credit changed
+    ids = list(queryset.values_list('pk', flat=True))
+    return lambda: course_credits_changed(ids)
+
+
+def course_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or (update_fields is not None and 'credit' not in update_fields):
+        return
+    if getattr(instance, '_loaded_credit', None) != instance.credit:
+        course_credits_changed([instance.pk])
+        instance._loaded_credit = instance.credit
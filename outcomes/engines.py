@@ -0,0 +1,51 @@
+"""
+Registry of the outcome calculation engines.
+
+Every engine implements the functions of the reference calculators in
+``outcomes/models.py`` with the same arguments and results; engines may be
+sync or async. ``bench_outcomes`` times every engine and the equivalence
+tests (``outcomes/tests/test_equivalence.py``) check that they agree with
+the reference, so a new engine only has to be added here.
+"""
+import asyncio
+
+from asgiref.sync import async_to_sync
+
+from .async_calculations import (
+    acalculate_all_po_scores,
+    acalculate_lo_score,
+    acalculate_po_score,
+    aget_student_po_summary,
+)
+from .models import (
+    calculate_all_po_scores,
+    calculate_lo_score,
+    calculate_po_score,
+    get_student_po_summary,
+)
+
+
+REFERENCE = 'reference'
+
+ENGINES = {
+    REFERENCE: {
+        'calculate_lo_score': calculate_lo_score,
+        'calculate_po_score': calculate_po_score,
+        'calculate_all_po_scores': calculate_all_po_scores,
+        'get_student_po_summary': get_student_po_summary,
+    },
+    'async': {
+        'calculate_lo_score': acalculate_lo_score,
+        'calculate_po_score': acalculate_po_score,
+        'calculate_all_po_scores': acalculate_all_po_scores,
+        'get_student_po_summary': aget_student_po_summary,
+    },
+}
+
+
+def call(engine, function, *args, **kwargs):
+    """Run one engine function from sync code, whether it is sync or async."""
+    func = ENGINES[engine][function]
+    if asyncio.iscoroutinefunction(func):
+        return async_to_sync(func)(*args, **kwargs)
+    return func(*args, **kwargs)
@@ -0,0 +1,158 @@
+"""
+In-process change notifier feeding the server-sent event streams.
+
+Signal receivers publish small event dicts once the writing transaction has
+committed, for ``save()`` and ``delete()`` as well as for the bulk paths
+(``core.tracking``); every open stream waits on the notifier and picks the
+events that concern it. Events carry a per-process sequence number, which streams send
+as the SSE ``id`` so that reconnecting clients resume where they left off.
+
+Only writes made by this process are seen - each worker process serves the
+streams of its own clients.
+"""
+import threading
+from collections import deque
+
+from django.db import transaction
+
+from core.tracking import updated_fields
+
+
+class ChangeNotifier:
+    """A bounded, sequenced buffer of recent events that threads can wait on."""
+
+    def __init__(self, maxlen=1000):
+        self._condition = threading.Condition()
+        self._events = deque(maxlen=maxlen)
+        self._seq = 0
+
+    def cursor(self):
+        """Sequence number of the newest event; wait() after it returns only newer ones."""
+        with self._condition:
+            return self._seq
+
+    def publish(self, event):
+        with self._condition:
+            self._seq += 1
+            self._events.append((self._seq, event))
+            self._condition.notify_all()
+            return self._seq
+
+    def wait(self, after, timeout):
+        """Return ``[(seq, event), ...]`` newer than ``after``, blocking up to ``timeout`` seconds."""
+        with self._condition:
+            if self._seq <= after:
+                self._condition.wait(timeout)
+            return [(seq, event) for seq, event in self._events if seq > after]
+
+
+notifier = ChangeNotifier()
+
+
+def publish_on_commit(event):
+    transaction.on_commit(lambda: notifier.publish(event))
+
+
+def publish_all_on_commit(events):
+    events = list(events)
+    if events:
+        transaction.on_commit(lambda: [notifier.publish(event) for event in events])
+
+
+def _updating(queryset, values, fields, make_event):
+    """
+    ``rows_updating`` helper: read ``fields`` of the rows first, since the
+    filter may no longer match after the update, and publish an event per
+    row once the UPDATE ran.
+    """
+    if not updated_fields(queryset.model, values) - {'updated_at'}:
+        return None
+    rows = list(queryset.order_by().values_list(*fields))
+    return lambda: publish_all_on_commit(make_event(*row) for row in rows)
+
+
+def _score_event(action, score_id, student_id, enrollment_id, assessment_id):
+    return {
+        'type': 'score',
+        'action': action,
+        'score_id': score_id,
+        'student_id': student_id,
+        'enrollment_id': enrollment_id,
+        'assessment_id': assessment_id,
+    }
+
+
+def _instance_score_event(instance, action):
+    return _score_event(action, instance.pk, instance.student_id, instance.enrollment_id, instance.assessment_id)
+
+
+def score_saved(sender, instance, created, **kwargs):
+    publish_on_commit(_instance_score_event(instance, 'created' if created else 'updated'))
+
+
+def score_deleted(sender, instance, **kwargs):
+    publish_on_commit(_instance_score_event(instance, 'deleted'))
+
+
+def scores_created(sender, objs, conflicts, **kwargs):
+    """``rows_created`` receiver; with conflicts some rows may have been updated instead."""
+    action = 'updated' if conflicts else 'created'
+    publish_all_on_commit(_instance_score_event(obj, action) for obj in objs)
+
+
+def scores_updating(sender, queryset, values, **kwargs):
+    """``rows_updating`` receiver: ``update()``, ``bulk_update()`` and the normalized score refresh."""
+    return _updating(
+        queryset, values, ['pk', 'student_id', 'enrollment_id', 'assessment_id'],
+        lambda *row: _score_event('updated', *row),
+    )
+
+
+def _enrollment_event(enrollment_id, student_id, course_id):
+    return {
+        'type': 'enrollment',
+        'enrollment_id': enrollment_id,
+        'student_id': student_id,
+        'course_id': course_id,
+    }
+
+
+def enrollment_changed(sender, instance, **kwargs):
+    publish_on_commit(_enrollment_event(instance.pk, instance.student_id, instance.course_id))
+
+
+def enrollments_created(sender, objs, **kwargs):
+    publish_all_on_commit(_enrollment_event(obj.pk, obj.student_id, obj.course_id) for obj in objs)
+
+
+def enrollments_updating(sender, queryset, values, **kwargs):
+    """``rows_updating`` receiver: status and grade changes of term closes and grading, among others."""
+    return _updating(queryset, values, ['pk', 'student_id', 'course_id'], _enrollment_event)
+
+
+def _mapping_event(learning_outcome_id, course_id=None):
+    return {'type': 'mapping', 'learning_outcome_id': learning_outcome_id, 'course_id': course_id}
+
+
+def mapping_changed(sender, instance, **kwargs):
+    """
+    AssessmentLOMapping and LOPOMapping writes change every LO/PO score of the course.
+
+    The course is only included when the learning outcome is already loaded;
+    otherwise streams look it up, so cascading deletes stay free of queries.
+    """
+    learning_outcome = instance._state.fields_cache.get('learning_outcome')
+    publish_on_commit(_mapping_event(
+        instance.learning_outcome_id, learning_outcome.course_id if learning_outcome is not None else None
+    ))
+
+
+def mappings_created(sender, objs, **kwargs):
+    publish_all_on_commit(_mapping_event(lo_id) for lo_id in sorted({obj.learning_outcome_id for obj in objs}))
+
+
+def mappings_updating(sender, queryset, values, **kwargs):
+    """``rows_updating`` receiver: one event per learning outcome the rows belong to before the update."""
+    return _updating(
+        queryset.distinct(), values, ['learning_outcome_id', 'learning_outcome__course_id'], _mapping_event
+    )
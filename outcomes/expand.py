@@ -0,0 +1,178 @@
+"""
+``?expand=`` support: inline related objects instead of their ids.
+
+Serializers list the relations they can inline in ``expandable_fields``,
+mapping the field name to the dotted path of the serializer used for it.
+Paths nest with dots and are separated by commas, e.g.
+``?expand=course,student,enrollment.course``.
+
+``plan_expansions`` turns the requested tree into ``select_related`` and
+``prefetch_related`` calls: single-valued hops are joined, each many-valued
+hop costs exactly one extra query, so the query count does not depend on
+the number of rows. Expanded objects are rendered without their
+``SerializerMethodField`` entries, which would otherwise query per row.
+"""
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import ManyRelatedField
+
+
+EXPAND_PARAM = 'expand'
+
+
+def _serializer_for(serializer_class, name):
+    path = getattr(serializer_class, 'expandable_fields', {}).get(name)
+    if path is None:
+        return None
+    return import_string(path) if isinstance(path, str) else path
+
+
+def parse_expand(value, serializer_class):
+    """Parse ``a,b.c`` into ``{'a': {}, 'b': {'c': {}}}``, validating every step."""
+    tree = {}
+    for path in filter(None, (part.strip() for part in (value or '').split(','))):
+        node = tree
+        current = serializer_class
+        for name in path.split('.'):
+            target = _serializer_for(current, name)
+            if target is None:
+                raise ValidationError({EXPAND_PARAM: f"'{path}' cannot be expanded."})
+            node = node.setdefault(name, {})
+            current = target
+    return tree
+
+
+def _nested_requirements(serializer_class):
+    """Relations the expanded (method-field-free) serializer reads per row."""
+    model = serializer_class.Meta.model
+    selects = []
+    prefetches = []
+    for field in serializer_class().fields.values():
+        if isinstance(field, serializers.SerializerMethodField) or field.write_only:
+            continue
+        if isinstance(field, ManyRelatedField):
+            prefetches.append(Prefetch(field.source))
+            continue
+        hops = field.source_attrs[:-1]
+        if hops and all(_is_single_forward(model, hops[:i + 1]) for i in range(len(hops))):
+            selects.append('__'.join(hops))
+    return selects, prefetches
+
+
+def _is_single_forward(model, hops):
+    for hop in hops:
+        field = model._meta.get_field(hop)
+        if not field.concrete or not (field.many_to_one or field.one_to_one):
+            return False
+        model = field.related_model
+    return True
+
+
+def plan_expansions(serializer_class, tree):
+    """
+    Return ``(select_related, prefetch_related)`` lookups for ``tree``.
+
+    Lookups are relative to ``serializer_class.Meta.model``.
+    """
+    model = serializer_class.Meta.model
+    selects = []
+    prefetches = []
+
+    for name, subtree in tree.items():
+        target_class = _serializer_for(serializer_class, name)
+        field = model._meta.get_field(name)
+
+        child_selects, child_prefetches = plan_expansions(target_class, subtree)
+        required_selects, required_prefetches = _nested_requirements(target_class)
+        # An expanded many-valued field is prefetched with its own queryset below
+        required_prefetches = [p for p in required_prefetches if p.prefetch_through not in subtree]
+        child_selects = list(dict.fromkeys(required_selects + child_selects))
+        child_prefetches = required_prefetches + child_prefetches
+
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            selects.append(name)
+            selects.extend(f'{name}__{lookup}' for lookup in child_selects)
+            prefetches.extend(
+                Prefetch(f'{name}__{prefetch.prefetch_through}', queryset=prefetch.queryset)
+                for prefetch in child_prefetches
+            )
+        else:
+            queryset = field.related_model._default_manager.select_related(
+                *child_selects
+            ).prefetch_related(*child_prefetches)
+            prefetches.append(Prefetch(name, queryset=queryset))
+
+    return selects, prefetches
+
+
+class ExpandableSerializerMixin:
+    """Render the relations named in ``context['expand']`` inline."""
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('expanded'):
+            for name, field in list(fields.items()):
+                if isinstance(field, serializers.SerializerMethodField):
+                    del fields[name]
+        return fields
+
+    def to_representation(self, instance):
+        ret = super().to_representation(instance)
+        for name, subtree in (self.context.get(EXPAND_PARAM) or {}).items():
+            nested = self._get_expanded_serializer(name, subtree)
+            value = getattr(instance, name)
+            if value is None:
+                ret[name] = None
+            elif hasattr(value, 'all'):
+                ret[name] = [nested.to_representation(item) for item in value.all()]
+            else:
+                ret[name] = nested.to_representation(value)
+        return ret
+
+    def _get_expanded_serializer(self, name, subtree):
+        cache = self.__dict__.setdefault('_expanded_serializers', {})
+        if name not in cache:
+            serializer_class = _serializer_for(type(self), name)
+            context = dict(self.context, expanded=True)
+            context[EXPAND_PARAM] = subtree
+            cache[name] = serializer_class(context=context)
+        return cache[name]
+
+
+class ExpandMixin:
+    """Viewset side of ``?expand=``: plans the queryset and passes the tree on."""
+
+    def get_expand_tree(self):
+        if not hasattr(self, '_expand_tree'):
+            request = getattr(self, 'request', None)
+            value = request.query_params.get(EXPAND_PARAM) if request is not None else None
+            self._expand_tree = parse_expand(value, self.get_serializer_class())
+        return self._expand_tree
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        tree = self.get_expand_tree()
+        if tree:
+            selects, prefetches = plan_expansions(self.get_serializer_class(), tree)
+            # Plain lookups the viewset already prefetches would clash with
+            # the planned Prefetch objects for the same relation
+            planned = {prefetch.prefetch_through for prefetch in prefetches}
+            existing = [
+                lookup for lookup in queryset._prefetch_related_lookups
+                if (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup) not in planned
+            ]
+            queryset = queryset.select_related(*selects).prefetch_related(None).prefetch_related(
+                *existing, *prefetches
+            )
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context[EXPAND_PARAM] = self.get_expand_tree()
+        return context
+
+    def can_use_values_path(self):
+        return not self.get_expand_tree() and super().can_use_values_path()
@@ -0,0 +1,171 @@
+"""
+Read-only fast path for list endpoints.
+
+A ``ValuesSerializer`` renders rows fetched with ``queryset.values()`` instead
+of model instances. The field mapping is compiled once per class from the
+regular DRF serializer it mirrors, and every value goes through that
+serializer's own field ``to_representation`` so the rendered output is
+identical to the ModelSerializer path.
+
+Supported fields are concrete model fields, foreign keys rendered as primary
+keys, dotted sources such as ``source='student.name'`` and
+``source='get_<field>_display'``. ``SerializerMethodField`` entries must be
+reimplemented on the values serializer as ``get_<field>(row)``; any columns
+those methods need beyond the serializer's own are listed in
+``method_values``.
+"""
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PKOnlyObject, RelatedField
+from rest_framework.response import Response
+
+from .instrumentation import timed
+
+
+_METHOD = object()
+
+
+class ValuesSerializer:
+    serializer_class = None
+    method_values = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.lookups, self.columns = self.compile()
+
+    @classmethod
+    def compile(cls):
+        """Return ``(lookups, columns)``, compiling the mapping on first use."""
+        compiled = cls.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = cls._compiled = cls._compile()
+        return compiled
+
+    @classmethod
+    def _compile(cls):
+        serializer = cls.serializer_class()
+        model = serializer.Meta.model
+        lookups = []
+        columns = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.SerializerMethodField):
+                method = getattr(cls, field.method_name, None)
+                if method is None:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__} must define {field.method_name}(row) "
+                        f"to render '{name}'."
+                    )
+                columns.append((name, _METHOD, field.method_name))
+                continue
+
+            if isinstance(field, (ManyRelatedField, serializers.BaseSerializer)):
+                raise ImproperlyConfigured(
+                    f"{cls.__name__} cannot render many-valued or nested field '{name}'."
+                )
+
+            lookup, convert = _compile_field(model, field)
+            lookups.append(lookup)
+            columns.append((name, lookup, convert))
+
+        lookups.extend(cls.method_values)
+        return list(dict.fromkeys(lookups)), columns
+
+    def values(self, queryset):
+        """Return ``queryset`` as a values queryset with every column we need."""
+        return queryset.values(*self.lookups)
+
+    def to_representation(self, row):
+        ret = {}
+        for name, lookup, convert in self.columns:
+            if lookup is _METHOD:
+                ret[name] = getattr(self, convert)(row)
+                continue
+            value = row[lookup]
+            ret[name] = None if value is None else convert(value)
+        return ret
+
+    def serialize(self, rows):
+        rows = list(rows)
+        with timed('serializer'):
+            return [self.to_representation(row) for row in rows]
+
+
+def _compile_field(model, field):
+    """Map a DRF field to a ``values()`` lookup and a value converter."""
+    if field.source == '*':
+        raise ImproperlyConfigured(f"Field '{field.field_name}' uses source='*'.")
+
+    attrs = field.source_attrs
+    for attr in attrs[:-1]:
+        try:
+            relation = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f"'{attr}' is not a field on {model.__name__}.")
+        if not relation.concrete or not (relation.many_to_one or relation.one_to_one):
+            raise ImproperlyConfigured(f"'{attr}' on {model.__name__} is not a forward relation.")
+        if relation.null and not field.allow_null:
+            # DRF would drop the field entirely when the relation is empty
+            raise ImproperlyConfigured(
+                f"Field '{field.field_name}' crosses nullable relation '{attr}' without allow_null."
+            )
+        model = relation.related_model
+
+    prefix = '__'.join(attrs[:-1])
+    attr = attrs[-1]
+    lookup_prefix = f"{prefix}__" if prefix else ''
+
+    if attr.startswith('get_') and attr.endswith('_display'):
+        model_field = model._meta.get_field(attr[len('get_'):-len('_display')])
+        choices = {value: str(label) for value, label in model_field.flatchoices}
+        to_representation = field.to_representation
+
+        def convert_display(value):
+            return to_representation(choices.get(value, value))
+
+        return lookup_prefix + model_field.name, convert_display
+
+    try:
+        model_field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        raise ImproperlyConfigured(
+            f"Field '{field.field_name}' reads '{attr}', which is not a model field on {model.__name__}."
+        )
+
+    if isinstance(field, RelatedField):
+        to_representation = field.to_representation
+
+        def convert_pk(value):
+            return to_representation(PKOnlyObject(pk=value))
+
+        return lookup_prefix + model_field.name, convert_pk
+
+    return lookup_prefix + model_field.name, field.to_representation
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` through ``values_serializer_class`` when a viewset sets it.
+
+    Filtering, ordering and pagination behave exactly as on the regular path.
+    """
+    values_serializer_class = None
+
+    def can_use_values_path(self):
+        return self.values_serializer_class is not None
+
+    def list(self, request, *args, **kwargs):
+        if not self.can_use_values_path():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        rows = serializer.values(queryset)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
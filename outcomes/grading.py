@@ -0,0 +1,137 @@
+"""
+Letter grades from assessment scores.
+
+An enrollment's weighted total is ``Σ normalized * weight_percentage / 100``
+over its scored assessments, counting only the assessments of its own
+offering; unscored assessments add nothing. ``assign_grades`` reads the
+totals of a whole set of enrollments in one query, maps all of them onto
+the cut points with a binary search and writes the grades that changed in a
+single UPDATE. ``grade_offering`` does this for one offering's completed
+enrollments.
+
+Cut points are ``GRADE_CUTOFFS`` below unless ``settings.GRADE_CUTOFFS``
+replaces them, and can be overridden per call with ``{grade: minimum}``.
+"""
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Case, CharField, F, Q, Value, When
+
+from .models import Enrollment, StudentAssessmentScore
+
+
+# Lowest weighted percentage for each letter grade, highest first;
+# settings.GRADE_CUTOFFS replaces the whole list
+GRADE_CUTOFFS = [
+    (90, 'AA'), (85, 'BA'), (80, 'BB'), (75, 'CB'), (70, 'CC'),
+    (65, 'DC'), (60, 'DD'), (50, 'FD'), (0, 'FF'),
+]
+GRADES = [grade for _, grade in GRADE_CUTOFFS]
+GRADE_POINTS = {
+    'AA': 4.0, 'BA': 3.5, 'BB': 3.0, 'CB': 2.5, 'CC': 2.0,
+    'DC': 1.5, 'DD': 1.0, 'FD': 0.5, 'FF': 0.0,
+}
+FAILING_GRADES = {'FD', 'FF'}
+
+# Enrollments an offering's grading covers; ACTIVE ones only on request
+GRADED_STATUSES = ('COMPLETED',)
+
+
+def letter_grade(percentage, cutoffs=GRADE_CUTOFFS):
+    for cutoff, grade in cutoffs:
+        if percentage >= cutoff:
+            return grade
+    return cutoffs[-1][1]
+
+
+def grade_cutoffs(overrides=None):
+    """
+    ``[(minimum, grade), ...]``, best grade first: the configured cut points
+    with ``overrides`` (``{grade: minimum}``) applied. Raises ``ValueError``
+    unless every grade has a minimum between 0 and 100 below the next better
+    grade's.
+    """
+    minimums = {grade: minimum for minimum, grade in getattr(settings, 'GRADE_CUTOFFS', GRADE_CUTOFFS)}
+    if overrides:
+        if not isinstance(overrides, dict):
+            raise ValueError('cutoffs must map letter grades to minimum percentages')
+        unknown = set(overrides) - set(GRADES)
+        if unknown:
+            raise ValueError(f"Unknown grades: {', '.join(sorted(unknown))}")
+        minimums.update(overrides)
+    missing = [grade for grade in GRADES if grade not in minimums]
+    if missing:
+        raise ValueError(f"No cut point for {', '.join(missing)}")
+
+    cutoffs = []
+    for grade in GRADES:
+        try:
+            minimum = float(minimums[grade])
+        except (TypeError, ValueError):
+            raise ValueError(f'The cut point of {grade} must be a number')
+        if not 0 <= minimum <= 100:
+            raise ValueError(f'The cut point of {grade} must be between 0 and 100')
+        if cutoffs and minimum >= cutoffs[-1][0]:
+            raise ValueError(f'The cut point of {grade} must be below that of {cutoffs[-1][1]}')
+        cutoffs.append((minimum, grade))
+    return cutoffs
+
+
+def weighted_totals(enrollments):
+    """``{enrollment_id: total}`` for the enrollments with at least one score."""
+    totals = defaultdict(float)
+    for enrollment_id, normalized, weight in StudentAssessmentScore.objects.filter(
+        enrollment__in=enrollments
+    ).filter(
+        Q(enrollment__course_offering__isnull=True)
+        | Q(assessment__course_offering=F('enrollment__course_offering'))
+    ).order_by().values_list('enrollment_id', 'normalized', 'assessment__weight_percentage'):
+        totals[enrollment_id] += (normalized or 0.0) * weight
+    # Rounded so float noise cannot drop a total that is exactly on a cut point
+    return {enrollment_id: round(total / 100.0, 6) for enrollment_id, total in totals.items()}
+
+
+def letter_grades(totals, cutoffs):
+    """``{key: grade}`` for ``{key: total}``, one binary search over the cut points per total."""
+    ascending = cutoffs[::-1]
+    minimums = [minimum for minimum, _ in ascending]
+    grades = [grade for _, grade in ascending]
+    lowest = grades[0]
+    return {
+        key: grades[index] if index >= 0 else lowest
+        for key, index in ((key, bisect_right(minimums, total) - 1) for key, total in totals.items())
+    }
+
+
+def assign_grades(enrollments, cutoffs=None):
+    """
+    Compute and store the letter grades of ``enrollments``; enrollments
+    without any score keep theirs. Returns ``({enrollment_id: (total,
+    grade)}, number of grades changed)``.
+    """
+    if cutoffs is None:
+        cutoffs = grade_cutoffs()
+    totals = weighted_totals(enrollments)
+    grades = letter_grades(totals, cutoffs)
+    current = dict(enrollments.values_list('pk', 'grade')) if grades else {}
+    changed = defaultdict(list)
+    for pk, grade in sorted(grades.items()):
+        if current.get(pk) != grade:
+            changed[grade].append(pk)
+    if changed:
+        # One CASE branch per grade rather than bulk_update()'s one per row
+        Enrollment.objects.filter(pk__in=[pk for pks in changed.values() for pk in pks]).update(grade=Case(
+            *[When(pk__in=pks, then=Value(grade)) for grade, pks in changed.items()],
+            output_field=CharField(),
+        ))
+    return {pk: (totals[pk], grade) for pk, grade in grades.items()}, sum(len(pks) for pks in changed.values())
+
+
+def grade_offering(offering, cutoffs=None, include_active=False):
+    """
+    ``assign_grades`` for the offering's completed enrollments; with
+    ``include_active`` the ACTIVE ones get a provisional grade as well.
+    """
+    statuses = GRADED_STATUSES + ('ACTIVE',) if include_active else GRADED_STATUSES
+    return assign_grades(Enrollment.objects.filter(course_offering=offering, status__in=statuses), cutoffs)
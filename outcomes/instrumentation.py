@@ -0,0 +1,169 @@
+"""
+Per-request cost accounting: SQL queries, serializer time, calculation time.
+
+``RequestMetricsMiddleware`` (``outcomes/middleware.py``) opens a
+``RequestMetrics`` for every request. While it is open:
+
+* every SQL statement on any connection is counted and timed by the
+  execute wrapper installed on new connections (``install_query_recorder``);
+* ``TimedSerializerMixin`` times serializer ``to_representation`` calls;
+* ``cached_call`` / ``single_flight`` time the calculation engine.
+
+Nested timings of the same kind are only counted once. Serializer time
+includes calculations started from method fields, so the parts may add up
+to more than the total.
+
+The metrics are returned as a ``Server-Timing`` header and, when
+``REQUEST_METRICS_LOG`` names a file, written to it as one JSON line per
+request; the ``request_metrics_report`` command aggregates that log per
+view.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+
+
+_current = ContextVar('outcomes_request_metrics', default=None)
+
+logger = logging.getLogger('outcomes.request_metrics')
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.durations = {'db': 0.0, 'serializer': 0.0, 'calc': 0.0}
+        self._depth = {'serializer': 0, 'calc': 0}
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        parts = [f'db;dur={self.durations["db"] * 1000:.1f};desc="{self.queries} queries"']
+        parts.extend(
+            f'{name};dur={self.durations[name] * 1000:.1f}' for name in ('serializer', 'calc')
+        )
+        parts.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(parts)
+
+    def as_dict(self, total):
+        return {
+            'total_ms': round(total * 1000, 2),
+            'queries': self.queries,
+            'db_ms': round(self.durations['db'] * 1000, 2),
+            'serializer_ms': round(self.durations['serializer'] * 1000, 2),
+            'calc_ms': round(self.durations['calc'] * 1000, 2),
+        }
+
+
+@contextmanager
+def collect_metrics():
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in this block to the current request's ``name`` timing."""
+    metrics = _current.get()
+    if metrics is None or metrics._depth[name]:
+        yield
+        return
+    metrics._depth[name] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.durations[name] += time.perf_counter() - start
+        metrics._depth[name] -= 1
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.durations['db'] += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver adding the query recorder to each new connection."""
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class TimedSerializerMixin:
+    """Count ``to_representation`` towards the request's serializer time."""
+
+    def to_representation(self, instance):
+        with timed('serializer'):
+            return super().to_representation(instance)
+
+
+_handler_paths = {}
+
+
+def ensure_rotating_log(target, path, max_bytes, backups):
+    """
+    Point ``target`` (a logger) at a size-rotated file of one message per line.
+
+    Returns False when ``path`` is empty; the handler is only replaced when
+    the path changes.
+    """
+    if not path:
+        return False
+    if _handler_paths.get(target.name) == str(path):
+        return True
+
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    for handler in list(target.handlers):
+        if getattr(handler, '_rotating_log', False):
+            target.removeHandler(handler)
+            handler.close()
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    handler._rotating_log = True
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    target.addHandler(handler)
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    _handler_paths[target.name] = str(path)
+    return True
+
+
+def _ensure_log_handler():
+    return ensure_rotating_log(
+        logger,
+        getattr(settings, 'REQUEST_METRICS_LOG', None),
+        getattr(settings, 'REQUEST_METRICS_LOG_MAX_BYTES', 10 * 1024 * 1024),
+        getattr(settings, 'REQUEST_METRICS_LOG_BACKUPS', 5),
+    )
+
+
+def log_request(request, response, metrics, total):
+    if not _ensure_log_handler():
+        return
+    match = getattr(request, 'resolver_match', None)
+    entry = {
+        'time': time.time(),
+        'method': request.method,
+        'path': request.path,
+        'view': (match.view_name or match._func_path) if match else None,
+        'status': response.status_code,
+        **metrics.as_dict(total),
+    }
+    logger.info(json.dumps(entry))
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+
+from students.models import Student
+
+
+ENDPOINTS = {
+    'student_po_summary': (
+        '/api/student-scores/student_po_summary/',
+        '/api/async/student_po_summary/',
+    ),
+    'calculate_po_scores': (
+        '/api/student-scores/calculate_po_scores/',
+        '/api/async/calculate_po_scores/',
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares WSGI (sync views) and ASGI (async views) throughput on the same workload'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='student_po_summary')
+        parser.add_argument('--requests', type=int, default=200, help='Total requests per handler')
+        parser.add_argument('--concurrency', type=int, default=10, help='Requests in flight at once')
+        parser.add_argument(
+            '--keep-shared-results', action='store_true',
+            help='Let the sync views reuse coalesced results between requests (off by default so both '
+                 'handlers compute every request)'
+        )
+
+    def handle(self, *args, **options):
+        student_ids = list(
+            Student.objects.filter(enrollments__status='COMPLETED')
+            .values_list('id', flat=True).distinct()[:50]
+        )
+        if not student_ids:
+            raise CommandError('No students with completed enrollments. Run populate_test_data first.')
+
+        total = options['requests']
+        concurrency = options['concurrency']
+        sync_path, async_path = ENDPOINTS[options['endpoint']]
+        payloads = [
+            json.dumps({'student_id': student_ids[i % len(student_ids)]})
+            for i in range(total)
+        ]
+
+        if options['keep_shared_results']:
+            wsgi_elapsed, wsgi_errors = self._run_wsgi(sync_path, payloads, concurrency)
+        else:
+            with override_settings(SINGLE_FLIGHT_TIMEOUT=0):
+                wsgi_elapsed, wsgi_errors = self._run_wsgi(sync_path, payloads, concurrency)
+        asgi_elapsed, asgi_errors = asyncio.run(self._run_asgi(async_path, payloads, concurrency))
+
+        self.stdout.write(f'{total} requests, concurrency {concurrency}, endpoint {options["endpoint"]}')
+        for name, elapsed, errors in [('WSGI', wsgi_elapsed, wsgi_errors), ('ASGI', asgi_elapsed, asgi_errors)]:
+            self.stdout.write(
+                f'  {name}: {elapsed:.2f} s, {total / elapsed:.1f} req/s, {errors} errors'
+            )
+
+    def _run_wsgi(self, path, payloads, concurrency):
+        def send(payload):
+            response = Client().post(path, payload, content_type='application/json')
+            return response.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            statuses = list(pool.map(send, payloads))
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(1 for status in statuses if status != 200)
+
+    async def _run_asgi(self, path, payloads, concurrency):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(payload):
+            async with semaphore:
+                response = await client.post(path, payload, content_type='application/json')
+                return response.status_code
+
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(send(payload) for payload in payloads))
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(1 for status in statuses if status != 200)
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from outcomes.models import Enrollment, StudentAssessmentScore
+from outcomes.serializers import (
+    EnrollmentSerializer,
+    EnrollmentValuesSerializer,
+    StudentAssessmentScoreSerializer,
+    StudentAssessmentScoreValuesSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the values-based list fast path against the ModelSerializer path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows to serialize per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per serializer (best time is reported)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+
+        cases = [
+            (
+                'enrollments',
+                Enrollment.objects.select_related('student', 'course'),
+                EnrollmentSerializer,
+                EnrollmentValuesSerializer,
+            ),
+            (
+                'student-scores',
+                StudentAssessmentScore.objects.select_related('student', 'assessment', 'enrollment__course'),
+                StudentAssessmentScoreSerializer,
+                StudentAssessmentScoreValuesSerializer,
+            ),
+        ]
+
+        renderer = JSONRenderer()
+
+        for name, queryset, serializer_class, values_serializer_class in cases:
+            queryset = queryset[:rows]
+
+            def model_path():
+                return renderer.render(serializer_class(queryset.all(), many=True).data)
+
+            def values_path():
+                fast = values_serializer_class()
+                return renderer.render(fast.serialize(fast.values(queryset.all())))
+
+            model_time, model_body = self._best_of(model_path, repeat)
+            values_time, values_body = self._best_of(values_path, repeat)
+            count = queryset.count()
+
+            if model_body != values_body:
+                self.stdout.write(self.style.ERROR(f'{name}: output differs between paths'))
+                continue
+
+            speedup = model_time / values_time if values_time else float('inf')
+            self.stdout.write(
+                f'{name}: {count} rows, '
+                f'ModelSerializer {model_time * 1000:.1f} ms, '
+                f'values {values_time * 1000:.1f} ms '
+                + self.style.SUCCESS(f'({speedup:.1f}x)')
+            )
+
+    def _best_of(self, func, repeat):
+        best = None
+        body = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from outcomes.engines import ENGINES
+from outcomes.models import Enrollment, LearningOutcome, ProgramOutcome
+from outcomes.nplusone import allow_repeated_queries
+from outcomes.synthetic import generate_dataset
+from students.models import Student
+
+
+def _lo_score_calls(students):
+    """(LO, student, enrollment) for every active LO of every completed enrollment."""
+    los_by_course = {}
+    for lo in LearningOutcome.objects.filter(is_active=True).select_related('course'):
+        los_by_course.setdefault(lo.course_id, []).append(lo)
+    by_student = {student.pk: student for student in students}
+    enrollments = Enrollment.objects.filter(student__in=students, status='COMPLETED').order_by('id')
+    return [
+        (lo, by_student[enrollment.student_id], enrollment)
+        for enrollment in enrollments
+        for lo in los_by_course.get(enrollment.course_id, [])
+    ]
+
+
+def _po_score_calls(students):
+    program_outcomes = list(ProgramOutcome.objects.filter(is_active=True))
+    return [(po, student) for student in students for po in program_outcomes]
+
+
+def _student_calls(students):
+    return [(student,) for student in students]
+
+
+# function name -> builder of the argument tuples for a sample of students
+CALLS = {
+    'calculate_lo_score': _lo_score_calls,
+    'calculate_po_score': _po_score_calls,
+    'calculate_all_po_scores': _student_calls,
+    'get_student_po_summary': _student_calls,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the outcome calculation engines over generated datasets of several sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='50,200,1000',
+            help='Comma-separated numbers of students; a dataset is generated for each'
+        )
+        parser.add_argument('--sample', type=int, default=25, help='Students per dataset that are calculated')
+        parser.add_argument('--courses', type=int, default=24)
+        parser.add_argument('--courses-per-student', type=int, default=6)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--engines', help=f'Comma-separated subset of: {", ".join(ENGINES)}')
+        parser.add_argument('--functions', help=f'Comma-separated subset of: {", ".join(CALLS)}')
+        parser.add_argument(
+            '--existing', action='store_true',
+            help='Benchmark the data already in the database instead of generating datasets'
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        engines = self._subset(options['engines'], ENGINES, 'engine')
+        functions = self._subset(options['functions'], CALLS, 'function')
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated integers')
+
+        results = []
+        if options['existing']:
+            results.extend(self._bench_dataset(None, engines, functions, options))
+        else:
+            for size in sizes:
+                # Generated rows are rolled back so the database is left as it was
+                with transaction.atomic():
+                    generate_dataset(
+                        students=size,
+                        courses=options['courses'],
+                        courses_per_student=options['courses_per_student'],
+                        retake_rate=0.5,
+                        prefix='BENCH',
+                        seed=options['seed'],
+                    )
+                    results.extend(self._bench_dataset(size, engines, functions, options))
+                    transaction.set_rollback(True)
+
+        baseline = self._load_baseline(options['baseline']) if options['baseline'] else {}
+        self._print_table(results, baseline)
+
+        if options['output']:
+            report = {
+                'created_at': datetime.now(dt_timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'seed': options['seed'],
+                'sample': options['sample'],
+                'results': results,
+            }
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def _subset(self, value, choices, kind):
+        if not value:
+            return list(choices)
+        names = [name.strip() for name in value.split(',')]
+        unknown = [name for name in names if name not in choices]
+        if unknown:
+            raise CommandError(f'Unknown {kind}: {", ".join(unknown)}')
+        return names
+
+    def _bench_dataset(self, size, engines, functions, options):
+        students = Student.objects.all() if size is None else Student.objects.filter(
+            student_number__startswith='BENCH'
+        )
+        students = list(students.filter(enrollments__status='COMPLETED').distinct().order_by('id')[:options['sample']])
+        if not students:
+            raise CommandError('No students with completed enrollments to benchmark.')
+        if size is None:
+            size = Student.objects.count()
+
+        results = []
+        for function in functions:
+            calls = CALLS[function](students)
+            for engine in engines:
+                func = ENGINES[engine][function]
+                wall, queries = self._measure(func, calls)
+                peak = self._peak_memory(func, calls)
+                results.append({
+                    'engine': engine,
+                    'function': function,
+                    'dataset_students': size,
+                    'students': len(students),
+                    'calls': len(calls),
+                    'wall_s': round(wall, 4),
+                    'queries': queries,
+                    'peak_memory_kib': round(peak / 1024, 1),
+                    'students_per_s': round(len(students) / wall, 2) if wall else None,
+                    'ms_per_student': round(wall * 1000 / len(students), 3),
+                })
+        return results
+
+    def _run(self, func, calls):
+        # The engines query per item on purpose
+        with allow_repeated_queries():
+            if asyncio.iscoroutinefunction(func):
+                # Awaited one call after another, so only the engine's own
+                # fan-out is measured
+                async def run_all():
+                    for args in calls:
+                        await func(*args)
+                # async_to_sync keeps the async ORM calls on this thread's
+                # connection, which sees the uncommitted dataset
+                async_to_sync(run_all)()
+            else:
+                for args in calls:
+                    func(*args)
+
+    def _measure(self, func, calls):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            self._run(func, calls)
+            wall = time.perf_counter() - start
+        return wall, queries
+
+    def _peak_memory(self, func, calls):
+        # Separate pass: tracemalloc slows Python down too much to time with it
+        tracemalloc.start()
+        try:
+            self._run(func, calls)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def _load_baseline(self, path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                report = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+        return {
+            (row['engine'], row['function'], row['dataset_students']): row
+            for row in report.get('results', [])
+        }
+
+    def _print_table(self, results, baseline):
+        self.stdout.write(
+            f'{"engine":<10} {"function":<24} {"dataset":>8} {"ms/student":>11} '
+            f'{"students/s":>11} {"queries":>8} {"peak KiB":>9}'
+        )
+        for row in results:
+            line = (
+                f'{row["engine"]:<10} {row["function"]:<24} {row["dataset_students"]:>8} '
+                f'{row["ms_per_student"]:>11.2f} {row["students_per_s"] or 0:>11.1f} '
+                f'{row["queries"]:>8} {row["peak_memory_kib"]:>9.1f}'
+            )
+            previous = baseline.get((row['engine'], row['function'], row['dataset_students']))
+            if previous and previous['ms_per_student']:
+                ratio = row['ms_per_student'] / previous['ms_per_student']
+                style = self.style.ERROR if ratio > 1.1 else self.style.SUCCESS
+                line += ' ' + style(f'{ratio:.2f}x baseline')
+            self.stdout.write(line)
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outcomes.models import SEMESTER_ORDER
+from outcomes.term_close import close_term
+
+
+class Command(BaseCommand):
+    help = (
+        'Closes a term: completes its enrollments, assigns letter grades, records PLO achievements, '
+        'freezes its outcome results and invalidates cached calculations. Finished stages are skipped on rerun.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('semester', choices=list(SEMESTER_ORDER), type=str.upper)
+        parser.add_argument('year', type=int)
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Forget the checkpoints of the term and run every stage again'
+        )
+
+    def handle(self, *args, **options):
+        semester, year = options['semester'], options['year']
+        started = time.perf_counter()
+
+        def progress(checkpoint, skipped):
+            if skipped:
+                self.stdout.write(f'  {checkpoint.stage}: done at {checkpoint.finished_at:%Y-%m-%d %H:%M}, skipped')
+            else:
+                self.stdout.write(
+                    f'  {checkpoint.stage}: {checkpoint.rows} rows in {checkpoint.duration_ms / 1000:.2f}s'
+                )
+
+        self.stdout.write(f'Closing {semester} {year}')
+        close_term(semester, year, restart=options['restart'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Closed {semester} {year} in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from outcomes.models import SEMESTER_ORDER
+from outcomes.snapshots import TermFrozenError, freeze_term
+
+
+class Command(BaseCommand):
+    help = 'Stores the LO, PO and PLO results of a closed term as an immutable snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('semester', choices=list(SEMESTER_ORDER), type=str.upper)
+        parser.add_argument('year', type=int)
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Recompute the snapshot of a term that is already frozen (after a grade correction)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            snapshot = freeze_term(options['semester'], options['year'], replace=options['replace'])
+        except TermFrozenError as e:
+            raise CommandError(f'{e}; use --replace to recompute it.')
+
+        counts = ', '.join(f'{len(outcomes)} {kind}s' for kind, outcomes in snapshot.summary.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Froze {snapshot.semester} {snapshot.year}: {snapshot.results.count()} results for {counts} '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
@@ -1,4 +1,7 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from students.models import Student
@@ -12,14 +15,39 @@ from outcomes.models import (
     StudentPLOAchievement,
     LearningOutcome,
     ProgramOutcome,
-    Assessment
+    Assessment,
+    link_course_offerings,
 )
+from outcomes.caching import bump_data_version
+from outcomes.synthetic import generate_dataset, terms_between
+from students.autocomplete import bump_index_version
 
 
 class Command(BaseCommand):
     help = 'Populates the database with comprehensive test data'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, metavar='STUDENTS',
+            help='Instead of the sample records, generate a synthetic program with this many students'
+        )
+        parser.add_argument('--courses', type=int, default=60, help='Courses to generate with --scale')
+        parser.add_argument(
+            '--courses-per-student', type=int, default=8,
+            help='Courses each student takes; every course has 4 assessments (25 gives 100 scores per student)'
+        )
+        parser.add_argument('--los-per-course', type=int, default=4)
+        parser.add_argument('--program-outcomes', type=int, default=8)
+        parser.add_argument('--missing-score-rate', type=float, default=0.03)
+        parser.add_argument('--retake-rate', type=float, default=0.5,
+                            help='Share of failed courses taken again in the next term')
+        parser.add_argument('--seed', type=int, default=0, help='Same seed and arguments give the same data')
+        parser.add_argument('--prefix', default='SYN', help='Prefix of generated codes and student numbers')
+
     def handle(self, *args, **options):
+        if options['scale'] is not None:
+            return self.populate_scale(options)
+
         self.stdout.write(self.style.SUCCESS('Starting to populate test data...'))
         
         # Note: We don't clear existing data to avoid schema issues
@@ -179,6 +207,9 @@ class Command(BaseCommand):
                 self.stdout.write(f'  Created enrollment: {enrollment}')
             else:
                 self.stdout.write(f'  Found existing enrollment: {enrollment}')
+        linked = link_course_offerings()
+        if linked:
+            self.stdout.write(f'  Linked {linked} enrollments to their course offerings')
         
         # 8. Create Learning Outcomes
         self.stdout.write('Creating learning outcomes...')
@@ -302,3 +333,50 @@ class Command(BaseCommand):
         self.stdout.write(f'  - {len(program_outcomes)} program outcomes')
         self.stdout.write(f'  - {len(assessments)} assessments')
         self.stdout.write(self.style.SUCCESS('\nYou can now test your API endpoints!'))
+
+    def populate_scale(self, options):
+        students = options['scale']
+        prefix = options['prefix']
+        if students < 1:
+            raise CommandError('--scale must be at least 1')
+        if options['courses_per_student'] > options['courses']:
+            raise CommandError('--courses-per-student cannot exceed --courses')
+        if Course.objects.filter(code__startswith=prefix).exists():
+            raise CommandError(f'Courses with the prefix {prefix!r} already exist; pass another --prefix')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generating {students} students over {options["courses"]} courses (seed {options["seed"]})...'
+        ))
+        started = time.perf_counter()
+
+        def progress(students_done, scores_done):
+            self.stdout.write(
+                f'  {students_done}/{students} students, {scores_done} scores '
+                f'({time.perf_counter() - started:.0f}s)'
+            )
+
+        # One transaction: SQLite would otherwise sync to disk after every batch
+        with transaction.atomic():
+            counts = generate_dataset(
+                students=students,
+                courses=options['courses'],
+                courses_per_student=options['courses_per_student'],
+                los_per_course=options['los_per_course'],
+                program_outcomes=options['program_outcomes'],
+                missing_score_rate=options['missing_score_rate'],
+                retake_rate=options['retake_rate'],
+                terms=terms_between(2021, 2025),
+                prefix=prefix,
+                seed=options['seed'],
+                progress=progress,
+            )
+
+        # Bulk inserts bypass the signals that invalidate cached results
+        bump_data_version()
+        bump_index_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Generated in {time.perf_counter() - started:.1f}s:'
+        ))
+        for name, count in counts.items():
+            self.stdout.write(f'  - {count} {name.replace("_", " ")}')
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from outcomes.search import (
+    SEARCH_INDEXES,
+    create_search_indexes,
+    drop_search_indexes,
+    supports_search_index,
+)
+
+
+class Command(BaseCommand):
+    help = 'Drops and recreates the full-text search tables and triggers from the current index definitions'
+
+    def handle(self, *args, **options):
+        if not supports_search_index(connection):
+            raise CommandError('Full-text search indexes need SQLite 3.34 or newer.')
+
+        with connection.schema_editor() as schema_editor:
+            drop_search_indexes(apps, schema_editor)
+            create_search_indexes(apps, schema_editor)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(SEARCH_INDEXES)} search indexes'))
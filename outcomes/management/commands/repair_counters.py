@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from outcomes.counters import COUNTERS, counter_drift, recount_counters
+
+
+class Command(BaseCommand):
+    help = 'Compares the denormalized counters with the rows they count and fixes the ones that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift, exiting with an error when there is any'
+        )
+        parser.add_argument('--show', type=int, default=10, help='Drifted rows listed per model')
+
+    def handle(self, *args, **options):
+        drifted_total = 0
+        for label, fields in COUNTERS.items():
+            expected = [f'expected_{field}' for field in fields]
+            with transaction.atomic():
+                drifted = counter_drift(label)
+                rows = list(drifted.values('pk', *fields, *expected))
+                if rows and not options['check']:
+                    recount_counters({label: apps.get_model(label).objects.filter(pk__in=drifted.values('pk'))})
+
+            if not rows:
+                self.stdout.write(f'{label}: ok')
+                continue
+            drifted_total += len(rows)
+            action = 'drifted' if options['check'] else 'fixed'
+            self.stdout.write(self.style.WARNING(f'{label}: {len(rows)} rows {action}'))
+            for row in rows[:options['show']]:
+                changes = ', '.join(
+                    f'{field} {row[field]} -> {row[f"expected_{field}"]}'
+                    for field in fields if row[field] != row[f'expected_{field}']
+                )
+                self.stdout.write(f'  #{row["pk"]}: {changes}')
+
+        if drifted_total and options['check']:
+            raise CommandError(f'{drifted_total} rows have drifted counters; run repair_counters to fix them.')
+        self.stdout.write(self.style.SUCCESS(
+            f'{drifted_total} rows repaired' if drifted_total else 'All counters match'
+        ))
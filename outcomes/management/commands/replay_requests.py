@@ -0,0 +1,220 @@
+import json
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import Resolver404, resolve
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def endpoint_name(method, path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return f'{method} {path}'
+    return f'{method} {match.view_name or match._func_path}'
+
+
+class Command(BaseCommand):
+    help = 'Replays recorded requests (see REQUEST_RECORDER_LOG) and reports latency percentiles per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'file', nargs='?',
+            help='JSON-lines file of recorded requests (default: REQUEST_RECORDER_LOG)'
+        )
+        parser.add_argument(
+            '--base-url',
+            help='Send the requests to this server, e.g. http://localhost:8000 (default: in-process)'
+        )
+        parser.add_argument('--host', default='localhost', help='Host header of in-process requests')
+        parser.add_argument('--concurrency', type=int, default=10, help='Requests in flight at once')
+        parser.add_argument('--repeat', type=int, default=1, help='Times the whole file is replayed')
+        parser.add_argument('--limit', type=int, help='Replay only the first N requests of the file')
+        parser.add_argument(
+            '--include-writes', action='store_true',
+            help='Also replay POST/PUT/PATCH/DELETE requests (only safe methods by default)'
+        )
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds per request against --base-url')
+        parser.add_argument('--output', help='Write the per-endpoint results as JSON to this file')
+
+    def handle(self, *args, **options):
+        path = options['file'] or getattr(settings, 'REQUEST_RECORDER_LOG', None)
+        if not path:
+            raise CommandError('Pass a file or set REQUEST_RECORDER_LOG.')
+        entries, skipped = self._load(path, options)
+        if not entries:
+            raise CommandError(f'No requests to replay in {path}.')
+        entries = entries * options['repeat']
+
+        if options['base_url']:
+            send = self._http_sender(options['base_url'].rstrip('/'), options['timeout'])
+        else:
+            send = self._client_sender(options['host'])
+
+        # Replayed traffic must not be recorded again
+        with override_settings(REQUEST_RECORDER_LOG=None):
+            start = time.perf_counter()
+            if options['concurrency'] <= 1:
+                outcomes = [send(entry) for entry in entries]
+            else:
+                with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                    outcomes = list(pool.map(send, entries))
+            elapsed = time.perf_counter() - start
+
+        results = self._summarize(entries, outcomes)
+        self._print(results, len(entries), elapsed, skipped, options['concurrency'])
+
+        if options['output']:
+            report = {
+                'file': str(path),
+                'target': options['base_url'] or 'in-process',
+                'concurrency': options['concurrency'],
+                'requests': len(entries),
+                'elapsed_s': round(elapsed, 3),
+                'requests_per_s': round(len(entries) / elapsed, 2) if elapsed else None,
+                'endpoints': results,
+            }
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def _load(self, path, options):
+        entries = []
+        skipped = 0
+        try:
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if not isinstance(entry, dict) or not entry.get('method') or not entry.get('path'):
+                        skipped += 1
+                        continue
+                    if entry['method'] not in SAFE_METHODS and not options['include_writes']:
+                        skipped += 1
+                        continue
+                    entries.append(entry)
+                    if options['limit'] and len(entries) >= options['limit']:
+                        break
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        return entries, skipped
+
+    def _client_sender(self, host):
+        local = threading.local()
+
+        def send(entry):
+            if not hasattr(local, 'client'):
+                local.client = Client(HTTP_HOST=host)
+            path = entry['path']
+            if entry.get('params'):
+                path = f'{path}?{urlencode(entry["params"], doseq=True)}'
+            start = time.perf_counter()
+            try:
+                response = local.client.generic(
+                    entry['method'], path,
+                    data=(entry.get('body') or '').encode('utf-8'),
+                    content_type=entry.get('content_type') or 'application/octet-stream',
+                )
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+                status = response.status_code
+            except Exception:
+                status = None
+            return status, time.perf_counter() - start
+
+        return send
+
+    def _http_sender(self, base_url, timeout):
+        def send(entry):
+            url = base_url + entry['path']
+            if entry.get('params'):
+                url = f'{url}?{urlencode(entry["params"], doseq=True)}'
+            body = entry.get('body')
+            request = urllib.request.Request(
+                url, method=entry['method'],
+                data=body.encode('utf-8') if body is not None else None,
+                headers={'Content-Type': entry['content_type']} if entry.get('content_type') else {},
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            except (urllib.error.URLError, OSError):
+                status = None
+            return status, time.perf_counter() - start
+
+        return send
+
+    def _summarize(self, entries, outcomes):
+        grouped = defaultdict(list)
+        names = {}
+        for entry, outcome in zip(entries, outcomes):
+            key = (entry['method'], entry['path'])
+            if key not in names:
+                names[key] = endpoint_name(*key)
+            grouped[names[key]].append(outcome)
+
+        results = []
+        for name, items in grouped.items():
+            durations = sorted(duration * 1000 for _, duration in items)
+            statuses = [status for status, _ in items]
+            row = {
+                'endpoint': name,
+                'requests': len(items),
+                'errors': sum(1 for status in statuses if status is None or status >= 400),
+                'failed': sum(1 for status in statuses if status is None),
+                'mean_ms': round(sum(durations) / len(durations), 2),
+                'max_ms': round(durations[-1], 2),
+            }
+            for p in PERCENTILES:
+                row[f'p{p}_ms'] = round(percentile(durations, p), 2)
+            results.append(row)
+        results.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return results
+
+    def _print(self, results, total, elapsed, skipped, concurrency):
+        self.stdout.write(
+            f'{"endpoint":<60} {"requests":>8} {"errors":>7} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}'
+        )
+        for row in results:
+            errors = f'{row["errors"]:>7}'
+            self.stdout.write(
+                f'{row["endpoint"][:60]:<60} {row["requests"]:>8} '
+                + (self.style.ERROR(errors) if row['errors'] else errors)
+                + f' {row["p50_ms"]:>9.1f} {row["p95_ms"]:>9.1f} {row["p99_ms"]:>9.1f}'
+            )
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            f'\n{total} requests in {elapsed:.2f}s ({rate:.1f} req/s), concurrency {concurrency}'
+            + (f', {skipped} lines skipped' if skipped else '')
+        )
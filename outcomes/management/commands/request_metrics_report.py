@@ -0,0 +1,84 @@
+import glob
+import json
+import math
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+SORT_KEYS = {
+    'total': lambda row: row['total_ms'] * row['requests'],
+    'avg': lambda row: row['total_ms'],
+    'p95': lambda row: row['p95_ms'],
+    'queries': lambda row: row['queries'],
+    'requests': lambda row: row['requests'],
+}
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, math.ceil(fraction * len(values)) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Aggregates the request metrics log per view (requests, latency, SQL, serializer and calculation time)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', help='Log file (defaults to REQUEST_METRICS_LOG, rotated files included)')
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='total',
+                            help='total = time spent across all requests of the view')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='Print the aggregation as JSON')
+
+    def handle(self, *args, **options):
+        path = options['log'] or getattr(settings, 'REQUEST_METRICS_LOG', None)
+        if not path:
+            raise CommandError('No log file given and REQUEST_METRICS_LOG is not set.')
+        files = sorted(glob.glob(f'{glob.escape(str(path))}*'))
+        if not files:
+            raise CommandError(f'No request metrics found at {path}.')
+
+        by_view = {}
+        for name in files:
+            with open(name, encoding='utf-8') as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    key = f"{entry['method']} {entry['view'] or entry['path']}"
+                    by_view.setdefault(key, []).append(entry)
+
+        rows = []
+        for view, entries in by_view.items():
+            count = len(entries)
+            totals = [entry['total_ms'] for entry in entries]
+            rows.append({
+                'view': view,
+                'requests': count,
+                'errors': sum(1 for entry in entries if entry['status'] >= 500),
+                'total_ms': round(sum(totals) / count, 2),
+                'p95_ms': round(_percentile(totals, 0.95), 2),
+                'queries': round(sum(entry['queries'] for entry in entries) / count, 1),
+                'max_queries': max(entry['queries'] for entry in entries),
+                'db_ms': round(sum(entry['db_ms'] for entry in entries) / count, 2),
+                'serializer_ms': round(sum(entry['serializer_ms'] for entry in entries) / count, 2),
+                'calc_ms': round(sum(entry['calc_ms'] for entry in entries) / count, 2),
+            })
+        rows.sort(key=SORT_KEYS[options['sort']], reverse=True)
+        rows = rows[:options['limit']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'view':<50} {'reqs':>6} {'avg ms':>8} {'p95 ms':>8} {'queries':>8} "
+            f"{'max q':>6} {'db ms':>8} {'ser ms':>8} {'calc ms':>8}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['view'][:50]:<50} {row['requests']:>6} {row['total_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['queries']:>8.1f} {row['max_queries']:>6} {row['db_ms']:>8.1f} "
+                f"{row['serializer_ms']:>8.1f} {row['calc_ms']:>8.1f}"
+            )
@@ -0,0 +1,137 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .caching import request_cache
+from .instrumentation import collect_metrics, log_request
+from .nplusone import current_mode, detect_queries
+from .recorder import capture_body, record_request, should_record
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class CalculationCacheMiddleware:
+    """
+    Share calculation results between all serializers of one read request.
+
+    Unsafe methods are left alone so that a write followed by a calculation
+    in the same request never sees a result from before the write.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method not in SAFE_METHODS:
+            return self.get_response(request)
+        with request_cache():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method not in SAFE_METHODS:
+            return await self.get_response(request)
+        with request_cache():
+            return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Report SQL, serializer and calculation costs of each request.
+
+    Adds a ``Server-Timing`` header and appends the numbers to the request
+    metrics log. Place it first so that its total covers the other middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        with collect_metrics() as metrics:
+            response = await self.get_response(request)
+        return self._finish(request, response, metrics)
+
+    def _finish(self, request, response, metrics):
+        total = metrics.elapsed()
+        response['Server-Timing'] = metrics.server_timing(total)
+        log_request(request, response, metrics, total)
+        return response
+
+
+class RequestRecorderMiddleware:
+    """Append the requests picked by ``should_record`` to ``REQUEST_RECORDER_LOG`` for replay."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not should_record(request):
+            return self.get_response(request)
+        # Read before the view consumes the stream
+        body = capture_body(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        record_request(request, response, body, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not should_record(request):
+            return await self.get_response(request)
+        body = capture_body(request)
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        record_request(request, response, body, time.perf_counter() - start)
+        return response
+
+
+class NPlusOneMiddleware:
+    """Report repeated queries per request according to ``NPLUSONE_MODE``."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Inside a test the runner's mode applies
+        mode = current_mode() or getattr(settings, 'NPLUSONE_MODE', 'off')
+        if mode == 'off':
+            return self.get_response(request)
+        with detect_queries(mode, label=f'{request.method} {request.path}'):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # Inside a test the runner's mode applies
+        mode = current_mode() or getattr(settings, 'NPLUSONE_MODE', 'off')
+        if mode == 'off':
+            return await self.get_response(request)
+        with detect_queries(mode, label=f'{request.method} {request.path}'):
+            return await self.get_response(request)
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('outcomes', '0002_assessmentlomapping_lopomapping_and_more'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentlomapping',
+            index=models.Index(fields=['learning_outcome', 'assessment', 'contribution_percentage'], name='assessment_lo_by_lo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'course', 'status', '-year', '-semester'], name='enrollment_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lopomapping',
+            index=models.Index(fields=['program_outcome', 'learning_outcome', 'weight'], name='lo_po_by_po_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentassessmentscore',
+            index=models.Index(fields=['student', 'enrollment', 'assessment', 'score'], name='score_by_enrollment_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:29
+
+from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+
+
+SEMESTER_ORDER = {'SPRING': 1, 'SUMMER': 2, 'FALL': 3}
+
+
+def backfill_term_keys(apps, schema_editor):
+    # One set-based UPDATE per table: year * 10 + the semester's ordinal
+    ordinal = Case(
+        *[When(semester=name, then=Value(number)) for name, number in SEMESTER_ORDER.items()],
+        default=Value(0),
+    )
+    for name in ('Enrollment', 'CourseOffering'):
+        apps.get_model('outcomes', name).objects.update(term_key=F('year') * 10 + ordinal)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('outcomes', '0003_calculation_indexes'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='courseoffering',
+            options={'ordering': ['-term_key', 'course'], 'verbose_name': 'Course Offering', 'verbose_name_plural': 'Course Offerings'},
+        ),
+        migrations.AlterModelOptions(
+            name='enrollment',
+            options={'ordering': ['-term_key'], 'verbose_name': 'Enrollment', 'verbose_name_plural': 'Enrollments'},
+        ),
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollment_latest_idx',
+        ),
+        migrations.AddField(
+            model_name='courseoffering',
+            name='term_key',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='term_key',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_term_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'course', 'status', '-term_key'], name='enrollment_latest_idx'),
+        ),
+    ]
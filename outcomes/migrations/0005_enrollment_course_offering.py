@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery
+
+
+def backfill_course_offerings(apps, schema_editor):
+    # The offering holding the assessments an enrollment has scores for,
+    # else the lowest section of its course in that term
+    Enrollment = apps.get_model('outcomes', 'Enrollment')
+    CourseOffering = apps.get_model('outcomes', 'CourseOffering')
+    StudentAssessmentScore = apps.get_model('outcomes', 'StudentAssessmentScore')
+
+    by_scores = StudentAssessmentScore.objects.filter(
+        enrollment=OuterRef('pk'), assessment__course_offering__course=OuterRef('course')
+    ).order_by('pk')
+    by_term = CourseOffering.objects.filter(
+        course=OuterRef('course'), semester=OuterRef('semester'), year=OuterRef('year')
+    ).order_by('section', 'pk')
+
+    unlinked = Enrollment.objects.filter(course_offering__isnull=True)
+    unlinked.filter(Exists(by_scores)).update(
+        course_offering=Subquery(by_scores.values('assessment__course_offering')[:1])
+    )
+    unlinked.filter(Exists(by_term)).update(course_offering=Subquery(by_term.values('pk')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0004_term_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='course_offering',
+            field=models.ForeignKey(blank=True, help_text='Offering (section) taken; must match the course, semester and year', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='enrollments', to='outcomes.courseoffering'),
+        ),
+        migrations.RunPython(backfill_course_offerings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:37
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.lookups import GreaterThan
+
+
+def backfill_normalized(apps, schema_editor):
+    # One set-based UPDATE reading each row's assessment: score / max_score * 100, 0 without a max score
+    Assessment = apps.get_model('outcomes', 'Assessment')
+    max_score = Subquery(Assessment.objects.filter(pk=OuterRef('assessment')).values('max_score')[:1])
+    apps.get_model('outcomes', 'StudentAssessmentScore').objects.update(normalized=Case(
+        When(GreaterThan(max_score, 0), then=F('score') / max_score * Value(100.0)),
+        default=Value(0.0),
+        output_field=models.FloatField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0005_enrollment_course_offering'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='studentassessmentscore',
+            name='score_by_enrollment_idx',
+        ),
+        migrations.AddField(
+            model_name='studentassessmentscore',
+            name='normalized',
+            field=models.FloatField(editable=False, help_text="Score as a percentage of the assessment's max score, kept in step on every write", null=True),
+        ),
+        migrations.RunPython(backfill_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='studentassessmentscore',
+            index=models.Index(fields=['student', 'enrollment', 'assessment', 'normalized'], name='score_by_enrollment_idx'),
+        ),
+    ]
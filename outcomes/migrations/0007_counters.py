@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    # One set-based UPDATE per table
+    Enrollment = apps.get_model('outcomes', 'Enrollment')
+    Assessment = apps.get_model('outcomes', 'Assessment')
+
+    def count(model, key):
+        rows = model.objects.filter(**{key: OuterRef('pk')}).order_by().values(key)
+        return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n')), 0)
+
+    completed = Enrollment.objects.filter(status='COMPLETED', student=OuterRef('pk')).order_by().values('student')
+    apps.get_model('courses', 'Course').objects.update(
+        enrolled_count=count(Enrollment, 'course'),
+        assessment_count=count(Assessment, 'course_offering__course'),
+    )
+    apps.get_model('outcomes', 'CourseOffering').objects.update(
+        enrolled_count=count(Enrollment, 'course_offering'),
+        assessment_count=count(Assessment, 'course_offering'),
+    )
+    apps.get_model('students', 'Student').objects.update(
+        completed_courses=Coalesce(Subquery(completed.annotate(n=Count('pk')).values('n')), 0),
+        completed_credits=Coalesce(Subquery(completed.annotate(n=Sum('course__credit')).values('n')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_counters'),
+        ('outcomes', '0006_score_normalized'),
+        ('students', '0002_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseoffering',
+            name='assessment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='courseoffering',
+            name='enrolled_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Enrollments linked to this offering'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0007_counters'),
+    ]
+
+    operations = [
+        # Existing rows take the time of the migration as their updated_at, so
+        # the first pull after it returns everything once
+        migrations.RemoveIndex(
+            model_name='assessmentlomapping',
+            name='assessment_lo_by_lo_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='lopomapping',
+            name='lo_po_by_po_idx',
+        ),
+        migrations.AddField(
+            model_name='assessmentlomapping',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='courseoffering',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='courseplomapping',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='lopomapping',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='studentassessmentscore',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='studentploachievement',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='assessment',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='learningoutcome',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='programlearningoutcome',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='programoutcome',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        # The covering indexes of the calculation lookups take the new column
+        migrations.AddIndex(
+            model_name='assessmentlomapping',
+            index=models.Index(fields=['learning_outcome', 'assessment', 'contribution_percentage', 'updated_at'], name='assessment_lo_by_lo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lopomapping',
+            index=models.Index(fields=['program_outcome', 'learning_outcome', 'weight', 'updated_at'], name='lo_po_by_po_idx'),
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at'],
+                'indexes': [models.Index(fields=['model_label', 'deleted_at'], name='tombstone_since_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0009_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=10)),
+                ('year', models.IntegerField()),
+                ('term_key', models.IntegerField(unique=True)),
+                ('summary', models.JSONField(default=dict)),
+                ('frozen_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-term_key'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TermResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('LO', 'Learning Outcome'), ('PO', 'Program Outcome'), ('PLO', 'Program Learning Outcome')], max_length=3)),
+                ('outcome_id', models.IntegerField()),
+                ('student_id', models.IntegerField()),
+                ('enrollment_id', models.IntegerField(null=True)),
+                ('score', models.FloatField()),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='outcomes.termsnapshot')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['snapshot', 'student_id', 'kind'], name='term_result_by_student_idx')],
+            },
+        ),
+    ]
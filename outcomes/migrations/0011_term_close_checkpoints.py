@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0010_term_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermCloseCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=10)),
+                ('year', models.IntegerField()),
+                ('term_key', models.IntegerField()),
+                ('stage', models.CharField(max_length=20)),
+                ('rows', models.IntegerField(default=0, help_text='Rows the stage wrote')),
+                ('duration_ms', models.FloatField()),
+                ('finished_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['term_key', 'finished_at'],
+                'unique_together': {('term_key', 'stage')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+import sqlite3
+
+from django.db import migrations
+
+
+# Shadow tables as of this migration (db_table -> indexed columns); the
+# triggers only read and write their own table
+INDEXES = {
+    'outcomes_learningoutcome': ['code', 'description'],
+    'outcomes_programoutcome': ['code', 'title', 'description'],
+    'outcomes_programlearningoutcome': ['short_name', 'description'],
+    'outcomes_assessment': ['name', 'description', 'rubric'],
+}
+
+
+def supported(schema_editor):
+    # The trigram tokenizer appeared in SQLite 3.34
+    return schema_editor.connection.vendor == 'sqlite' and sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def create_search_indexes(apps, schema_editor):
+    if not supported(schema_editor):
+        return
+    for db_table, columns in INDEXES.items():
+        table = f'{db_table}_fts'
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        insert_new = f'INSERT INTO {table}(rowid, {names}) VALUES (new.id, {new_values});'
+        delete_old = f'DELETE FROM {table} WHERE rowid = old.id;'
+        for statement in [
+            f"CREATE VIRTUAL TABLE {table} USING fts5({names}, tokenize='trigram');",
+            f'CREATE TRIGGER {table}_ai AFTER INSERT ON {db_table} BEGIN {insert_new} END;',
+            f'CREATE TRIGGER {table}_au AFTER UPDATE OF id, {names} ON {db_table} '
+            f'BEGIN {delete_old} {insert_new} END;',
+            f'CREATE TRIGGER {table}_ad AFTER DELETE ON {db_table} BEGIN {delete_old} END;',
+            f'INSERT INTO {table}(rowid, {names}) SELECT id, {names} FROM {db_table};',
+        ]:
+            schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if not supported(schema_editor):
+        return
+    for db_table in INDEXES:
+        table = f'{db_table}_fts'
+        for suffix in ('ai', 'au', 'ad'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_{suffix};')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table};')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0011_term_close_checkpoints'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
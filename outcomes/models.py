@@ -1,9 +1,134 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import DEFERRED, Case, Exists, F, OuterRef, Subquery, Value, When
+from django.db.models.lookups import GreaterThan
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from core.denormalized import ProtectedColumnsMixin
+from core.timestamps import TimestampedMixin, TimestampedQuerySet
+from core.tracking import TrackedQuerySet, update_transitions
 
-class ProgramLearningOutcome(models.Model):
+
+# Position of each semester within its calendar year
+SEMESTER_ORDER = {'SPRING': 1, 'SUMMER': 2, 'FALL': 3}
+
+
+def term_key(year, semester):
+    """Sortable integer for a term: ``year * 10 + semester ordinal`` (FALL 2024 -> 20243)."""
+    return year * 10 + SEMESTER_ORDER.get(semester, 0)
+
+
+def term_key_expression(year=None, semester=None):
+    """
+    SQL expression for ``term_key``. ``year`` and ``semester`` are the new
+    values of an UPDATE; when omitted the row's own column is used.
+    """
+    if year is None:
+        year = F('year')
+    elif not hasattr(year, 'resolve_expression'):
+        year = Value(year)
+    if semester is None:
+        ordinal = Case(
+            *[When(semester=name, then=Value(number)) for name, number in SEMESTER_ORDER.items()],
+            default=Value(0),
+        )
+    else:
+        ordinal = Value(SEMESTER_ORDER.get(semester, 0))
+    return year * 10 + ordinal
+
+
+class TermQuerySet(TrackedQuerySet):
+    """Keeps ``term_key`` in step on the bulk paths, which bypass ``save()``."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.term_key = term_key(obj.year, obj.semester)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if {'year', 'semester'} & set(fields):
+            for obj in objs:
+                obj.term_key = term_key(obj.year, obj.semester)
+            fields = [*fields, 'term_key']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if 'year' in kwargs or 'semester' in kwargs:
+            kwargs['term_key'] = term_key_expression(kwargs.get('year'), kwargs.get('semester'))
+        return super().update(**kwargs)
+
+
+# Enrollment columns read by the counter receivers, in ``enrollment_state`` order
+COUNTED_ATTNAMES = ('student_id', 'course_id', 'course_offering_id', 'status')
+
+
+class EnrollmentQuerySet(TermQuerySet):
+    """Also keeps the counters of ``outcomes.counters`` in step on the bulk paths."""
+
+    def _counted_fields(self, fields):
+        from .counters import ENROLLMENT_FIELDS
+        return {self.model._meta.get_field(name).name for name in fields} & set(ENROLLMENT_FIELDS)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from . import counters
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+            # Which rows were inserted is unknown; recount the ones they touch
+            counters.recount_enrollment_targets([counters.enrollment_state(obj) for obj in objs])
+        else:
+            counters.enrollments_changed((None, counters.enrollment_state(obj)) for obj in objs)
+        for obj in objs:
+            obj._counted = counters.enrollment_state(obj)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from . import counters
+
+        # The counters follow in update(), which bulk_update() runs per batch
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if self._counted_fields(fields):
+            for obj in objs:
+                obj._counted = counters.enrollment_state(obj)
+        return rows
+
+    def update(self, **kwargs):
+        from . import counters
+
+        if not self._counted_fields(kwargs):
+            return super().update(**kwargs)
+        # Read first: the filter may no longer match after the update
+        transitions = update_transitions(self, kwargs, counters.ENROLLMENT_FIELDS)
+        rows = super().update(**kwargs)
+        counters.enrollments_changed(transitions.values())
+        return rows
+
+
+class TermKeyModel(models.Model):
+    """
+    Adds ``term_key``, a denormalized copy of ``year`` and ``semester`` that
+    sorts chronologically. Subclasses define ``year`` and ``semester``.
+    """
+    term_key = models.IntegerField(default=0, editable=False, db_index=True)
+
+    objects = TermQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.term_key = term_key(self.year, self.semester)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'year', 'semester'} & set(update_fields):
+            kwargs['update_fields'] = [*update_fields, 'term_key']
+        super().save(*args, **kwargs)
+
+
+class ProgramLearningOutcome(TimestampedMixin, models.Model):
     """
     Represents a Program Learning Outcome (PLO) for the engineering program.
     These are the competencies students should achieve upon graduation.
@@ -27,7 +152,9 @@ class ProgramLearningOutcome(models.Model):
     )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         ordering = ['number']
@@ -38,13 +165,21 @@ class ProgramLearningOutcome(models.Model):
         return f"PLO-{self.number}: {self.short_name}"
 
 
-class Enrollment(models.Model):
+class Enrollment(TimestampedMixin, TermKeyModel):
     """
     Represents a student's enrollment in a specific course.
     Tracks grades and PLO achievements.
     """
     student = models.ForeignKey('students.Student', on_delete=models.CASCADE, related_name='enrollments')
     course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, related_name='enrollments')
+    course_offering = models.ForeignKey(
+        'CourseOffering',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='enrollments',
+        help_text="Offering (section) taken; must match the course, semester and year"
+    )
     semester = models.CharField(
         max_length=20,
         choices=[
@@ -92,18 +227,74 @@ class Enrollment(models.Model):
     )
     enrolled_at = models.DateTimeField(default=timezone.now)
     completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = EnrollmentQuerySet.as_manager()
 
     class Meta:
         unique_together = ['student', 'course', 'semester', 'year']
-        ordering = ['-year', '-semester']
+        ordering = ['-term_key']
+        indexes = [
+            # Latest completed enrollment of a student in a course in one seek
+            models.Index(fields=['student', 'course', 'status', '-term_key'], name='enrollment_latest_idx'),
+        ]
         verbose_name = 'Enrollment'
         verbose_name_plural = 'Enrollments'
 
     def __str__(self):
         return f"{self.student.name} - {self.course.code} ({self.semester} {self.year})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored state for the counter receivers; None when a column was deferred
+        state = [instance.__dict__.get(name, DEFERRED) for name in COUNTED_ATTNAMES]
+        instance._counted = None if DEFERRED in state else tuple(state)
+        return instance
+
+    def clean(self):
+        super().clean()
+        offering = self.course_offering
+        if offering is not None and not offering_matches(offering, self.course_id, self.semester, self.year):
+            raise ValidationError({
+                'course_offering': 'The offering must be of the same course, semester and year as the enrollment.'
+            })
+
+
+def offering_matches(offering, course_id, semester, year):
+    return (offering.course_id, offering.semester, offering.year) == (course_id, semester, year)
+
+
+def link_course_offerings(enrollments=None, offerings=None, scores=None):
+    """
+    Set ``course_offering`` on the unlinked ``enrollments`` with set-based
+    UPDATEs and return how many were linked.
 
-class CourseOffering(models.Model):
+    The offering is the one holding the assessments the enrollment has
+    scores for; enrollments without scores get the lowest section of their
+    course in that term. Migrations pass the querysets of their historical
+    models; by default all rows are considered.
+    """
+    enrollments = Enrollment.objects.all() if enrollments is None else enrollments
+    offerings = CourseOffering.objects.all() if offerings is None else offerings
+    scores = StudentAssessmentScore.objects.all() if scores is None else scores
+
+    by_scores = scores.filter(
+        enrollment=OuterRef('pk'), assessment__course_offering__course=OuterRef('course')
+    ).order_by('pk')
+    by_term = offerings.filter(
+        course=OuterRef('course'), semester=OuterRef('semester'), year=OuterRef('year')
+    ).order_by('section', 'pk')
+
+    unlinked = enrollments.filter(course_offering__isnull=True)
+    linked = unlinked.filter(Exists(by_scores)).update(
+        course_offering=Subquery(by_scores.values('assessment__course_offering')[:1])
+    )
+    linked += unlinked.filter(Exists(by_term)).update(course_offering=Subquery(by_term.values('pk')[:1]))
+    return linked
+
+
+class CourseOffering(TimestampedMixin, ProtectedColumnsMixin, TermKeyModel):
     """
     Represents a specific offering of a course in a given semester/year.
     Links professors to courses with scheduling info.
@@ -124,10 +315,15 @@ class CourseOffering(models.Model):
     schedule = models.CharField(max_length=100, blank=True, help_text="e.g., 'Mon/Wed 10:00-11:30'")
     classroom = models.CharField(max_length=50, blank=True)
     is_active = models.BooleanField(default=True)
+    enrolled_count = models.IntegerField(default=0, editable=False, help_text="Enrollments linked to this offering")
+    assessment_count = models.IntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    protected_columns = ('enrolled_count', 'assessment_count')
 
     class Meta:
         unique_together = ['course', 'semester', 'year', 'section']
-        ordering = ['-year', '-semester', 'course']
+        ordering = ['-term_key', 'course']
         verbose_name = 'Course Offering'
         verbose_name_plural = 'Course Offerings'
 
@@ -135,7 +331,7 @@ class CourseOffering(models.Model):
         return f"{self.course.code} - {self.semester} {self.year} (Section {self.section})"
 
 
-class CoursePLOMapping(models.Model):
+class CoursePLOMapping(TimestampedMixin, models.Model):
     """
     Maps which PLOs are addressed/assessed in each course.
     Tracks the contribution level of each course to specific PLOs.
@@ -161,6 +357,9 @@ class CoursePLOMapping(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(100)],
         help_text="Weight of this PLO in overall course assessment"
     )
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         unique_together = ['course', 'plo']
@@ -172,7 +371,7 @@ class CoursePLOMapping(models.Model):
         return f"{self.course.code} → PLO-{self.plo.number} ({self.contribution_level})"
 
 
-class StudentPLOAchievement(models.Model):
+class StudentPLOAchievement(TimestampedMixin, models.Model):
     """
     Tracks individual student achievement of specific PLOs through course enrollments.
     This allows monitoring of student progress towards learning outcomes.
@@ -195,6 +394,9 @@ class StudentPLOAchievement(models.Model):
     )
     notes = models.TextField(blank=True)
     assessed_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         unique_together = ['student', 'plo', 'enrollment']
@@ -206,7 +408,7 @@ class StudentPLOAchievement(models.Model):
         return f"{self.student.name} - PLO-{self.plo.number}: {self.achievement_level}"
 
 
-class LearningOutcome(models.Model):
+class LearningOutcome(TimestampedMixin, models.Model):
     """
     Represents a Course Learning Outcome (CLO) - specific learning objectives for individual courses.
     These are more granular than PLOs and map to specific course content.
@@ -241,7 +443,9 @@ class LearningOutcome(models.Model):
     )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TrackedQuerySet.as_manager()
 
     class Meta:
         ordering = ['course', 'code']
@@ -253,7 +457,7 @@ class LearningOutcome(models.Model):
         return f"{self.course.code} - {self.code}: {self.description[:50]}"
 
 
-class ProgramOutcome(models.Model):
+class ProgramOutcome(TimestampedMixin, models.Model):
     """
     Represents broader program-level outcomes beyond the 11 PLOs.
     Can include institutional goals, accreditation requirements, etc.
@@ -279,7 +483,9 @@ class ProgramOutcome(models.Model):
     )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TrackedQuerySet.as_manager()
 
     class Meta:
         ordering = ['code']
@@ -290,7 +496,57 @@ class ProgramOutcome(models.Model):
         return f"{self.code}: {self.title}"
 
 
-class Assessment(models.Model):
+class AssessmentQuerySet(TrackedQuerySet):
+    """
+    Refreshes the stored normalized scores when ``max_score`` changes in bulk
+    and keeps the assessment counters of ``outcomes.counters`` in step.
+    """
+
+    def _moves(self, fields):
+        return 'course_offering' in {self.model._meta.get_field(name).name for name in fields}
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from . import counters
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        offering_ids = [obj.course_offering_id for obj in objs]
+        if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+            counters.recount_assessment_targets(offering_ids)
+        else:
+            counters.assessments_changed(
+                ((None, pk) for pk in offering_ids), counters.offering_courses(offering_ids)
+            )
+        for obj in objs:
+            obj._counted = obj.course_offering_id
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        # Scores and counters follow in update(), which bulk_update() runs per batch
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if self._moves(fields):
+            for obj in objs:
+                obj._counted = obj.course_offering_id
+        return rows
+
+    def update(self, **kwargs):
+        from . import counters
+
+        moves = self._moves(kwargs)
+        if 'max_score' not in kwargs and not moves:
+            return super().update(**kwargs)
+        # Read first: the filter may no longer match after the update
+        transitions = update_transitions(self, kwargs, ['course_offering'])
+        rows = super().update(**kwargs)
+        if 'max_score' in kwargs:
+            refresh_normalized_scores(list(transitions))
+        if moves:
+            changes = [(old, new) for (old,), (new,) in transitions.values()]
+            counters.assessments_changed(changes, counters.offering_courses(pk for pair in changes for pk in pair))
+        return rows
+
+
+class Assessment(TimestampedMixin, models.Model):
     """
     Represents assessment activities used to measure student achievement of learning outcomes.
     Examples: exams, projects, quizzes, assignments, presentations.
@@ -338,7 +594,9 @@ class Assessment(models.Model):
     )
     is_graded = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = AssessmentQuerySet.as_manager()
 
     class Meta:
         ordering = ['course_offering', 'due_date', 'name']
@@ -348,8 +606,16 @@ class Assessment(models.Model):
     def __str__(self):
         return f"{self.course_offering.course.code} - {self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the post_save receivers skip work when max_score or the offering is unchanged
+        instance._loaded_max_score = instance.__dict__.get('max_score')
+        instance._counted = instance.__dict__.get('course_offering_id')
+        return instance
+
 
-class AssessmentLOMapping(models.Model):
+class AssessmentLOMapping(TimestampedMixin, models.Model):
     """
     Maps assessments to learning outcomes with contribution percentage.
     This defines how much each assessment contributes to a specific LO.
@@ -368,9 +634,19 @@ class AssessmentLOMapping(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(100)],
         help_text="How much this assessment contributes to the LO (0-100%)"
     )
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TrackedQuerySet.as_manager()
 
     class Meta:
         unique_together = ['assessment', 'learning_outcome']
+        indexes = [
+            # Covers the mappings of an LO, so the lookup never reads the table
+            models.Index(
+                fields=['learning_outcome', 'assessment', 'contribution_percentage', 'updated_at'],
+                name='assessment_lo_by_lo_idx',
+            ),
+        ]
         verbose_name = 'Assessment-LO Mapping'
         verbose_name_plural = 'Assessment-LO Mappings'
 
@@ -378,7 +654,7 @@ class AssessmentLOMapping(models.Model):
         return f"{self.assessment.name} → {self.learning_outcome.code} ({self.contribution_percentage}%)"
 
 
-class LOPOMapping(models.Model):
+class LOPOMapping(TimestampedMixin, models.Model):
     """
     Maps learning outcomes to program outcomes with weight (1-5 scale).
     This defines how strongly each LO contributes to a PO.
@@ -397,9 +673,19 @@ class LOPOMapping(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(5)],
         help_text="Weight of LO contribution to PO (1-5 scale)"
     )
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TrackedQuerySet.as_manager()
 
     class Meta:
         unique_together = ['learning_outcome', 'program_outcome']
+        indexes = [
+            # Covers the mappings of a PO, so the lookup never reads the table
+            models.Index(
+                fields=['program_outcome', 'learning_outcome', 'weight', 'updated_at'],
+                name='lo_po_by_po_idx',
+            ),
+        ]
         verbose_name = 'LO-PO Mapping'
         verbose_name_plural = 'LO-PO Mappings'
 
@@ -407,7 +693,83 @@ class LOPOMapping(models.Model):
         return f"{self.learning_outcome.code} → {self.program_outcome.code} (weight: {self.weight})"
 
 
-class StudentAssessmentScore(models.Model):
+def normalize_score(score, max_score):
+    """Score as a percentage of ``max_score`` (0 when the assessment has no maximum)."""
+    if max_score > 0:
+        return (score / max_score) * 100
+    return 0.0
+
+
+def normalized_expression(assessments=None, score=None, max_score=None):
+    """
+    SQL expression computing ``StudentAssessmentScore.normalized`` like
+    ``normalize_score``. ``score`` and ``max_score`` are new values of an
+    UPDATE; by default the row's score and its assessment's max score are
+    read. Migrations pass the queryset of their historical Assessment.
+    """
+    if score is None:
+        score = F('score')
+    elif not hasattr(score, 'resolve_expression'):
+        score = Value(float(score))
+    if max_score is None:
+        assessments = Assessment.objects.all() if assessments is None else assessments
+        max_score = Subquery(assessments.filter(pk=OuterRef('assessment')).values('max_score')[:1])
+    else:
+        max_score = Value(float(max_score))
+    return Case(
+        When(GreaterThan(max_score, 0), then=score / max_score * Value(100.0)),
+        default=Value(0.0),
+        output_field=models.FloatField(),
+    )
+
+
+def refresh_normalized_scores(assessment_ids):
+    """Recompute the stored normalized scores of these assessments in one UPDATE."""
+    return StudentAssessmentScore.objects.filter(assessment_id__in=assessment_ids).update(
+        normalized=normalized_expression()
+    )
+
+
+class ScoreQuerySet(TrackedQuerySet):
+    """Fills ``normalized`` on the bulk paths, which bypass ``save()``."""
+
+    def _fill_normalized(self, objs, recompute):
+        objs = [obj for obj in objs if recompute or obj.normalized is None]
+        cached = StudentAssessmentScore.assessment.is_cached
+        missing = {obj.assessment_id for obj in objs if not cached(obj)}
+        max_scores = dict(
+            Assessment.objects.filter(pk__in=missing).values_list('pk', 'max_score')
+        ) if missing else {}
+        for obj in objs:
+            max_score = obj.assessment.max_score if cached(obj) else max_scores[obj.assessment_id]
+            obj.normalized = normalize_score(obj.score, max_score)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self._fill_normalized(objs, recompute=False)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if {'score', 'assessment'} & set(fields):
+            self._fill_normalized(objs, recompute=True)
+            fields = [*fields, 'normalized']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if 'assessment' in kwargs:
+            # The new assessment's maximum; the row's column still holds the old one
+            assessment = kwargs['assessment']
+            max_score = Assessment.objects.filter(pk=getattr(assessment, 'pk', assessment)).values_list(
+                'max_score', flat=True
+            ).first() or 0
+            kwargs['normalized'] = normalized_expression(score=kwargs.get('score'), max_score=max_score)
+        elif 'score' in kwargs:
+            kwargs['normalized'] = normalized_expression(score=kwargs['score'])
+        return super().update(**kwargs)
+
+
+class StudentAssessmentScore(TimestampedMixin, models.Model):
     """
     Stores individual student scores for specific assessments.
     """
@@ -430,23 +792,158 @@ class StudentAssessmentScore(models.Model):
         validators=[MinValueValidator(0)],
         help_text="Student's score on this assessment"
     )
+    normalized = models.FloatField(
+        null=True,
+        editable=False,
+        help_text="Score as a percentage of the assessment's max score, kept in step on every write"
+    )
     feedback = models.TextField(blank=True)
     graded_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = ScoreQuerySet.as_manager()
 
     class Meta:
         unique_together = ['student', 'assessment', 'enrollment']
         ordering = ['-graded_at']
+        indexes = [
+            # Covers the scores of one enrollment; the unique index leads with assessment
+            models.Index(fields=['student', 'enrollment', 'assessment', 'normalized'], name='score_by_enrollment_idx'),
+        ]
         verbose_name = 'Student Assessment Score'
         verbose_name_plural = 'Student Assessment Scores'
 
     def __str__(self):
         return f"{self.student.name} - {self.assessment.name}: {self.score}/{self.assessment.max_score}"
 
+    def save(self, *args, **kwargs):
+        self.normalized = normalize_score(self.score, self.assessment.max_score)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'score', 'assessment'} & set(update_fields):
+            kwargs['update_fields'] = [*update_fields, 'normalized']
+        super().save(*args, **kwargs)
+
     def normalized_score(self):
         """Returns score as percentage (0-100)"""
-        if self.assessment.max_score > 0:
-            return (self.score / self.assessment.max_score) * 100
-        return 0.0
+        if self.normalized is None:
+            return normalize_score(self.score, self.assessment.max_score)
+        return self.normalized
+
+
+class Tombstone(models.Model):
+    """
+    Records a deleted row of a synced model, so that clients pulling changes
+    with ``?updated_since=`` learn about deletes (see ``outcomes.sync``).
+    """
+    model_label = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['model_label', 'deleted_at'], name='tombstone_since_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class Change(models.Model):
+    """One entry of the change feed of ``outcomes.changes``; never updated."""
+    ACTION_CHOICES = [
+        ('INSERT', 'Insert'),
+        ('UPDATE', 'Update'),
+        ('DELETE', 'Delete'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    model_label = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    data = models.JSONField(default=dict)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['seq']
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.model_label}#{self.object_id}"
+
+
+class TermSnapshot(models.Model):
+    """
+    Frozen LO, PO and PLO results of one term (see ``outcomes.snapshots``).
+    ``summary`` holds the labels and averages of every outcome; the
+    per-student results are the snapshot's ``TermResult`` rows.
+    """
+    semester = models.CharField(max_length=10)
+    year = models.IntegerField()
+    term_key = models.IntegerField(unique=True)
+    summary = models.JSONField(default=dict)
+    frozen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-term_key']
+
+    def __str__(self):
+        return f"{self.semester} {self.year} (frozen {self.frozen_at:%Y-%m-%d})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Term snapshots are immutable; refreeze the term instead')
+        super().save(*args, **kwargs)
+
+
+class TermResult(models.Model):
+    """
+    One student's result for one outcome in a ``TermSnapshot``. The ids are
+    plain integers rather than foreign keys, so later deletes leave it intact.
+    """
+    KIND_CHOICES = [
+        ('LO', 'Learning Outcome'),
+        ('PO', 'Program Outcome'),
+        ('PLO', 'Program Learning Outcome'),
+    ]
+
+    snapshot = models.ForeignKey(TermSnapshot, on_delete=models.CASCADE, related_name='results')
+    kind = models.CharField(max_length=3, choices=KIND_CHOICES)
+    outcome_id = models.IntegerField()
+    student_id = models.IntegerField()
+    # The enrollment an LO result comes from; empty for PO and PLO results
+    enrollment_id = models.IntegerField(null=True)
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['snapshot', 'student_id', 'kind'], name='term_result_by_student_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Term snapshots are immutable; refreeze the term instead')
+        super().save(*args, **kwargs)
+
+
+class TermCloseCheckpoint(models.Model):
+    """
+    A finished stage of the term-close pipeline (see ``outcomes.term_close``);
+    rerunning the pipeline skips the stages recorded here.
+    """
+    semester = models.CharField(max_length=10)
+    year = models.IntegerField()
+    term_key = models.IntegerField()
+    stage = models.CharField(max_length=20)
+    rows = models.IntegerField(default=0, help_text="Rows the stage wrote")
+    duration_ms = models.FloatField()
+    finished_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['term_key', 'stage']
+        ordering = ['term_key', 'finished_at']
+
+    def __str__(self):
+        return f"{self.semester} {self.year}: {self.stage}"
 
 
 # ============================================================================
@@ -476,7 +973,7 @@ def calculate_lo_score(learning_outcome, student, enrollment=None):
             student=student,
             course=learning_outcome.course,
             status='COMPLETED'
-        ).order_by('-year', '-semester').first()
+        ).order_by('-term_key').first()
         
         if not enrollment:
             return 0.0
@@ -486,6 +983,10 @@ def calculate_lo_score(learning_outcome, student, enrollment=None):
         learning_outcome=learning_outcome
     ).select_related('assessment')
     
+    # Only the assessments of the offering the student took
+    if enrollment.course_offering_id:
+        lo_mappings = lo_mappings.filter(assessment__course_offering_id=enrollment.course_offering_id)
+    
     if not lo_mappings.exists():
         return 0.0
     
@@ -559,7 +1060,7 @@ def calculate_po_score(program_outcome, student, course=None):
             student=student,
             course=lo.course,
             status='COMPLETED'
-        ).order_by('-year', '-semester').first()
+        ).order_by('-term_key').first()
         
         if enrollment:
             lo_score = calculate_lo_score(lo, student, enrollment)
@@ -680,7 +1181,7 @@ def calculate_student_lo_scores(student, course=None):
             student=student,
             course=lo.course,
             status='COMPLETED'
-        ).order_by('-year', '-semester').first()
+        ).order_by('-term_key').first()
         
         if enrollment:
             results[lo] = calculate_lo_score(lo, student, enrollment)
@@ -702,6 +1203,21 @@ def get_student_po_summary(student):
     """
     po_scores = calculate_all_po_scores(student, use_credits=True)
     
+    # Counters kept on the student row; read afresh as the instance may be stale
+    completed_courses, total_credits = type(student).objects.filter(pk=student.pk).values_list(
+        'completed_courses', 'completed_credits'
+    ).get()
+    
+    return _build_po_summary(
+        student,
+        po_scores,
+        completed_courses=completed_courses,
+        total_credits=total_credits
+    )
+
+
+def _build_po_summary(student, po_scores, completed_courses, total_credits):
+    """Format PO scores and completion figures into the summary structure"""
     summary = {
         'student': student,
         'po_scores': {},
@@ -737,16 +1253,8 @@ def get_student_po_summary(student):
                 if score == min_score and score > 0:
                     summary['statistics']['lowest_po'] = po.code
     
-    # Get completed courses count
-    completed_enrollments = Enrollment.objects.filter(
-        student=student,
-        status='COMPLETED'
-    ).select_related('course')
-    
-    summary['statistics']['completed_courses'] = completed_enrollments.count()
-    summary['statistics']['total_credits'] = sum(
-        e.course.credit for e in completed_enrollments
-    )
+    summary['statistics']['completed_courses'] = completed_courses
+    summary['statistics']['total_credits'] = total_credits
     
     return summary
 
@@ -0,0 +1,188 @@
+"""
+Detection of N+1 query patterns in requests and tests.
+
+Inside a detection scope every SELECT is fingerprinted - its SQL with the
+parameters left out and ``IN (...)`` lists collapsed - and counted. When
+the same fingerprint runs ``NPLUSONE_THRESHOLD`` times, the scope reports
+it once, together with the stack of project code that issued it:
+
+* ``'log'`` mode writes a warning to the ``outcomes.nplusone`` logger;
+* ``'raise'`` mode raises ``NPlusOneError`` from the offending query.
+
+``NPlusOneMiddleware`` opens a scope per request (``NPLUSONE_MODE``) and
+``NPlusOneTestRunner`` one per test (``NPLUSONE_TEST_MODE``). Code that
+queries per item on purpose, such as the reference calculation functions,
+runs inside ``allow_repeated_queries()``.
+"""
+import logging
+import os
+import re
+import traceback
+import unittest
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
+
+from . import instrumentation
+
+
+logger = logging.getLogger('outcomes.nplusone')
+
+_current = ContextVar('outcomes_nplusone_scope', default=None)
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+# Frames of the query wrappers themselves are left out of reports
+_WRAPPER_FILES = {os.path.abspath(__file__), os.path.abspath(instrumentation.__file__)}
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def fingerprint(sql):
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _project_stack():
+    """Frames of project code, innermost last, without this module and installed packages."""
+    root = str(settings.BASE_DIR)
+    return [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(root)
+        and 'site-packages' not in frame.filename
+        and os.path.abspath(frame.filename) not in _WRAPPER_FILES
+    ]
+
+
+def _is_test_code(frame):
+    parts = os.path.normpath(frame.filename).split(os.sep)
+    return 'tests' in parts[:-1] or parts[-1].startswith('test')
+
+
+class QueryScope:
+
+    def __init__(self, mode, threshold, label='', ignore_test_code=False):
+        self.mode = mode
+        self.ignore_test_code = ignore_test_code
+        self.threshold = threshold
+        self.label = label
+        self.counts = Counter()
+        self.reported = []
+        self.allowed = 0
+
+    def record(self, sql):
+        if self.allowed or not sql.lstrip().upper().startswith('SELECT'):
+            return
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if self.counts[key] != self.threshold:
+            return
+
+        frames = _project_stack()
+        if self.ignore_test_code and frames and _is_test_code(frames[-1]):
+            # A loop in the test itself, not in the code under test
+            return
+        stack = ''.join(traceback.format_list(frames))
+        self.reported.append(key)
+        message = (
+            f"Repeated query ({self.threshold}+ times) in {self.label or 'unknown scope'}:\n"
+            f"    {key}\n{stack}"
+        )
+        if self.mode == 'raise':
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+@contextmanager
+def detect_queries(mode='log', label='', threshold=None, ignore_test_code=False):
+    """
+    Open a detection scope; nested scopes replace the outer one until they end.
+
+    With ``ignore_test_code`` queries repeated directly by test modules are
+    not reported.
+    """
+    if threshold is None:
+        threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 3)
+    scope = QueryScope(mode, threshold, label, ignore_test_code)
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+
+
+def current_mode():
+    """Mode of the enclosing scope, or None outside any scope."""
+    scope = _current.get()
+    return scope.mode if scope is not None else None
+
+
+@contextmanager
+def allow_repeated_queries():
+    """Exclude the queries of this block from detection."""
+    scope = _current.get()
+    if scope is None:
+        yield
+        return
+    scope.allowed += 1
+    try:
+        yield
+    finally:
+        scope.allowed -= 1
+
+
+def _check_query(execute, sql, params, many, context):
+    scope = _current.get()
+    if scope is not None:
+        scope.record(sql)
+    return execute(sql, params, many, context)
+
+
+def install_query_checker(sender, connection, **kwargs):
+    """``connection_created`` receiver adding the detector to each new connection."""
+    if _check_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_check_query)
+
+
+class DetectingResultMixin:
+    """Test result mixin opening a detection scope around every test."""
+
+    def startTest(self, test):
+        mode = getattr(settings, 'NPLUSONE_TEST_MODE', 'raise')
+        self._scope = None
+        if mode != 'off':
+            self._scope = detect_queries(mode, label=test.id(), ignore_test_code=True)
+            self._scope.__enter__()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        if self._scope is not None:
+            self._scope.__exit__(None, None, None)
+
+
+def detecting(resultclass):
+    """``resultclass`` with detection; Django picks its own for --debug-sql and --pdb."""
+    return type(f'Detecting{resultclass.__name__}', (DetectingResultMixin, resultclass), {})
+
+
+class _DetectingRemoteTestRunner(RemoteTestRunner):
+    resultclass = detecting(RemoteTestResult)
+
+
+class _DetectingParallelTestSuite(ParallelTestSuite):
+    # --parallel workers record their results with RemoteTestResult
+    runner_class = _DetectingRemoteTestRunner
+
+
+class NPlusOneTestRunner(DiscoverRunner):
+    """Test runner that runs every test in its own detection scope, serial or --parallel."""
+
+    parallel_test_suite = _DetectingParallelTestSuite
+
+    def get_resultclass(self):
+        return detecting(super().get_resultclass() or unittest.TextTestResult)
@@ -0,0 +1,81 @@
+"""
+Recording of live traffic for load tests.
+
+``RequestRecorderMiddleware`` appends one JSON line per request to the file
+named by ``REQUEST_RECORDER_LOG`` (off when unset); ``replay_requests``
+plays such a file back. A line looks like::
+
+    {"request_id": "5f0c...", "time": 1718000000.0, "method": "POST",
+     "path": "/api/student-scores/calculate_po_scores/", "params": {},
+     "content_type": "application/json", "body": "{\"student_id\": 3}",
+     "status": 200, "duration_ms": 41.7, "view": "student-score-calculate-po-scores"}
+
+``params`` maps each query parameter to its list of values. Bodies are only
+kept for JSON and form requests up to ``REQUEST_RECORDER_MAX_BODY`` bytes;
+headers and cookies are never recorded. For streaming responses the
+duration is the time until the response starts.
+"""
+import json
+import logging
+import random
+import time
+import uuid
+
+from django.conf import settings
+
+from .instrumentation import ensure_rotating_log
+
+
+logger = logging.getLogger('outcomes.recorder')
+
+RECORDED_CONTENT_TYPES = ('application/json', 'application/x-www-form-urlencoded')
+
+
+def recording_enabled():
+    return bool(getattr(settings, 'REQUEST_RECORDER_LOG', None))
+
+
+def should_record(request):
+    if not recording_enabled():
+        return False
+    excluded = getattr(settings, 'REQUEST_RECORDER_EXCLUDE', ())
+    if any(request.path.startswith(prefix) for prefix in excluded):
+        return False
+    return random.random() < getattr(settings, 'REQUEST_RECORDER_SAMPLE_RATE', 1.0)
+
+
+def capture_body(request):
+    """Request body as text, or None when it is empty, too large or not JSON/form data."""
+    if request.content_type not in RECORDED_CONTENT_TYPES:
+        return None
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return None
+    if not length or length > getattr(settings, 'REQUEST_RECORDER_MAX_BODY', 64 * 1024):
+        return None
+    return request.body.decode('utf-8', errors='replace')
+
+
+def record_request(request, response, body, duration):
+    if not ensure_rotating_log(
+        logger,
+        getattr(settings, 'REQUEST_RECORDER_LOG', None),
+        getattr(settings, 'REQUEST_RECORDER_LOG_MAX_BYTES', 50 * 1024 * 1024),
+        getattr(settings, 'REQUEST_RECORDER_LOG_BACKUPS', 5),
+    ):
+        return
+    match = getattr(request, 'resolver_match', None)
+    entry = {
+        'request_id': uuid.uuid4().hex,
+        'time': time.time(),
+        'method': request.method,
+        'path': request.path,
+        'params': {key: values for key, values in request.GET.lists()},
+        'content_type': request.content_type if body is not None else None,
+        'body': body,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 2),
+        'view': match.view_name if match else None,
+    }
+    logger.info(json.dumps(entry))
@@ -0,0 +1,162 @@
+"""
+Full-text search over outcome and assessment texts using SQLite FTS5.
+
+Every model in ``SEARCH_INDEXES`` gets a shadow table ``<db_table>_fts``
+holding one row per object (``rowid`` = primary key) with the text of its
+own indexed columns. Triggers on the model's table, and on no other table,
+keep the shadow table in sync, so bulk updates and raw SQL are covered too
+and schema changes of related tables do not touch the index. A migration
+that rebuilds an indexed table drops its triggers with it and has to
+recreate them.
+
+The tables use the ``trigram`` tokenizer, which matches case-insensitive
+substrings like ``icontains`` does, but only for terms of at least three
+characters. ``FullTextSearchFilter`` uses the index for those terms on the
+indexed fields, ranks results with ``bm25`` and searches everything else
+(shorter terms, fields of related rows such as the course code, databases
+other than SQLite) with plain ``icontains``.
+"""
+import operator
+from functools import reduce
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+
+MIN_TERM_LENGTH = 3
+
+# model label -> indexed columns of the model's own table
+SEARCH_INDEXES = {
+    'outcomes.LearningOutcome': ['code', 'description'],
+    'outcomes.ProgramOutcome': ['code', 'title', 'description'],
+    'outcomes.ProgramLearningOutcome': ['short_name', 'description'],
+    'outcomes.Assessment': ['name', 'description', 'rubric'],
+}
+
+
+def fts_table(db_table):
+    return f'{db_table}_fts'
+
+
+def _index_sql(db_table, columns):
+    """``CREATE`` statements for the shadow table of one model and its triggers, then its filling."""
+    table = fts_table(db_table)
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    insert_new = f'INSERT INTO {table}(rowid, {names}) VALUES (new.id, {new_values});'
+    delete_old = f'DELETE FROM {table} WHERE rowid = old.id;'
+    return [
+        f"CREATE VIRTUAL TABLE {table} USING fts5({names}, tokenize='trigram');",
+        f'CREATE TRIGGER {table}_ai AFTER INSERT ON {db_table} BEGIN {insert_new} END;',
+        # Writes to other columns (counters, updated_at) leave the index alone
+        f'CREATE TRIGGER {table}_au AFTER UPDATE OF id, {names} ON {db_table} '
+        f'BEGIN {delete_old} {insert_new} END;',
+        f'CREATE TRIGGER {table}_ad AFTER DELETE ON {db_table} BEGIN {delete_old} END;',
+        f'INSERT INTO {table}(rowid, {names}) SELECT id, {names} FROM {db_table};',
+    ]
+
+
+def _drop_sql(db_table):
+    table = fts_table(db_table)
+    return [f'DROP TRIGGER IF EXISTS {table}_{suffix};' for suffix in ('ai', 'au', 'ad')] + [
+        f'DROP TABLE IF EXISTS {table};'
+    ]
+
+
+def supports_search_index(connection):
+    # The trigram tokenizer appeared in SQLite 3.34
+    if connection.vendor != 'sqlite':
+        return False
+    import sqlite3
+    return sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create and fill the shadow tables and triggers from the current definitions (``rebuild_search_index``)."""
+    if not supports_search_index(schema_editor.connection):
+        return
+    for label, columns in SEARCH_INDEXES.items():
+        for statement in _index_sql(apps.get_model(label)._meta.db_table, columns):
+            schema_editor.execute(statement)
+    _available.clear()
+
+
+def drop_search_indexes(apps, schema_editor):
+    if not supports_search_index(schema_editor.connection):
+        return
+    for label in SEARCH_INDEXES:
+        for statement in _drop_sql(apps.get_model(label)._meta.db_table):
+            schema_editor.execute(statement)
+    _available.clear()
+
+
+_available = {}
+
+
+def _index_available(alias, table):
+    key = (alias, table)
+    if key not in _available:
+        connection = connections[alias]
+        _available[key] = (
+            supports_search_index(connection)
+            and table in connection.introspection.table_names(include_views=False)
+        )
+    return _available[key]
+
+
+def _match_expression(columns, terms, joiner='AND'):
+    quoted = ('"' + term.replace('"', '""') + '"' for term in terms)
+    column_filter = ' '.join(columns)
+    return f' {joiner} '.join(f'{{{column_filter}}} : {term}' for term in quoted)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``SearchFilter`` answering ``?search=`` from the FTS5 shadow tables.
+
+    Like ``SearchFilter``, every term has to match one of the search fields:
+    the indexed ones through the shadow table, the others with
+    ``icontains``. Results are ordered by the ``bm25`` relevance of their
+    indexed fields unless ``?ordering=`` is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        opts = queryset.model._meta
+        table = fts_table(opts.db_table)
+        indexed = [field for field in search_fields or () if field in SEARCH_INDEXES.get(opts.label, ())]
+
+        if not search_terms or not indexed or not _index_available(queryset.db, table):
+            return super().filter_queryset(request, queryset, view)
+        indexed_terms = [term for term in search_terms if len(term) >= MIN_TERM_LENGTH]
+        if not indexed_terms:
+            return super().filter_queryset(request, queryset, view)
+
+        lookups = {field: self.construct_search(str(field), queryset) for field in search_fields}
+        conditions = []
+        for term in search_terms:
+            if len(term) >= MIN_TERM_LENGTH:
+                matches = RawSQL(
+                    f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [_match_expression(indexed, [term])]
+                )
+                alternatives = [models.Q(pk__in=matches)] + [
+                    models.Q(**{lookup: term}) for field, lookup in lookups.items() if field not in indexed
+                ]
+            else:
+                alternatives = [models.Q(**{lookup: term}) for lookup in lookups.values()]
+            conditions.append(reduce(operator.or_, alternatives))
+        queryset = queryset.filter(reduce(operator.and_, conditions))
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = queryset.distinct()
+
+        # Rows matching only through related fields have no rank and come last
+        qn = connections[queryset.db].ops.quote_name
+        rank = RawSQL(
+            f'SELECT bm25({table}) FROM {table} WHERE {table} MATCH %s '
+            f'AND {table}.rowid = {qn(opts.db_table)}.{qn(opts.pk.column)}',
+            [_match_expression(indexed, indexed_terms, 'OR')],
+            output_field=models.FloatField(),
+        )
+        return queryset.annotate(search_rank=rank).order_by(models.F('search_rank').asc(nulls_last=True))
@@ -10,18 +10,38 @@ from .models import (
     Assessment,
     AssessmentLOMapping,
     LOPOMapping,
-    StudentAssessmentScore
+    StudentAssessmentScore,
+    normalize_score,
+    offering_matches,
 )
+from .caching import cached_call
+from .expand import ExpandableSerializerMixin
+from .instrumentation import TimedSerializerMixin
+from .fastpath import ValuesSerializer
 
 
-class ProgramLearningOutcomeSerializer(serializers.ModelSerializer):
+# Choices of related fields (browsable API forms, input validation), joined
+# with what the related objects' __str__ reads so that forms do not query
+# once per option
+ENROLLMENT_CHOICES = Enrollment.objects.select_related('student', 'course')
+OFFERING_CHOICES = CourseOffering.objects.select_related('course')
+LEARNING_OUTCOME_CHOICES = LearningOutcome.objects.select_related('course')
+ASSESSMENT_CHOICES = Assessment.objects.select_related('course_offering__course')
+
+
+class ProgramLearningOutcomeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ProgramLearningOutcome
         fields = ['id', 'number', 'short_name', 'description', 'category', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
 
-class EnrollmentSerializer(serializers.ModelSerializer):
+class EnrollmentSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'student': 'students.serializers.StudentSerializer',
+        'course': 'courses.serializers.CourseSerializer',
+    }
+
     student_name = serializers.CharField(source='student.name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True)
@@ -30,11 +50,36 @@ class EnrollmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Enrollment
         fields = [
-            'id', 'student', 'student_name', 'course', 'course_code', 'course_name',
+            'id', 'student', 'student_name', 'course', 'course_code', 'course_name', 'course_offering',
             'semester', 'year', 'grade', 'midterm_grade', 'final_grade', 
-            'status', 'lo_scores', 'enrolled_at', 'completed_at'
+            'status', 'lo_scores', 'enrolled_at', 'completed_at', 'updated_at'
         ]
-        read_only_fields = ['enrolled_at']
+        read_only_fields = ['enrolled_at', 'updated_at']
+        extra_kwargs = {'course_offering': {'queryset': OFFERING_CHOICES}}
+    
+    def validate(self, attrs):
+        """
+        Keep ``course_offering`` consistent with the course and term. When it
+        is not given for a new enrollment or a changed term, the lowest
+        section of that course in that term is used.
+        """
+        attrs = super().validate(attrs)
+
+        def current(name):
+            return attrs[name] if name in attrs else getattr(self.instance, name, None)
+
+        course, semester, year = current('course'), current('semester'), current('year')
+        term_changed = self.instance is None or bool({'course', 'semester', 'year'} & attrs.keys())
+        if 'course_offering' not in attrs and term_changed:
+            attrs['course_offering'] = CourseOffering.objects.filter(
+                course=course, semester=semester, year=year
+            ).order_by('section', 'pk').first()
+        offering = current('course_offering')
+        if offering is not None and not offering_matches(offering, getattr(course, 'pk', None), semester, year):
+            raise serializers.ValidationError({
+                'course_offering': 'The offering must be of the same course, semester and year as the enrollment.'
+            })
+        return attrs
     
     def get_lo_scores(self, obj):
         """
@@ -44,13 +89,19 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         if obj.status != 'COMPLETED':
             return None
         
-        from .models import LearningOutcome, calculate_lo_score
+        from .models import calculate_lo_score
         
-        los = LearningOutcome.objects.filter(course=obj.course, is_active=True)
+        # LOs are shared by every enrollment of a course: load them for all
+        # courses of the list at once
+        los_by_course = self.context.setdefault('_los_by_course', {})
+        if obj.course_id not in los_by_course:
+            siblings = self.parent.instance if isinstance(self.parent, serializers.ListSerializer) else []
+            _load_active_los(los_by_course, {obj.course_id, *(e.course_id for e in siblings)})
+        los = los_by_course[obj.course_id]
         scores = []
         
         for lo in los:
-            score = calculate_lo_score(lo, obj.student, obj)
+            score = cached_call(calculate_lo_score, lo, obj.student, obj)
             if score > 0:
                 scores.append({
                     'lo_code': lo.code,
@@ -73,7 +124,12 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['enrolled_at']
 
 
-class CourseOfferingSerializer(serializers.ModelSerializer):
+class CourseOfferingSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'course': 'courses.serializers.CourseSerializer',
+        'professor': 'professors.serializers.ProfessorSerializer',
+    }
+
     course_code = serializers.CharField(source='course.code', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True)
     professor_name = serializers.CharField(source='professor.name', read_only=True)
@@ -82,11 +138,18 @@ class CourseOfferingSerializer(serializers.ModelSerializer):
         model = CourseOffering
         fields = [
             'id', 'course', 'course_code', 'course_name', 'professor', 'professor_name',
-            'semester', 'year', 'section', 'capacity', 'schedule', 'classroom', 'is_active'
+            'semester', 'year', 'section', 'capacity', 'schedule', 'classroom', 'is_active',
+            'enrolled_count', 'assessment_count', 'updated_at'
         ]
+        read_only_fields = ['updated_at']
+
 
+class CoursePLOMappingSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'course': 'courses.serializers.CourseSerializer',
+        'plo': 'outcomes.serializers.ProgramLearningOutcomeSerializer',
+    }
 
-class CoursePLOMappingSerializer(serializers.ModelSerializer):
     plo_number = serializers.IntegerField(source='plo.number', read_only=True)
     plo_short_name = serializers.CharField(source='plo.short_name', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
@@ -95,11 +158,18 @@ class CoursePLOMappingSerializer(serializers.ModelSerializer):
         model = CoursePLOMapping
         fields = [
             'id', 'course', 'course_code', 'plo', 'plo_number', 'plo_short_name',
-            'contribution_level', 'assessment_method', 'weight_percentage'
+            'contribution_level', 'assessment_method', 'weight_percentage', 'updated_at'
         ]
+        read_only_fields = ['updated_at']
+
 
+class StudentPLOAchievementSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'student': 'students.serializers.StudentSerializer',
+        'plo': 'outcomes.serializers.ProgramLearningOutcomeSerializer',
+        'enrollment': 'outcomes.serializers.EnrollmentSerializer',
+    }
 
-class StudentPLOAchievementSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.name', read_only=True)
     plo_number = serializers.IntegerField(source='plo.number', read_only=True)
     course_code = serializers.CharField(source='enrollment.course.code', read_only=True)
@@ -109,12 +179,18 @@ class StudentPLOAchievementSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'student', 'student_name', 'plo', 'plo_number', 
             'enrollment', 'course_code', 'achievement_level', 'score', 
-            'notes', 'assessed_at'
+            'notes', 'assessed_at', 'updated_at'
         ]
-        read_only_fields = ['assessed_at']
+        read_only_fields = ['assessed_at', 'updated_at']
+        extra_kwargs = {'enrollment': {'queryset': ENROLLMENT_CHOICES}}
 
 
-class LearningOutcomeSerializer(serializers.ModelSerializer):
+class LearningOutcomeSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'course': 'courses.serializers.CourseSerializer',
+        'plo': 'outcomes.serializers.ProgramLearningOutcomeSerializer',
+    }
+
     course_code = serializers.CharField(source='course.code', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True)
     plo_number = serializers.IntegerField(source='plo.number', read_only=True, allow_null=True)
@@ -135,20 +211,22 @@ class LearningOutcomeSerializer(serializers.ModelSerializer):
         Automatically calculate LO scores for all students who completed this course.
         Returns scores for all students for demo purposes.
         """
-        from .models import calculate_lo_score, Enrollment
+        from .models import calculate_lo_score
         
-        # Get all completed enrollments for this course
-        enrollments = Enrollment.objects.filter(
-            course=obj.course,
-            status='COMPLETED'
-        ).select_related('student')
+        # Get all completed enrollments for this course, loaded together
+        # with those of the other courses in the list
+        enrollments_by_course = self.context.setdefault('_completed_enrollments_by_course', {})
+        if obj.course_id not in enrollments_by_course:
+            siblings = self.parent.instance if isinstance(self.parent, serializers.ListSerializer) else []
+            _load_completed_enrollments(enrollments_by_course, {obj.course_id, *(lo.course_id for lo in siblings)})
+        enrollments = enrollments_by_course[obj.course_id]
         
-        if not enrollments.exists():
+        if not enrollments:
             return []
         
         student_scores = []
         for enrollment in enrollments:
-            score = calculate_lo_score(obj, enrollment.student, enrollment)
+            score = cached_call(calculate_lo_score, obj, enrollment.student, enrollment)
             if score > 0:
                 student_scores.append({
                     'student_id': enrollment.student.id,
@@ -170,7 +248,11 @@ class LearningOutcomeSerializer(serializers.ModelSerializer):
             return 'NOT_ACHIEVED'
 
 
-class ProgramOutcomeSerializer(serializers.ModelSerializer):
+class ProgramOutcomeSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'related_plos': 'outcomes.serializers.ProgramLearningOutcomeSerializer',
+    }
+
     outcome_type_display = serializers.CharField(source='get_outcome_type_display', read_only=True)
     related_plo_numbers = serializers.SerializerMethodField()
     calculated_scores = serializers.SerializerMethodField(read_only=True)
@@ -195,19 +277,20 @@ class ProgramOutcomeSerializer(serializers.ModelSerializer):
         from .models import calculate_po_score, Enrollment
         from students.models import Student
         
-        # Get all students who have completed courses
-        completed_enrollments = Enrollment.objects.filter(
-            status='COMPLETED'
-        ).values_list('student_id', flat=True).distinct()
-        
-        students = Student.objects.filter(id__in=completed_enrollments)
+        # Get all students who have completed courses, once per response
+        if '_completed_students' not in self.context:
+            completed_enrollments = Enrollment.objects.filter(
+                status='COMPLETED'
+            ).values_list('student_id', flat=True).distinct()
+            self.context['_completed_students'] = list(Student.objects.filter(id__in=completed_enrollments))
+        students = self.context['_completed_students']
         
-        if not students.exists():
+        if not students:
             return []
         
         student_scores = []
         for student in students:
-            score = calculate_po_score(obj, student)
+            score = cached_call(calculate_po_score, obj, student)
             if score > 0:
                 student_scores.append({
                     'student_id': student.id,
@@ -229,7 +312,12 @@ class ProgramOutcomeSerializer(serializers.ModelSerializer):
             return 'NOT_ACHIEVED'
 
 
-class AssessmentSerializer(serializers.ModelSerializer):
+class AssessmentSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'course_offering': 'outcomes.serializers.CourseOfferingSerializer',
+        'learning_outcomes': 'outcomes.serializers.LearningOutcomeSerializer',
+    }
+
     course_code = serializers.CharField(source='course_offering.course.code', read_only=True)
     course_name = serializers.CharField(source='course_offering.course.name', read_only=True)
     semester = serializers.CharField(source='course_offering.semester', read_only=True)
@@ -246,12 +334,21 @@ class AssessmentSerializer(serializers.ModelSerializer):
             'learning_outcome_codes', 'rubric', 'is_graded', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        extra_kwargs = {
+            'course_offering': {'queryset': OFFERING_CHOICES},
+            'learning_outcomes': {'queryset': LEARNING_OUTCOME_CHOICES},
+        }
     
     def get_learning_outcome_codes(self, obj):
         return [lo.code for lo in obj.learning_outcomes.all()]
 
 
-class AssessmentLOMappingSerializer(serializers.ModelSerializer):
+class AssessmentLOMappingSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'assessment': 'outcomes.serializers.AssessmentSerializer',
+        'learning_outcome': 'outcomes.serializers.LearningOutcomeSerializer',
+    }
+
     assessment_name = serializers.CharField(source='assessment.name', read_only=True)
     learning_outcome_code = serializers.CharField(source='learning_outcome.code', read_only=True)
     course_code = serializers.CharField(source='learning_outcome.course.code', read_only=True)
@@ -260,11 +357,21 @@ class AssessmentLOMappingSerializer(serializers.ModelSerializer):
         model = AssessmentLOMapping
         fields = [
             'id', 'assessment', 'assessment_name', 'learning_outcome', 
-            'learning_outcome_code', 'course_code', 'contribution_percentage'
+            'learning_outcome_code', 'course_code', 'contribution_percentage', 'updated_at'
         ]
+        read_only_fields = ['updated_at']
+        extra_kwargs = {
+            'assessment': {'queryset': ASSESSMENT_CHOICES},
+            'learning_outcome': {'queryset': LEARNING_OUTCOME_CHOICES},
+        }
+
 
+class LOPOMappingSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'learning_outcome': 'outcomes.serializers.LearningOutcomeSerializer',
+        'program_outcome': 'outcomes.serializers.ProgramOutcomeSerializer',
+    }
 
-class LOPOMappingSerializer(serializers.ModelSerializer):
     learning_outcome_code = serializers.CharField(source='learning_outcome.code', read_only=True)
     program_outcome_code = serializers.CharField(source='program_outcome.code', read_only=True)
     program_outcome_title = serializers.CharField(source='program_outcome.title', read_only=True)
@@ -273,11 +380,19 @@ class LOPOMappingSerializer(serializers.ModelSerializer):
         model = LOPOMapping
         fields = [
             'id', 'learning_outcome', 'learning_outcome_code', 
-            'program_outcome', 'program_outcome_code', 'program_outcome_title', 'weight'
+            'program_outcome', 'program_outcome_code', 'program_outcome_title', 'weight', 'updated_at'
         ]
+        read_only_fields = ['updated_at']
+        extra_kwargs = {'learning_outcome': {'queryset': LEARNING_OUTCOME_CHOICES}}
 
 
-class StudentAssessmentScoreSerializer(serializers.ModelSerializer):
+class StudentAssessmentScoreSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'student': 'students.serializers.StudentSerializer',
+        'assessment': 'outcomes.serializers.AssessmentSerializer',
+        'enrollment': 'outcomes.serializers.EnrollmentSerializer',
+    }
+
     student_name = serializers.CharField(source='student.name', read_only=True)
     assessment_name = serializers.CharField(source='assessment.name', read_only=True)
     max_score = serializers.FloatField(source='assessment.max_score', read_only=True)
@@ -289,10 +404,105 @@ class StudentAssessmentScoreSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'student', 'student_name', 'assessment', 'assessment_name',
             'enrollment', 'course_code', 'score', 'max_score', 'normalized_score',
-            'feedback', 'graded_at'
+            'feedback', 'graded_at', 'updated_at'
         ]
-        read_only_fields = ['graded_at']
+        read_only_fields = ['graded_at', 'updated_at']
+        extra_kwargs = {
+            'assessment': {'queryset': ASSESSMENT_CHOICES},
+            'enrollment': {'queryset': ENROLLMENT_CHOICES},
+        }
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        assessment = attrs.get('assessment', getattr(self.instance, 'assessment', None))
+        enrollment = attrs.get('enrollment', getattr(self.instance, 'enrollment', None))
+        if (enrollment is not None and enrollment.course_offering_id
+                and assessment.course_offering_id != enrollment.course_offering_id):
+            raise serializers.ValidationError({
+                'assessment': "The assessment does not belong to the enrollment's course offering."
+            })
+        return attrs
     
     def get_normalized_score(self, obj):
         return round(obj.normalized_score(), 2)
 
+
+
+def _load_active_los(los_by_course, course_ids):
+    """Fill ``los_by_course`` with the active LOs of the missing courses in one query."""
+    missing = set(course_ids) - los_by_course.keys()
+    if not missing:
+        return
+    for course_id in missing:
+        los_by_course[course_id] = []
+    for lo in LearningOutcome.objects.filter(course_id__in=missing, is_active=True):
+        los_by_course[lo.course_id].append(lo)
+
+
+def _load_completed_enrollments(enrollments_by_course, course_ids):
+    """Fill ``enrollments_by_course`` with the completed enrollments of the missing courses in one query."""
+    missing = set(course_ids) - enrollments_by_course.keys()
+    if not missing:
+        return
+    for course_id in missing:
+        enrollments_by_course[course_id] = []
+    enrollments = Enrollment.objects.filter(course_id__in=missing, status='COMPLETED').select_related('student')
+    for enrollment in enrollments:
+        enrollments_by_course[enrollment.course_id].append(enrollment)
+
+
+class EnrollmentValuesSerializer(ValuesSerializer):
+    """Values-based twin of EnrollmentSerializer for list responses."""
+    serializer_class = EnrollmentSerializer
+    method_values = ['status']
+
+    def serialize(self, rows):
+        rows = list(rows)
+        # LOs are shared by every enrollment of a course, load them once per list
+        _load_active_los(
+            self.context.setdefault('_los_by_course', {}),
+            {row['course'] for row in rows if row['status'] == 'COMPLETED'}
+        )
+        return super().serialize(rows)
+
+    def get_lo_scores(self, row):
+        if row['status'] != 'COMPLETED':
+            return None
+
+        from students.models import Student
+        from .models import calculate_lo_score, _get_achievement_level
+
+        los_by_course = self.context.setdefault('_los_by_course', {})
+        if row['course'] not in los_by_course:
+            _load_active_los(los_by_course, {row['course']})
+        los = los_by_course[row['course']]
+
+        student = Student(pk=row['student'])
+        enrollment = Enrollment(
+            pk=row['id'], student_id=row['student'], course_id=row['course'],
+            course_offering_id=row['course_offering'],
+        )
+        scores = []
+
+        for lo in los:
+            score = cached_call(calculate_lo_score, lo, student, enrollment)
+            if score > 0:
+                scores.append({
+                    'lo_code': lo.code,
+                    'lo_description': lo.description,
+                    'score': round(score, 2),
+                    'achievement_level': _get_achievement_level(score)
+                })
+
+        return scores if scores else None
+
+
+class StudentAssessmentScoreValuesSerializer(ValuesSerializer):
+    """Values-based twin of StudentAssessmentScoreSerializer for list responses."""
+    serializer_class = StudentAssessmentScoreSerializer
+    method_values = ['score', 'normalized', 'assessment__max_score']
+
+    def get_normalized_score(self, row):
+        if row['normalized'] is None:
+            return round(normalize_score(row['score'], row['assessment__max_score']), 2)
+        return round(row['normalized'], 2)
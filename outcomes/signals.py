@@ -0,0 +1,120 @@
+"""
+Signal receivers that keep derived state in step with outcome data.
+"""
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+
+from core.tracking import rows_created, rows_updating
+
+from . import changes, counters, events, sync
+from .caching import bump_data_version
+from .instrumentation import install_query_recorder
+from .nplusone import install_query_checker
+
+
+# Models whose rows feed into LO/PO calculations or their responses
+VERSIONED_MODELS = [
+    'students.Student',
+    'courses.Course',
+    'outcomes.Enrollment',
+    'outcomes.CourseOffering',
+    'outcomes.LearningOutcome',
+    'outcomes.ProgramOutcome',
+    'outcomes.Assessment',
+    'outcomes.AssessmentLOMapping',
+    'outcomes.LOPOMapping',
+    'outcomes.StudentAssessmentScore',
+]
+
+
+def invalidate_calculations(sender=None, **kwargs):
+    """Bump the data version now and again once the surrounding transaction commits."""
+    if kwargs.get('action', 'post').startswith('pre_'):
+        return
+    bump_data_version()
+    if not transaction.get_autocommit():
+        transaction.on_commit(bump_data_version)
+
+
+def calculations_updating(sender, **kwargs):
+    """``rows_updating`` receiver: invalidate once the UPDATE ran."""
+    return invalidate_calculations
+
+
+def assessment_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the stored normalized scores of the assessment when its max score changed."""
+    from .models import refresh_normalized_scores
+
+    if created or (update_fields is not None and 'max_score' not in update_fields):
+        return
+    if getattr(instance, '_loaded_max_score', None) == instance.max_score:
+        return
+    refresh_normalized_scores([instance.pk])
+    instance._loaded_max_score = instance.max_score
+
+
+def connect_signals():
+    from django.apps import apps
+
+    for label in VERSIONED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(invalidate_calculations, sender=model, dispatch_uid=f'version-save-{label}')
+        post_delete.connect(invalidate_calculations, sender=model, dispatch_uid=f'version-delete-{label}')
+        # The bulk paths, which bypass save() and its signals
+        rows_created.connect(invalidate_calculations, sender=model, dispatch_uid=f'version-bulk-create-{label}')
+        rows_updating.connect(calculations_updating, sender=model, dispatch_uid=f'version-update-{label}')
+
+    Course = apps.get_model('courses.Course')
+    m2m_changed.connect(
+        invalidate_calculations,
+        sender=Course.prerequisites.through,
+        dispatch_uid='version-m2m-course-prerequisites',
+    )
+
+    Assessment = apps.get_model('outcomes.Assessment')
+    post_save.connect(assessment_saved, sender=Assessment, dispatch_uid='normalized-scores-assessment-save')
+
+    # Connected ahead of the counters: changes.course_saved reads _loaded_credit,
+    # which counters.course_saved resets
+    for label in changes.FEED_FIELDS:
+        model = apps.get_model(label)
+        receiver = changes.course_saved if model is Course else changes.record_saved
+        post_save.connect(receiver, sender=model, dispatch_uid=f'changes-save-{label}')
+        post_delete.connect(changes.record_deleted, sender=model, dispatch_uid=f'changes-delete-{label}')
+        rows_created.connect(changes.record_created, sender=model, dispatch_uid=f'changes-bulk-create-{label}')
+        rows_updating.connect(changes.record_updating, sender=model, dispatch_uid=f'changes-update-{label}')
+
+    Enrollment = apps.get_model('outcomes.Enrollment')
+    pre_save.connect(counters.enrollment_saving, sender=Enrollment, dispatch_uid='counters-enrollment-pre-save')
+    post_save.connect(counters.enrollment_saved, sender=Enrollment, dispatch_uid='counters-enrollment-save')
+    post_delete.connect(counters.enrollment_deleted, sender=Enrollment, dispatch_uid='counters-enrollment-delete')
+    pre_save.connect(counters.assessment_saving, sender=Assessment, dispatch_uid='counters-assessment-pre-save')
+    post_save.connect(counters.assessment_saved, sender=Assessment, dispatch_uid='counters-assessment-save')
+    post_delete.connect(counters.assessment_deleted, sender=Assessment, dispatch_uid='counters-assessment-delete')
+    post_save.connect(counters.course_saved, sender=Course, dispatch_uid='counters-course-save')
+    rows_updating.connect(counters.courses_updating, sender=Course, dispatch_uid='counters-course-update')
+
+    StudentAssessmentScore = apps.get_model('outcomes.StudentAssessmentScore')
+    post_save.connect(events.score_saved, sender=StudentAssessmentScore, dispatch_uid='events-score-save')
+    post_delete.connect(events.score_deleted, sender=StudentAssessmentScore, dispatch_uid='events-score-delete')
+    rows_created.connect(events.scores_created, sender=StudentAssessmentScore, dispatch_uid='events-score-bulk-create')
+    rows_updating.connect(events.scores_updating, sender=StudentAssessmentScore, dispatch_uid='events-score-update')
+
+    post_save.connect(events.enrollment_changed, sender=Enrollment, dispatch_uid='events-enrollment-save')
+    post_delete.connect(events.enrollment_changed, sender=Enrollment, dispatch_uid='events-enrollment-delete')
+    rows_created.connect(events.enrollments_created, sender=Enrollment, dispatch_uid='events-enrollment-bulk-create')
+    rows_updating.connect(events.enrollments_updating, sender=Enrollment, dispatch_uid='events-enrollment-update')
+
+    for label in ('outcomes.AssessmentLOMapping', 'outcomes.LOPOMapping'):
+        model = apps.get_model(label)
+        post_save.connect(events.mapping_changed, sender=model, dispatch_uid=f'events-save-{label}')
+        post_delete.connect(events.mapping_changed, sender=model, dispatch_uid=f'events-delete-{label}')
+        rows_created.connect(events.mappings_created, sender=model, dispatch_uid=f'events-bulk-create-{label}')
+        rows_updating.connect(events.mappings_updating, sender=model, dispatch_uid=f'events-update-{label}')
+
+    for label in sync.SYNCED_MODELS:
+        post_delete.connect(sync.record_tombstone, sender=apps.get_model(label), dispatch_uid=f'sync-delete-{label}')
+
+    connection_created.connect(install_query_recorder, dispatch_uid='request-metrics-queries')
+    connection_created.connect(install_query_checker, dispatch_uid='nplusone-queries')
@@ -0,0 +1,256 @@
+"""
+Frozen per-term outcome results for reports on past terms.
+
+``compute_term_results`` works out, for the completed enrollments of one
+(semester, year), with a fixed number of queries:
+
+* LO results per enrollment, like ``calculate_lo_score`` for that enrollment;
+* PO results per student, like ``calculate_all_po_scores`` with credits,
+  restricted to the student's courses of the term;
+* PLO results per student, the average of the term's recorded achievements.
+
+``freeze_term`` stores them as a ``TermSnapshot`` (labels and averages of
+every outcome) with one ``TermResult`` row per student and outcome.
+``term_results`` reads a frozen term from its snapshot - one query for the
+summary, one more for a student's results - and computes any other term
+live, with the same code, so both give the same numbers.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Avg
+
+from courses.models import Course
+
+from .models import (
+    AssessmentLOMapping,
+    Enrollment,
+    LearningOutcome,
+    LOPOMapping,
+    ProgramLearningOutcome,
+    ProgramOutcome,
+    StudentAssessmentScore,
+    StudentPLOAchievement,
+    TermResult,
+    TermSnapshot,
+    _get_achievement_level,
+    normalize_score,
+    term_key,
+)
+
+
+LO, PO, PLO = 'LO', 'PO', 'PLO'
+KINDS = (LO, PO, PLO)
+
+# Result rows per INSERT
+BATCH_SIZE = 500
+
+
+class TermFrozenError(Exception):
+    pass
+
+
+def term_enrollments(semester, year):
+    return Enrollment.objects.filter(semester=semester, year=year, status='COMPLETED')
+
+
+def lo_results(enrollments):
+    """
+    ``(enrollment_rows, lo_scores)`` for ``enrollments``: ``{pk: (student_id,
+    course_id, offering_id)}`` and ``{(enrollment_id, lo_id): score}``, the
+    weighted average of the scored assessments mapped to each LO.
+    """
+    enrollment_rows = {
+        pk: (student_id, course_id, offering_id)
+        for pk, student_id, course_id, offering_id in enrollments.values_list(
+            'pk', 'student_id', 'course_id', 'course_offering_id'
+        )
+    }
+    scores = {
+        (enrollment_id, assessment_id): (
+            normalized if normalized is not None else normalize_score(score, max_score), offering_id
+        )
+        for enrollment_id, assessment_id, normalized, score, max_score, offering_id in
+        StudentAssessmentScore.objects.filter(enrollment__in=enrollments).values_list(
+            'enrollment_id', 'assessment_id', 'normalized', 'score',
+            'assessment__max_score', 'assessment__course_offering_id',
+        )
+    }
+    mappings_by_assessment = defaultdict(list)
+    for assessment_id, lo_id, lo_course_id, percentage in AssessmentLOMapping.objects.filter(
+        assessment_id__in=StudentAssessmentScore.objects.filter(enrollment__in=enrollments).values('assessment_id')
+    ).values_list(
+        'assessment_id', 'learning_outcome_id', 'learning_outcome__course_id', 'contribution_percentage'
+    ):
+        mappings_by_assessment[assessment_id].append((lo_id, lo_course_id, percentage))
+
+    totals = defaultdict(lambda: [0.0, 0.0])
+    for (enrollment_id, assessment_id), (normalized, assessment_offering) in scores.items():
+        student_id, course_id, offering_id = enrollment_rows[enrollment_id]
+        if offering_id is not None and assessment_offering != offering_id:
+            continue
+        for lo_id, lo_course_id, percentage in mappings_by_assessment[assessment_id]:
+            if lo_course_id != course_id:
+                continue
+            weight = percentage / 100.0
+            total = totals[enrollment_id, lo_id]
+            total[0] += normalized * weight
+            total[1] += weight
+    lo_scores = {key: total / weight for key, (total, weight) in totals.items() if weight > 0}
+    return enrollment_rows, lo_scores
+
+
+def compute_term_results(semester, year):
+    """``[(kind, outcome_id, student_id, enrollment_id, score), ...]`` for the term's completed enrollments."""
+    enrollments = term_enrollments(semester, year)
+    enrollment_rows, lo_scores = lo_results(enrollments)
+
+    rows = [
+        (LO, lo_id, enrollment_rows[enrollment_id][0], enrollment_id, score)
+        for (enrollment_id, lo_id), score in sorted(lo_scores.items())
+    ]
+
+    # PO: per course from its LOs, then credit-weighted across the term's courses
+    lo_enrollments = defaultdict(list)
+    for enrollment_id, lo_id in lo_scores:
+        lo_enrollments[lo_id].append(enrollment_id)
+    course_totals = defaultdict(lambda: [0.0, 0.0])
+    for lo_id, po_id, weight in LOPOMapping.objects.filter(
+        learning_outcome_id__in=list(lo_enrollments), program_outcome__is_active=True
+    ).values_list('learning_outcome_id', 'program_outcome_id', 'weight'):
+        for enrollment_id in lo_enrollments[lo_id]:
+            score = lo_scores[enrollment_id, lo_id]
+            if score > 0:
+                total = course_totals[enrollment_id, po_id]
+                total[0] += score * weight
+                total[1] += weight
+
+    credits = dict(Course.objects.filter(
+        pk__in={course_id for _, course_id, _ in enrollment_rows.values()}
+    ).values_list('pk', 'credit'))
+    po_totals = defaultdict(lambda: [0.0, 0.0])
+    for (enrollment_id, po_id), (total, weight) in course_totals.items():
+        student_id, course_id, _ = enrollment_rows[enrollment_id]
+        credit = credits[course_id]
+        po_total = po_totals[student_id, po_id]
+        po_total[0] += total / weight * credit
+        po_total[1] += credit
+    rows.extend(
+        (PO, po_id, student_id, None, total / credit)
+        for (student_id, po_id), (total, credit) in sorted(po_totals.items()) if credit > 0
+    )
+
+    # PLO: average of the achievements recorded for the term's enrollments
+    rows.extend(
+        (PLO, plo_id, student_id, None, score)
+        for student_id, plo_id, score in StudentPLOAchievement.objects.filter(
+            enrollment__in=enrollments
+        ).values('student_id', 'plo_id').annotate(score=Avg('score')).order_by(
+            'student_id', 'plo_id'
+        ).values_list('student_id', 'plo_id', 'score')
+    )
+    return rows
+
+
+def summarize(rows):
+    """Labels, average and achievement levels of every outcome in ``rows``, keyed by kind."""
+    by_outcome = defaultdict(list)
+    for kind, outcome_id, _, _, score in rows:
+        by_outcome[kind, outcome_id].append(score)
+
+    ids = defaultdict(set)
+    for kind, outcome_id in by_outcome:
+        ids[kind].add(outcome_id)
+    labels = {
+        LO: {
+            pk: {'code': code, 'course_code': course_code}
+            for pk, code, course_code in LearningOutcome.objects.filter(pk__in=ids[LO]).values_list(
+                'pk', 'code', 'course__code'
+            )
+        } if ids[LO] else {},
+        PO: {
+            pk: {'code': code, 'title': title}
+            for pk, code, title in ProgramOutcome.objects.filter(pk__in=ids[PO]).values_list('pk', 'code', 'title')
+        } if ids[PO] else {},
+        PLO: {
+            pk: {'number': number, 'short_name': short_name}
+            for pk, number, short_name in ProgramLearningOutcome.objects.filter(pk__in=ids[PLO]).values_list(
+                'pk', 'number', 'short_name'
+            )
+        } if ids[PLO] else {},
+    }
+
+    summary = {kind: [] for kind in KINDS}
+    for (kind, outcome_id), scores in sorted(by_outcome.items()):
+        levels = defaultdict(int)
+        for score in scores:
+            levels[_get_achievement_level(score)] += 1
+        summary[kind].append({
+            'id': outcome_id,
+            **labels[kind].get(outcome_id, {}),
+            'average': round(sum(scores) / len(scores), 2),
+            'students': len(scores),
+            'levels': dict(levels),
+        })
+    return summary
+
+
+def freeze_term(semester, year, replace=False):
+    """Compute and store the term's results; returns the new ``TermSnapshot``."""
+    with transaction.atomic():
+        existing = TermSnapshot.objects.filter(term_key=term_key(year, semester))
+        if existing.exists():
+            if not replace:
+                raise TermFrozenError(f'{semester} {year} is already frozen')
+            existing.delete()
+
+        rows = compute_term_results(semester, year)
+        snapshot = TermSnapshot.objects.create(
+            semester=semester, year=year, term_key=term_key(year, semester), summary=summarize(rows)
+        )
+        TermResult.objects.bulk_create(
+            [
+                TermResult(
+                    snapshot=snapshot, kind=kind, outcome_id=outcome_id,
+                    student_id=student_id, enrollment_id=enrollment_id, score=score,
+                )
+                for kind, outcome_id, student_id, enrollment_id, score in rows
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return snapshot
+
+
+def _student_results(rows):
+    results = {kind: [] for kind in KINDS}
+    for kind, outcome_id, _, enrollment_id, score in rows:
+        result = {'outcome_id': outcome_id, 'score': round(score, 2), 'achievement_level': _get_achievement_level(score)}
+        if kind == LO:
+            result['enrollment_id'] = enrollment_id
+        results[kind].append(result)
+    return results
+
+
+def term_results(semester, year, student_id=None):
+    """
+    The term's outcome summary and, with ``student_id``, that student's
+    results; from the snapshot when the term is frozen.
+    """
+    snapshot = TermSnapshot.objects.filter(term_key=term_key(year, semester)).first()
+    if snapshot is not None:
+        result = {'frozen': True, 'frozen_at': snapshot.frozen_at, 'summary': snapshot.summary}
+        if student_id is not None:
+            result['results'] = _student_results(
+                snapshot.results.filter(student_id=student_id).order_by('kind', 'outcome_id', 'enrollment_id')
+                .values_list('kind', 'outcome_id', 'student_id', 'enrollment_id', 'score')
+            )
+        return result
+
+    rows = compute_term_results(semester, year)
+    result = {'frozen': False, 'frozen_at': None, 'summary': summarize(rows)}
+    if student_id is not None:
+        result['results'] = _student_results(sorted(
+            (row for row in rows if row[2] == student_id),
+            key=lambda row: (row[0], row[1], row[3] or 0),
+        ))
+    return result
@@ -0,0 +1,207 @@
+"""
+Server-sent event streams of live score and outcome updates.
+
+    GET /api/stream/offerings/<id>/   gradebook of one course offering
+    GET /api/stream/students/<id>/    one student's scores and outcomes
+
+Each stream sends ``score`` events for changed StudentAssessmentScore rows
+and recomputed ``lo_scores`` / ``po_scores`` only when they differ from what
+the client was last sent. Mapping changes on an offering's course are sent as
+``outcomes_changed`` so gradebooks can refetch.
+
+Streams end after ``SSE_MAX_DURATION`` seconds; browsers' EventSource
+reconnects on its own and resumes from ``Last-Event-ID``. Under WSGI every
+open stream occupies a worker thread.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from students.models import Student
+from .caching import cached_call
+from .events import notifier
+from .models import (
+    Assessment,
+    CourseOffering,
+    Enrollment,
+    LearningOutcome,
+    StudentAssessmentScore,
+    calculate_all_po_scores,
+    calculate_lo_score,
+)
+from .serializers import StudentAssessmentScoreSerializer
+
+
+def _format(seq, name, data):
+    return f"id: {seq}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def _start_cursor(request):
+    """Resume after Last-Event-ID when it refers to this process' events."""
+    cursor = notifier.cursor()
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id and last_event_id.isdigit() and int(last_event_id) <= cursor:
+        return int(last_event_id)
+    return cursor
+
+
+def _stream_response(cursor, handle_event):
+    heartbeat = getattr(settings, 'SSE_HEARTBEAT', 15)
+    max_duration = getattr(settings, 'SSE_MAX_DURATION', 300)
+
+    def stream():
+        after = cursor
+        deadline = time.monotonic() + max_duration
+        yield 'retry: 3000\n\n'
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            events = notifier.wait(after, timeout=min(heartbeat, remaining))
+            if not events:
+                yield ': keepalive\n\n'
+                continue
+            for seq, event in events:
+                after = seq
+                for name, data in handle_event(event):
+                    yield _format(seq, name, data)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _score_payload(event):
+    if event['action'] == 'deleted':
+        return {key: event[key] for key in ('action', 'score_id', 'student_id', 'enrollment_id', 'assessment_id')}
+    score = StudentAssessmentScore.objects.select_related(
+        'student', 'assessment', 'enrollment__course'
+    ).filter(pk=event['score_id']).first()
+    if score is None:
+        return None
+    return dict(StudentAssessmentScoreSerializer(score).data, action=event['action'])
+
+
+def _enrollment_lo_scores(enrollment_id):
+    enrollment = Enrollment.objects.select_related('student').filter(pk=enrollment_id).first()
+    if enrollment is None:
+        return None
+    los = LearningOutcome.objects.filter(course_id=enrollment.course_id, is_active=True)
+    return {
+        'enrollment_id': enrollment.pk,
+        'student_id': enrollment.student_id,
+        'lo_scores': [
+            {
+                'lo_code': lo.code,
+                'score': round(cached_call(calculate_lo_score, lo, enrollment.student, enrollment), 2),
+            }
+            for lo in los
+        ],
+    }
+
+
+class _CourseLookup:
+    """Course of the learning outcome named by a mapping event, remembered per stream."""
+
+    def __init__(self):
+        self._courses = {}
+
+    def __call__(self, event):
+        if event['course_id'] is not None:
+            return event['course_id']
+        lo_id = event['learning_outcome_id']
+        if lo_id not in self._courses:
+            self._courses[lo_id] = LearningOutcome.objects.filter(pk=lo_id).values_list(
+                'course_id', flat=True
+            ).first()
+        return self._courses[lo_id]
+
+
+class _DeltaTracker:
+    """Remembers what each client was sent so unchanged results are skipped."""
+
+    def __init__(self):
+        self._sent = {}
+
+    def changed(self, key, value):
+        if value is None or self._sent.get(key) == value:
+            return False
+        self._sent[key] = value
+        return True
+
+
+@require_GET
+def offering_stream(request, offering_id):
+    offering = get_object_or_404(CourseOffering, pk=offering_id)
+    cursor = _start_cursor(request)
+    sent = _DeltaTracker()
+    course_of = _CourseLookup()
+    assessment_offerings = dict(
+        Assessment.objects.filter(course_offering=offering).values_list('id', 'course_offering_id')
+    )
+
+    def offering_of(assessment_id):
+        if assessment_id not in assessment_offerings:
+            assessment_offerings[assessment_id] = Assessment.objects.filter(
+                pk=assessment_id
+            ).values_list('course_offering_id', flat=True).first()
+        return assessment_offerings[assessment_id]
+
+    def handle_event(event):
+        if event['type'] == 'score' and offering_of(event['assessment_id']) == offering.pk:
+            payload = _score_payload(event)
+            if payload is not None:
+                yield 'score', payload
+            lo_scores = _enrollment_lo_scores(event['enrollment_id'])
+            if sent.changed(('lo', event['enrollment_id']), lo_scores):
+                yield 'lo_scores', lo_scores
+        elif event['type'] == 'mapping' and course_of(event) in (offering.course_id, None):
+            # None: the learning outcome was deleted, so its course is unknown
+            yield 'outcomes_changed', {'course_id': offering.course_id}
+
+    return _stream_response(cursor, handle_event)
+
+
+@require_GET
+def student_stream(request, student_id):
+    student = get_object_or_404(Student, pk=student_id)
+    cursor = _start_cursor(request)
+    sent = _DeltaTracker()
+    course_of = _CourseLookup()
+    course_ids = set(Enrollment.objects.filter(student=student).values_list('course_id', flat=True))
+
+    def po_scores():
+        return {
+            'student_id': student.pk,
+            'po_scores': [
+                {'po_code': po.code, 'score': round(score, 2)}
+                for po, score in cached_call(calculate_all_po_scores, student).items()
+            ],
+        }
+
+    def handle_event(event):
+        if event['type'] == 'score' and event['student_id'] == student.pk:
+            payload = _score_payload(event)
+            if payload is not None:
+                yield 'score', payload
+            lo_scores = _enrollment_lo_scores(event['enrollment_id'])
+            if sent.changed(('lo', event['enrollment_id']), lo_scores):
+                yield 'lo_scores', lo_scores
+        elif event['type'] == 'enrollment' and event['student_id'] == student.pk:
+            course_ids.add(event['course_id'])
+        elif not (event['type'] == 'mapping' and course_of(event) in course_ids | {None}):
+            return
+
+        current = po_scores()
+        if sent.changed('po', current):
+            yield 'po_scores', current
+
+    # Record the starting state so the first po_scores event is a real change
+    sent.changed('po', po_scores())
+    return _stream_response(cursor, handle_event)
@@ -0,0 +1,257 @@
+"""
+Deterministic synthetic datasets for tests and benchmarks.
+
+``generate_dataset`` builds a complete program - professors, courses,
+PLOs, program outcomes, offerings over several terms, learning outcomes
+with their LO-PO and assessment-LO mappings, enrollments and assessment
+scores - with ``bulk_create``. The same arguments and seed always produce
+the same rows, so query counts and calculation results are reproducible.
+
+Codes are prefixed (``SYN`` by default) so the data can sit next to
+hand-made records. Signals do not fire for bulk inserts; callers that rely
+on cached results should bump the data version afterwards.
+"""
+import random
+from datetime import datetime, timezone as dt_timezone
+
+from courses.models import Course
+from professors.models import Professor
+from students.models import Student
+from .grading import FAILING_GRADES, GRADE_POINTS, letter_grade
+from .models import (
+    Assessment,
+    AssessmentLOMapping,
+    CourseOffering,
+    CoursePLOMapping,
+    Enrollment,
+    LearningOutcome,
+    LOPOMapping,
+    ProgramLearningOutcome,
+    ProgramOutcome,
+    StudentAssessmentScore,
+)
+
+
+BATCH_SIZE = 2000
+
+TERMS = [(2023, 'FALL'), (2024, 'SPRING'), (2024, 'FALL')]
+
+ASSESSMENT_PLAN = [
+    # name, type, max score, weight
+    ('Midterm', 'EXAM', 100, 30),
+    ('Final', 'EXAM', 100, 40),
+    ('Project', 'PROJECT', 50, 20),
+    ('Quiz', 'QUIZ', 10, 10),
+]
+
+COURSE_LEVELS = ['FRESHMAN', 'SOPHOMORE', 'JUNIOR', 'SENIOR']
+
+BLOOM_LEVELS = ['REMEMBER', 'UNDERSTAND', 'APPLY', 'ANALYZE', 'EVALUATE', 'CREATE']
+
+FIRST_NAMES = ['Ada', 'Alan', 'Barbara', 'Claude', 'Donald', 'Edsger', 'Frances', 'Grace',
+               'John', 'Katherine', 'Leslie', 'Margaret', 'Niklaus', 'Radia', 'Tim', 'Xavier']
+LAST_NAMES = ['Lovelace', 'Turing', 'Liskov', 'Shannon', 'Knuth', 'Dijkstra', 'Allen', 'Hopper',
+              'Backus', 'Johnson', 'Lamport', 'Hamilton', 'Wirth', 'Perlman', 'Berners-Lee', 'Leroy']
+
+
+def _bulk_create(model, objects):
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def terms_between(first_year, last_year):
+    """Spring and fall terms from the fall of ``first_year`` to the fall of ``last_year``."""
+    terms = [(first_year, 'FALL')]
+    for year in range(first_year + 1, last_year + 1):
+        terms.extend([(year, 'SPRING'), (year, 'FALL')])
+    return terms
+
+
+def generate_dataset(students=60, courses=8, courses_per_student=4, los_per_course=4,
+                     program_outcomes=6, missing_score_rate=0.03, retake_rate=0.0,
+                     terms=TERMS, prefix='SYN', seed=0, progress=None):
+    """
+    Create the dataset and return a dict with the number of rows per model.
+
+    Every student takes ``courses_per_student`` distinct courses spread over
+    ``terms``; enrollments in the last term are ACTIVE, earlier ones
+    COMPLETED with a letter grade from the weighted assessment scores.
+    ``missing_score_rate`` of the scores are left out to mimic ungraded
+    work, and ``retake_rate`` of the failed courses are taken again in the
+    next term. ``progress`` is called as ``progress(students_done, scores_done)``
+    after every chunk of students.
+    """
+    rng = random.Random(seed)
+    graded_at = datetime(2024, 6, 1, 12, 0, tzinfo=dt_timezone.utc)
+    courses_per_student = min(courses_per_student, courses)
+    last_term = len(terms) - 1
+
+    professors = _bulk_create(Professor, [
+        Professor(name=f'Dr. Synthetic {i}', department='Computer Engineering',
+                  email=f'{prefix.lower()}.prof{i}@example.edu')
+        for i in range(max(2, courses // 4))
+    ])
+
+    course_rows = _bulk_create(Course, [
+        Course(name=f'Synthetic Course {i}', code=f'{prefix}{100 + i}', credit=rng.randint(2, 5),
+               description=f'Generated course {i}', course_level=COURSE_LEVELS[i * len(COURSE_LEVELS) // courses])
+        for i in range(courses)
+    ])
+
+    existing_plos = set(ProgramLearningOutcome.objects.values_list('number', flat=True))
+    _bulk_create(ProgramLearningOutcome, [
+        ProgramLearningOutcome(number=number, short_name=f'PLO {number}',
+                               description=f'Program learning outcome {number}')
+        for number in range(1, 12) if number not in existing_plos
+    ])
+    plos = list(ProgramLearningOutcome.objects.order_by('number'))
+
+    pos = _bulk_create(ProgramOutcome, [
+        ProgramOutcome(code=f'{prefix}-PO{i}', title=f'Synthetic outcome {i}',
+                       description=f'Generated program outcome {i}')
+        for i in range(program_outcomes)
+    ])
+
+    _bulk_create(CoursePLOMapping, [
+        CoursePLOMapping(course=course, plo=plo, weight_percentage=rng.choice([10, 20, 30]))
+        for course in course_rows
+        for plo in rng.sample(plos, 2)
+    ])
+
+    los = _bulk_create(LearningOutcome, [
+        LearningOutcome(course=course, code=f'CLO-{j + 1}', description=f'{course.code} outcome {j + 1}',
+                        bloom_level=rng.choice(BLOOM_LEVELS), plo=rng.choice(plos))
+        for course in course_rows
+        for j in range(los_per_course)
+    ])
+    los_by_course = {}
+    for lo in los:
+        los_by_course.setdefault(lo.course_id, []).append(lo)
+
+    lo_po_mappings = _bulk_create(LOPOMapping, [
+        LOPOMapping(learning_outcome=lo, program_outcome=po, weight=rng.randint(1, 5))
+        for lo in los
+        for po in rng.sample(pos, min(2, len(pos)))
+    ])
+
+    offerings = _bulk_create(CourseOffering, [
+        CourseOffering(course=course, professor=professors[i % len(professors)], semester=semester, year=year)
+        for i, course in enumerate(course_rows)
+        for year, semester in terms
+    ])
+
+    assessments = _bulk_create(Assessment, [
+        Assessment(course_offering=offering, name=name, assessment_type=kind,
+                   max_score=max_score, weight_percentage=weight, is_graded=True)
+        for offering in offerings
+        for name, kind, max_score, weight in ASSESSMENT_PLAN
+    ])
+    assessments_by_offering = {}
+    for assessment in assessments:
+        assessments_by_offering.setdefault(assessment.course_offering_id, []).append(assessment)
+
+    assessment_lo_mappings = []
+    for offering in offerings:
+        course_los = los_by_course[offering.course_id]
+        for assessment in assessments_by_offering[offering.pk]:
+            for lo in rng.sample(course_los, min(2, len(course_los))):
+                assessment_lo_mappings.append(AssessmentLOMapping(
+                    assessment=assessment, learning_outcome=lo,
+                    contribution_percentage=rng.choice([25, 50, 75, 100]),
+                ))
+    _bulk_create(AssessmentLOMapping, assessment_lo_mappings)
+
+    offering_by_term = {
+        (offering.course_id, offering.year, offering.semester): offering for offering in offerings
+    }
+    counts = {'enrollments': 0, 'retakes': 0, 'scores': 0}
+
+    # Students are written in chunks so that large datasets never hold all
+    # enrollments and scores in memory at once
+    for start in range(0, students, BATCH_SIZE):
+        numbers = range(start, min(start + BATCH_SIZE, students))
+
+        # (student index, course, term index, ability); retakes are appended
+        # while the list is walked
+        planned = []
+        for i in numbers:
+            # Skewed towards good students, with a tail of weak ones
+            ability = 0.3 + 0.65 * rng.betavariate(4, 2)
+            for k, course in enumerate(rng.sample(course_rows, courses_per_student)):
+                planned.append((i, course, k % len(terms), ability))
+
+        enrollments = []
+        scores = []
+        grade_points = {i: [] for i in numbers}
+        position = 0
+        while position < len(planned):
+            i, course, term, ability = planned[position]
+            position += 1
+            year, semester = terms[term]
+            offering = offering_by_term[(course.pk, year, semester)]
+
+            earned = 0.0
+            for assessment in assessments_by_offering[offering.pk]:
+                if rng.random() < missing_score_rate:
+                    continue
+                ratio = min(1.0, max(0.0, rng.gauss(ability, 0.12)))
+                score = round(ratio * assessment.max_score, 1)
+                earned += score / assessment.max_score * assessment.weight_percentage
+                scores.append((len(enrollments), i, assessment.pk, score, score / assessment.max_score * 100))
+
+            enrollment = Enrollment(
+                course_id=course.pk, course_offering_id=offering.pk, semester=semester, year=year, status='ACTIVE'
+            )
+            if term < last_term:
+                enrollment.status = 'COMPLETED'
+                enrollment.grade = letter_grade(earned)
+                enrollment.completed_at = graded_at
+                grade_points[i].append((GRADE_POINTS[enrollment.grade], course.credit))
+                if enrollment.grade in FAILING_GRADES and retake_rate and rng.random() < retake_rate:
+                    planned.append((i, course, term + 1, min(0.95, ability + 0.1)))
+                    counts['retakes'] += 1
+            enrollments.append((i, enrollment))
+
+        student_rows = []
+        for i in numbers:
+            points = grade_points[i]
+            credits = sum(credit for _, credit in points)
+            gpa = sum(point * credit for point, credit in points) / credits if credits else 0.0
+            student_rows.append(Student(
+                name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                student_number=f'{prefix}{i:07d}', email=f'{prefix.lower()}.student{i}@example.edu',
+                enrollment_year=2021 + i % 4, expected_graduation_year=2025 + i % 4,
+                grade_average=round(gpa, 2),
+            ))
+        student_ids = {i: student.pk for i, student in zip(numbers, _bulk_create(Student, student_rows))}
+
+        for i, enrollment in enrollments:
+            enrollment.student_id = student_ids[i]
+        enrollment_ids = [row.pk for row in _bulk_create(Enrollment, [enrollment for _, enrollment in enrollments])]
+
+        # Plain ids rather than related objects: assigning instances through
+        # the descriptors costs more than the INSERT itself at this volume
+        for offset in range(0, len(scores), BATCH_SIZE):
+            _bulk_create(StudentAssessmentScore, [
+                StudentAssessmentScore(
+                    student_id=student_ids[i], assessment_id=assessment_id, enrollment_id=enrollment_ids[index],
+                    score=score, normalized=normalized, graded_at=graded_at,
+                )
+                for index, i, assessment_id, score, normalized in scores[offset:offset + BATCH_SIZE]
+            ])
+        counts['scores'] += len(scores)
+        counts['enrollments'] += len(enrollment_ids)
+        if progress is not None:
+            progress(numbers.stop, counts['scores'])
+
+    return {
+        'students': students,
+        'professors': len(professors),
+        'courses': len(course_rows),
+        'program_outcomes': len(pos),
+        'learning_outcomes': len(los),
+        'lo_po_mappings': len(lo_po_mappings),
+        'offerings': len(offerings),
+        'assessments': len(assessments),
+        'assessment_lo_mappings': len(assessment_lo_mappings),
+        **counts,
+    }
@@ -0,0 +1,136 @@
+"""
+Closing a term as a staged, resumable pipeline.
+
+``close_term`` runs the ``STAGES`` in order for one (semester, year):
+
+* ``enrollments``: the term's ACTIVE enrollments become COMPLETED with a
+  ``completed_at``, in one UPDATE (counters, change feed and data version
+  follow through the ``Enrollment`` queryset);
+* ``grades``: completed enrollments without a grade get the letter grade of
+  their weighted assessment total, written with one CASE UPDATE
+  (``outcomes.grading.assign_grades``);
+* ``achievements``: ``StudentPLOAchievement`` per enrollment and PLO, the
+  average of the enrollment's LO results for the PLO's learning outcomes,
+  upserted with ``bulk_create``;
+* ``outcomes``: the term's LO, PO and PLO results, computed in batch and
+  frozen as its ``TermSnapshot`` (replacing an older one);
+* ``caches``: a new data version once everything is written, so no
+  calculation result cached while the close ran is served again; the
+  achievement upserts and the snapshot do not bump it themselves.
+
+Each stage runs in its own transaction together with its
+``TermCloseCheckpoint``, which records the rows it wrote and how long it
+took. A rerun skips the stages that have a checkpoint, so a pipeline that
+stopped half-way resumes at the stage that failed.
+"""
+import time
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .grading import assign_grades
+from .models import (
+    Enrollment,
+    LearningOutcome,
+    StudentPLOAchievement,
+    TermCloseCheckpoint,
+    _get_achievement_level,
+    term_key,
+)
+from .snapshots import freeze_term, lo_results, term_enrollments
+
+
+# Rows per INSERT / UPDATE
+BATCH_SIZE = 500
+
+
+def complete_enrollments(semester, year):
+    return Enrollment.objects.filter(semester=semester, year=year, status='ACTIVE').update(
+        status='COMPLETED', completed_at=timezone.now()
+    )
+
+
+def grade_enrollments(semester, year):
+    _, updated = assign_grades(term_enrollments(semester, year).filter(grade__isnull=True))
+    return updated
+
+
+def record_achievements(semester, year):
+    enrollment_rows, lo_scores = lo_results(term_enrollments(semester, year))
+    plo_by_lo = dict(
+        LearningOutcome.objects.filter(
+            pk__in={lo_id for _, lo_id in lo_scores}, plo__isnull=False
+        ).values_list('pk', 'plo_id')
+    )
+    plo_scores = defaultdict(list)
+    for (enrollment_id, lo_id), score in lo_scores.items():
+        if lo_id in plo_by_lo:
+            plo_scores[enrollment_id, plo_by_lo[lo_id]].append(score)
+
+    now = timezone.now()
+    achievements = []
+    for (enrollment_id, plo_id), scores in sorted(plo_scores.items()):
+        score = min(100.0, max(0.0, sum(scores) / len(scores)))
+        achievements.append(StudentPLOAchievement(
+            student_id=enrollment_rows[enrollment_id][0], plo_id=plo_id, enrollment_id=enrollment_id,
+            score=score, achievement_level=_get_achievement_level(score), assessed_at=now, updated_at=now,
+        ))
+    StudentPLOAchievement.objects.bulk_create(
+        achievements,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['student', 'plo', 'enrollment'],
+        update_fields=['score', 'achievement_level', 'assessed_at', 'updated_at'],
+    )
+    return len(achievements)
+
+
+def freeze_outcomes(semester, year):
+    return freeze_term(semester, year, replace=True).results.count()
+
+
+def refresh_caches(semester, year):
+    bump_data_version()
+    return 0
+
+
+# (name, function) in run order; each function returns the number of rows it wrote
+STAGES = [
+    ('enrollments', complete_enrollments),
+    ('grades', grade_enrollments),
+    ('achievements', record_achievements),
+    ('outcomes', freeze_outcomes),
+    ('caches', refresh_caches),
+]
+STAGE_NAMES = [name for name, _ in STAGES]
+
+
+def close_term(semester, year, restart=False, progress=None):
+    """
+    Run the stages that have not finished yet for the term; with ``restart``
+    every stage runs again. ``progress(checkpoint, skipped)`` is called after
+    each stage. Returns the term's checkpoints in stage order.
+    """
+    key = term_key(year, semester)
+    if restart:
+        TermCloseCheckpoint.objects.filter(term_key=key).delete()
+    done = {checkpoint.stage: checkpoint for checkpoint in TermCloseCheckpoint.objects.filter(term_key=key)}
+
+    checkpoints = []
+    for name, stage in STAGES:
+        checkpoint = done.get(name)
+        skipped = checkpoint is not None
+        if not skipped:
+            started = time.perf_counter()
+            with transaction.atomic():
+                rows = stage(semester, year)
+                checkpoint = TermCloseCheckpoint.objects.create(
+                    semester=semester, year=year, term_key=key, stage=name, rows=rows,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 2),
+                )
+        if progress is not None:
+            progress(checkpoint, skipped)
+        checkpoints.append(checkpoint)
+    return checkpoints
@@ -0,0 +1,81 @@
+"""
+Small hand-built dataset shared by the outcomes tests.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from courses.models import Course
+from professors.models import Professor
+from students.models import Student
+from outcomes.models import (
+    Assessment,
+    AssessmentLOMapping,
+    CourseOffering,
+    Enrollment,
+    LearningOutcome,
+    LOPOMapping,
+    ProgramOutcome,
+    StudentAssessmentScore,
+)
+
+
+def build_dataset():
+    """
+    Two courses, three students and a PO fed by LOs from both courses.
+
+    Returns a dict of the created objects keyed by short names.
+    """
+    professor = Professor.objects.create(
+        name='Dr. Test', department='Computer Engineering', email='prof@example.edu'
+    )
+    cs101 = Course.objects.create(name='Intro to CS', code='CS101', credit=4)
+    cs201 = Course.objects.create(name='Data Structures', code='CS201', credit=3)
+
+    students = [
+        Student.objects.create(
+            name=name, student_number=f'S{i:04d}', email=f'{name.lower()}@example.edu',
+            enrollment_year=2022,
+        )
+        for i, name in enumerate(['Alice', 'Bob', 'Carol'], start=1)
+    ]
+
+    po = ProgramOutcome.objects.create(code='PO-A', title='Engineering Knowledge', description='...')
+    data = {'professor': professor, 'courses': [cs101, cs201], 'students': students, 'po': po}
+
+    graded_at = datetime(2024, 6, 1, 12, 30, tzinfo=dt_timezone.utc)
+    for course, weight in [(cs101, 5), (cs201, 3)]:
+        offering = CourseOffering.objects.create(
+            course=course, professor=professor, semester='FALL', year=2024
+        )
+        lo = LearningOutcome.objects.create(
+            course=course, code='CLO-1', description=f'{course.code} outcome', bloom_level='APPLY'
+        )
+        LOPOMapping.objects.create(learning_outcome=lo, program_outcome=po, weight=weight)
+
+        midterm = Assessment.objects.create(
+            course_offering=offering, name='Midterm', assessment_type='EXAM',
+            max_score=100, weight_percentage=40,
+        )
+        final = Assessment.objects.create(
+            course_offering=offering, name='Final', assessment_type='EXAM',
+            max_score=50, weight_percentage=60,
+        )
+        AssessmentLOMapping.objects.create(assessment=midterm, learning_outcome=lo, contribution_percentage=40)
+        AssessmentLOMapping.objects.create(assessment=final, learning_outcome=lo, contribution_percentage=60)
+
+        for i, student in enumerate(students):
+            enrollment = Enrollment.objects.create(
+                student=student, course=course, course_offering=offering, semester='FALL', year=2024,
+                status='COMPLETED' if i < 2 else 'ACTIVE',
+            )
+            StudentAssessmentScore.objects.create(
+                student=student, assessment=midterm, enrollment=enrollment,
+                score=70 + 10 * i, graded_at=graded_at,
+            )
+            StudentAssessmentScore.objects.create(
+                student=student, assessment=final, enrollment=enrollment,
+                score=35 + 5 * i, graded_at=graded_at,
+            )
+
+        data[course.code] = {'offering': offering, 'lo': lo, 'assessments': [midterm, final]}
+
+    return data
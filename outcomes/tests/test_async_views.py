@@ -0,0 +1,56 @@
+import json
+
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase
+
+from outcomes.models import ProgramLearningOutcome, StudentPLOAchievement
+
+from .fixtures import build_dataset
+
+
+class AsyncCalculationViewTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        cls.student = cls.data['students'][0]
+
+    async def apost(self, url, payload):
+        return await self.async_client.post(url, json.dumps(payload), content_type='application/json')
+
+    async def test_student_po_summary_matches_sync_view(self):
+        sync = await sync_to_async(self.client.post)(
+            '/api/student-scores/student_po_summary/', {'student_id': self.student.pk}, format='json'
+        )
+        response = await self.apost('/api/async/student_po_summary/', {'student_id': self.student.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), json.loads(sync.content))
+
+    async def test_calculate_po_scores_matches_sync_view(self):
+        for use_credits in (True, False):
+            sync = await sync_to_async(self.client.post)(
+                '/api/student-scores/calculate_po_scores/',
+                {'student_id': self.student.pk, 'use_credits': use_credits}, format='json'
+            )
+            response = await self.apost(
+                '/api/async/calculate_po_scores/',
+                {'student_id': self.student.pk, 'use_credits': use_credits}
+            )
+            self.assertEqual(response.json(), json.loads(sync.content))
+
+    async def test_missing_student(self):
+        response = await self.apost('/api/async/student_po_summary/', {'student_id': 999999})
+        self.assertEqual(response.status_code, 404)
+        response = await self.apost('/api/async/student_po_summary/', {})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_plo_statistics(self):
+        plo = await ProgramLearningOutcome.objects.acreate(number=1, description='...', short_name='Knowledge')
+        enrollment = await self.student.enrollments.afirst()
+        await StudentPLOAchievement.objects.acreate(
+            student=self.student, plo=plo, enrollment=enrollment, achievement_level='ACHIEVED', score=75
+        )
+        response = await self.async_client.get('/api/async/plo_statistics/', {'plo_id': plo.pk})
+        sync = await sync_to_async(self.client.get)('/api/achievements/plo_statistics/', {'plo_id': plo.pk})
+        self.assertEqual(response.json(), json.loads(sync.content))
+        self.assertEqual(response.json()['achieved'], 1)
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from outcomes import models as outcome_models
+
+from .fixtures import build_dataset
+
+
+class BatchViewTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def post(self, requests):
+        return self.client.post('/api/batch/', {'requests': requests}, format='json')
+
+    def test_runs_each_request_in_process(self):
+        student = self.data['students'][0]
+        response = self.post([
+            '/api/students/',
+            {'path': f'/api/enrollments/?student={student.pk}'},
+            f'/api/students/{student.pk}/',
+            '/',
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.data['responses']
+        self.assertEqual([r['status'] for r in results], [200, 200, 200, 200])
+        self.assertEqual(len(results[0]['body']), 3)
+        self.assertEqual(results[2]['body']['name'], student.name)
+        self.assertEqual(results[3]['body']['message'], 'Backend is running')
+
+    def test_reports_per_request_errors(self):
+        response = self.post([
+            '/api/nowhere/',
+            '/api/students/999999/',
+            {'path': '/api/students/', 'method': 'DELETE'},
+            'https://example.com/api/students/',
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.data['responses']], [404, 404, 405, 400])
+
+    def test_runs_async_views_and_rejects_streams(self):
+        student = self.data['students'][0]
+        response = self.post([
+            '/api/plos/',
+            '/api/async/plo_statistics/?plo_id=1',
+            f'/api/stream/students/{student.pk}/',
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.data['responses']
+        self.assertEqual([r['status'] for r in results], [200, 200, 400])
+        self.assertEqual(results[1]['body']['total_students'], 0)
+        self.assertIn('error', results[2]['body'])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_rejects_oversized_batches(self):
+        response = self.post(['/api/students/'] * 3)
+        self.assertEqual(response.status_code, 400)
+
+    def test_calculations_are_shared_across_sub_requests(self):
+        course = self.data['courses'][0]
+        lo = self.data[course.code]['lo']
+        calls = []
+        real_calculate_lo_score = outcome_models.calculate_lo_score
+
+        def counting_calculate_lo_score(*args):
+            calls.append(args)
+            return real_calculate_lo_score(*args)
+
+        with mock.patch.object(outcome_models, 'calculate_lo_score', counting_calculate_lo_score):
+            response = self.post([
+                f'/api/learning-outcomes/{lo.pk}/',
+                f'/api/enrollments/by_course/?course_id={course.pk}',
+            ])
+        self.assertEqual([r['status'] for r in response.data['responses']], [200, 200])
+        # Two completed enrollments, each scored once although both endpoints need them
+        self.assertEqual(len(calls), 2)
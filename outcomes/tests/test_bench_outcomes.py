@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from students.models import Student
+
+
+class BenchOutcomesCommandTests(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output = os.path.join(self.tmp.name, 'bench.json')
+
+    def bench(self, **options):
+        out = StringIO()
+        call_command(
+            'bench_outcomes', sizes='6', sample=2, courses=4, courses_per_student=2,
+            stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_writes_json_results_and_rolls_back_the_dataset(self):
+        self.bench(output=self.output)
+
+        with open(self.output) as handle:
+            report = json.load(handle)
+        rows = report['results']
+        self.assertEqual(
+            {(row['engine'], row['function']) for row in rows},
+            {
+                (engine, function)
+                for engine in ('reference', 'async')
+                for function in (
+                    'calculate_lo_score', 'calculate_po_score',
+                    'calculate_all_po_scores', 'get_student_po_summary',
+                )
+            },
+        )
+        for row in rows:
+            self.assertEqual(row['dataset_students'], 6)
+            self.assertEqual(row['students'], 2)
+            self.assertGreater(row['queries'], 0)
+            self.assertGreater(row['peak_memory_kib'], 0)
+        self.assertFalse(Student.objects.exists())
+
+    def test_compares_against_baseline(self):
+        self.bench(output=self.output, functions='calculate_all_po_scores')
+        out = self.bench(baseline=self.output, functions='calculate_all_po_scores')
+        self.assertIn('x baseline', out)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(CommandError):
+            self.bench(engines='vectorized')
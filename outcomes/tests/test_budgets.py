@@ -0,0 +1,340 @@
+"""
+Query-count and response-time budgets for every API route.
+
+Each route registered by the students, courses, professors and outcomes
+URLconfs is called once, in a test of its own, against a mid-sized
+synthetic dataset. A route fails when it runs more SQL queries than its
+target in ``BUDGETS`` plus ``QUERY_ALLOWANCE`` or takes longer than its
+time budget; a route without a budget fails too, so new endpoints come with
+one. Time budgets are scaled by the ``BUDGET_TIME_SCALE`` environment
+variable (e.g. ``3`` on a slow CI machine, ``0`` to skip them).
+
+Routes in ``KNOWN_FAILURES`` are still above their budget and run as
+expected failures; their test fails once the route is within budget, so
+the entry goes in the same change.
+"""
+import json
+import os
+import re
+import time
+from unittest import expectedFailure
+
+from django.db import connection
+from django.test import override_settings
+from django.urls import URLResolver, reverse
+from rest_framework.test import APITestCase
+
+from outcomes.caching import bump_data_version
+from outcomes.models import (
+    Assessment,
+    AssessmentLOMapping,
+    CourseOffering,
+    CoursePLOMapping,
+    Enrollment,
+    LearningOutcome,
+    LOPOMapping,
+    ProgramLearningOutcome,
+    ProgramOutcome,
+    StudentAssessmentScore,
+    StudentPLOAchievement,
+)
+from outcomes.synthetic import generate_dataset
+
+from courses.models import Course
+from professors.models import Professor
+from students.models import Student
+
+
+URLCONFS = ['students.urls', 'courses.urls', 'professors.urls', 'outcomes.urls']
+
+PLACEHOLDER = re.compile(r'@(\w+)')
+
+# route name -> (method, URL kwargs, query params or JSON body); '@name'
+# values are replaced by the id of the matching object in ``ids``
+CALLS = {
+    'api-root': ('get', {}, {}),
+    'student-list': ('get', {}, {}),
+    'student-detail': ('get', {'pk': '@student'}, {}),
+    'student-autocomplete': ('get', {}, {'q': 'ada'}),
+    'course-list': ('get', {}, {}),
+    'course-detail': ('get', {'pk': '@course'}, {}),
+    'professor-list': ('get', {}, {}),
+    'professor-detail': ('get', {'pk': '@professor'}, {}),
+    'batch': ('post', {}, {'requests': [
+        {'method': 'GET', 'path': '/api/enrollments/by_student/?student_id=@student'},
+        {'method': 'GET', 'path': '/api/student-scores/by_student/?student_id=@student'},
+    ]}),
+    'changes': ('get', {}, {'after': 0}),
+    'term-outcomes': ('get', {'semester': 'SPRING', 'year': 2024}, {'student_id': '@student'}),
+    'async-calculate-po-scores': ('post', {}, {'student_id': '@student'}),
+    'async-student-po-summary': ('post', {}, {'student_id': '@student'}),
+    'async-plo-statistics': ('get', {}, {'plo_id': '@plo'}),
+    'offering-stream': ('get', {'offering_id': '@offering'}, {}),
+    'student-stream': ('get', {'student_id': '@student'}, {}),
+    'plo-list': ('get', {}, {}),
+    'plo-active': ('get', {}, {}),
+    'plo-detail': ('get', {'pk': '@plo'}, {}),
+    'enrollment-list': ('get', {}, {}),
+    'enrollment-by-course': ('get', {}, {'course_id': '@course'}),
+    'enrollment-by-student': ('get', {}, {'student_id': '@student'}),
+    'enrollment-detail': ('get', {'pk': '@enrollment'}, {}),
+    'offering-list': ('get', {}, {}),
+    'offering-current-semester': ('get', {}, {'semester': 'FALL', 'year': 2024}),
+    'offering-detail': ('get', {'pk': '@offering'}, {}),
+    'course-plo-mapping-list': ('get', {}, {}),
+    'course-plo-mapping-by-course': ('get', {}, {'course_id': '@course'}),
+    'course-plo-mapping-by-plo': ('get', {}, {'plo_id': '@plo'}),
+    'course-plo-mapping-detail': ('get', {'pk': '@course_plo_mapping'}, {}),
+    'achievement-list': ('get', {}, {}),
+    'achievement-plo-statistics': ('get', {}, {'plo_id': '@plo'}),
+    'achievement-student-summary': ('get', {}, {'student_id': '@student'}),
+    'achievement-detail': ('get', {'pk': '@achievement'}, {}),
+    'learning-outcome-list': ('get', {}, {}),
+    'learning-outcome-by-course': ('get', {}, {'course_id': '@course'}),
+    'learning-outcome-by-plo': ('get', {}, {'plo_id': '@plo'}),
+    'learning-outcome-detail': ('get', {'pk': '@learning_outcome'}, {}),
+    'program-outcome-list': ('get', {}, {}),
+    'program-outcome-by-type': ('get', {}, {'type': 'INSTITUTIONAL'}),
+    'program-outcome-detail': ('get', {'pk': '@program_outcome'}, {}),
+    'program-outcome-plo-mapping': ('get', {'pk': '@program_outcome'}, {}),
+    'assessment-list': ('get', {}, {}),
+    'assessment-by-course-offering': ('get', {}, {'offering_id': '@offering'}),
+    'assessment-upcoming': ('get', {}, {}),
+    'assessment-detail': ('get', {'pk': '@assessment'}, {}),
+    'assessment-learning-outcome-coverage': ('get', {'pk': '@assessment'}, {}),
+    'assessment-score-statistics': ('get', {'pk': '@assessment'}, {}),
+    'assessment-lo-mapping-list': ('get', {}, {}),
+    'assessment-lo-mapping-detail': ('get', {'pk': '@assessment_lo_mapping'}, {}),
+    'lo-po-mapping-list': ('get', {}, {}),
+    'lo-po-mapping-detail': ('get', {'pk': '@lo_po_mapping'}, {}),
+    'student-score-list': ('get', {}, {}),
+    'student-score-by-enrollment': ('get', {}, {'enrollment_id': '@enrollment'}),
+    'student-score-by-student': ('get', {}, {'student_id': '@student'}),
+    'student-score-calculate-lo-scores': ('post', {}, {'student_id': '@student', 'course_id': '@course'}),
+    'student-score-calculate-po-scores': ('post', {}, {'student_id': '@student'}),
+    'student-score-student-po-summary': ('post', {}, {'student_id': '@student'}),
+    'student-score-detail': ('get', {'pk': '@score'}, {}),
+}
+
+# Routes that write, kept out of the reads above
+WRITE_CALLS = {
+    'offering-compute-grades': ('post', {'pk': '@offering'}, {}),
+}
+
+# route name -> (target number of SQL queries, milliseconds): what the
+# route should run and take on this dataset. Plain reads run a fixed number
+# of queries whatever the number of rows; lower a target when an
+# optimization lands.
+BUDGETS = {
+    'api-root': (0, 250),
+    'student-list': (1, 250),
+    'student-detail': (1, 250),
+    'student-autocomplete': (1, 250),
+    'course-list': (3, 250),
+    'course-detail': (2, 250),
+    'professor-list': (2, 250),
+    'professor-detail': (1, 250),
+    'batch': (8, 500),
+    'changes': (1, 500),
+    'term-outcomes': (10, 250),
+    'async-calculate-po-scores': (6, 250),
+    'async-student-po-summary': (6, 250),
+    'async-plo-statistics': (1, 250),
+    'offering-stream': (2, 250),
+    'student-stream': (6, 250),
+    'plo-list': (2, 250),
+    'plo-active': (1, 250),
+    'plo-detail': (1, 250),
+    'enrollment-list': (4, 250),
+    'enrollment-by-course': (4, 250),
+    'enrollment-by-student': (4, 250),
+    'enrollment-detail': (3, 250),
+    'offering-list': (2, 250),
+    'offering-current-semester': (1, 250),
+    'offering-detail': (1, 250),
+    'offering-compute-grades': (3, 250),
+    'course-plo-mapping-list': (2, 250),
+    'course-plo-mapping-by-course': (1, 250),
+    'course-plo-mapping-by-plo': (1, 250),
+    'course-plo-mapping-detail': (1, 250),
+    'achievement-list': (2, 250),
+    'achievement-plo-statistics': (1, 250),
+    'achievement-student-summary': (2, 250),
+    'achievement-detail': (1, 250),
+    'learning-outcome-list': (4, 250),
+    'learning-outcome-by-course': (4, 250),
+    'learning-outcome-by-plo': (4, 250),
+    'learning-outcome-detail': (3, 250),
+    'program-outcome-list': (5, 250),
+    'program-outcome-by-type': (5, 250),
+    'program-outcome-detail': (4, 250),
+    'program-outcome-plo-mapping': (2, 250),
+    'assessment-list': (3, 250),
+    'assessment-by-course-offering': (2, 250),
+    'assessment-upcoming': (1, 250),
+    'assessment-detail': (2, 250),
+    'assessment-learning-outcome-coverage': (2, 250),
+    'assessment-score-statistics': (2, 250),
+    'assessment-lo-mapping-list': (2, 250),
+    'assessment-lo-mapping-detail': (1, 250),
+    'lo-po-mapping-list': (2, 250),
+    'lo-po-mapping-detail': (1, 250),
+    'student-score-list': (2, 250),
+    'student-score-by-enrollment': (1, 250),
+    'student-score-by-student': (1, 250),
+    'student-score-calculate-lo-scores': (4, 250),
+    'student-score-calculate-po-scores': (6, 250),
+    'student-score-student-po-summary': (6, 250),
+    'student-score-detail': (1, 250),
+}
+
+# Queries a route may run over its target before it fails, so that an
+# incidental query (a savepoint, a lazily read row) does not break the suite
+# while a real regression, such as a query per row, still does
+QUERY_ALLOWANCE = 2
+
+# Multiplier for the time budgets, 0 to skip them
+TIME_SCALE = float(os.environ.get('BUDGET_TIME_SCALE', 1))
+
+# Routes over their budget because they still compute outcome scores row by
+# row with the reference calculators: route name -> why
+KNOWN_FAILURES = {
+    'batch': 'its sub-requests are enrollment-by-student and student-score-by-student',
+    'async-calculate-po-scores': 'the async engine runs the reference queries concurrently',
+    'async-student-po-summary': 'the async engine runs the reference queries concurrently',
+    'student-stream': 'the initial po_scores event runs calculate_all_po_scores',
+    'enrollment-list': 'lo_scores: calculate_lo_score per LO of each COMPLETED enrollment',
+    'enrollment-by-course': 'lo_scores: calculate_lo_score per LO of each COMPLETED enrollment',
+    'enrollment-by-student': 'lo_scores: calculate_lo_score per LO of each COMPLETED enrollment',
+    'enrollment-detail': 'lo_scores: calculate_lo_score per LO of the enrollment',
+    'learning-outcome-list': 'calculated_scores: calculate_lo_score per LO and completed enrollment',
+    'learning-outcome-by-course': 'calculated_scores: calculate_lo_score per LO and completed enrollment',
+    'learning-outcome-by-plo': 'calculated_scores: calculate_lo_score per LO and completed enrollment',
+    'learning-outcome-detail': 'calculated_scores: calculate_lo_score per completed enrollment',
+    'program-outcome-list': 'calculated_scores: calculate_po_score per PO and student',
+    'program-outcome-by-type': 'calculated_scores: calculate_po_score per PO and student',
+    'program-outcome-detail': 'calculated_scores: calculate_po_score per student',
+    'student-score-calculate-lo-scores': 'calculate_lo_score per LO of the course',
+    'student-score-calculate-po-scores': 'calculate_po_score per PO, each reading its LO scores',
+    'student-score-student-po-summary': 'calculate_po_score per PO, each reading its LO scores',
+}
+
+
+def registered_routes():
+    """Names of all routes in ``URLCONFS``, without the ``.json`` format variants."""
+    from importlib import import_module
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            elif pattern.name and 'format' not in pattern.pattern.regex.groupindex:
+                yield pattern.name
+
+    names = set()
+    for urlconf in URLCONFS:
+        names.update(walk(import_module(urlconf).urlpatterns))
+    return names
+
+
+@override_settings(SINGLE_FLIGHT_TIMEOUT=0, SSE_MAX_DURATION=0)
+class QueryBudgetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(students=40, courses=6, courses_per_student=3, seed=1)
+        # The newest term, which the enrollment list shows first, holds every
+        # status rather than only ACTIVE enrollments
+        newest = Enrollment.objects.order_by('-term_key').values_list('term_key', flat=True).first()
+        pks = list(Enrollment.objects.filter(term_key=newest).order_by('pk').values_list('pk', flat=True))
+        for status, every in [('COMPLETED', pks[0::4]), ('DROPPED', pks[1::4]), ('WITHDRAWN', pks[2::4])]:
+            Enrollment.objects.filter(pk__in=every).update(status=status)
+        plo = ProgramLearningOutcome.objects.order_by('number').first()
+        StudentPLOAchievement.objects.bulk_create([
+            StudentPLOAchievement(
+                student_id=enrollment.student_id, plo=plo, enrollment=enrollment,
+                achievement_level='ACHIEVED', score=70 + i % 30,
+            )
+            for i, enrollment in enumerate(Enrollment.objects.filter(status='COMPLETED')[:40])
+        ])
+        enrollment = Enrollment.objects.filter(status='COMPLETED').order_by('id').first()
+        cls.ids = {
+            'student': enrollment.student_id,
+            'course': enrollment.course_id,
+            'enrollment': enrollment.pk,
+            'professor': Professor.objects.order_by('id').first().pk,
+            'plo': plo.pk,
+            'offering': CourseOffering.objects.filter(course_id=enrollment.course_id).order_by('id').first().pk,
+            'course_plo_mapping': CoursePLOMapping.objects.order_by('id').first().pk,
+            'achievement': StudentPLOAchievement.objects.order_by('id').first().pk,
+            'learning_outcome': LearningOutcome.objects.order_by('id').first().pk,
+            'program_outcome': ProgramOutcome.objects.order_by('id').first().pk,
+            'assessment': Assessment.objects.order_by('id').first().pk,
+            'assessment_lo_mapping': AssessmentLOMapping.objects.order_by('id').first().pk,
+            'lo_po_mapping': LOPOMapping.objects.order_by('id').first().pk,
+            'score': StudentAssessmentScore.objects.filter(enrollment=enrollment).order_by('id').first().pk,
+        }
+        assert Student.objects.count() == 40 and Course.objects.count() == 6
+        bump_data_version()
+
+    def resolve(self, value):
+        if isinstance(value, str):
+            value = PLACEHOLDER.sub(lambda match: str(self.ids[match.group(1)]), value)
+            return int(value) if value.isdigit() else value
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def call(self, name):
+        method, kwargs, data = {**CALLS, **WRITE_CALLS}[name]
+        url = reverse(name, kwargs=self.resolve(kwargs))
+        data = self.resolve(data)
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # Counted with a wrapper: the debug query log is capped at 9000 entries
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            if method == 'get':
+                response = self.client.get(url, data)
+            else:
+                response = self.client.post(url, json.dumps(data), content_type='application/json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        return response, len(queries), elapsed_ms
+
+    def check_budget(self, name):
+        response, queries, elapsed_ms = self.call(name)
+        self.assertLess(response.status_code, 400, getattr(response, 'content', b'')[:300])
+        max_queries, max_ms = BUDGETS[name]
+        self.assertLessEqual(queries, max_queries + QUERY_ALLOWANCE, f'{name}: {queries} queries')
+        if TIME_SCALE:
+            self.assertLessEqual(elapsed_ms, max_ms * TIME_SCALE, f'{name}: {elapsed_ms:.0f} ms')
+
+    def test_every_route_has_a_budget(self):
+        routes = registered_routes()
+        calls = set(CALLS) | set(WRITE_CALLS)
+        self.assertEqual(routes - calls, set(), 'routes without a call in CALLS or WRITE_CALLS')
+        self.assertEqual(routes - set(BUDGETS), set(), 'routes without an entry in BUDGETS')
+        self.assertEqual(set(CALLS) & set(WRITE_CALLS), set())
+        self.assertEqual(set(KNOWN_FAILURES) - calls, set())
+
+
+def budget_test(name):
+    def test(self):
+        self.check_budget(name)
+
+    test.__doc__ = f'{name}: {KNOWN_FAILURES[name]}' if name in KNOWN_FAILURES else None
+    return expectedFailure(test) if name in KNOWN_FAILURES else test
+
+
+# One test per route, so that a write is rolled back before the next route
+# runs and every route over its budget is reported
+for _name in [*CALLS, *WRITE_CALLS]:
+    setattr(QueryBudgetTests, f"test_{_name.replace('-', '_')}", budget_test(_name))
@@ -0,0 +1,135 @@
+import tempfile
+import threading
+import time
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from outcomes.caching import bump_data_version, get_data_version, single_flight
+from outcomes.models import Assessment, Enrollment, StudentAssessmentScore
+from .fixtures import build_dataset
+
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'calculations': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-calculations',
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES, SINGLE_FLIGHT_LOCK_DIR=tempfile.mkdtemp())
+class SingleFlightTests(SimpleTestCase):
+
+    def setUp(self):
+        bump_data_version()
+        self.calls = []
+
+    def slow_square(self, value):
+        self.calls.append(value)
+        time.sleep(0.2)
+        return value * value
+
+    def test_concurrent_identical_calls_compute_once(self):
+        results = []
+
+        def worker():
+            results.append(single_flight(self.slow_square, 7))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, [7])
+        self.assertEqual(results, [49] * 8)
+
+    def test_different_arguments_are_not_coalesced(self):
+        self.assertEqual(single_flight(self.slow_square, 2), 4)
+        self.assertEqual(single_flight(self.slow_square, 3), 9)
+        self.assertEqual(self.calls, [2, 3])
+
+    def test_data_version_change_forces_recomputation(self):
+        single_flight(self.slow_square, 5)
+        single_flight(self.slow_square, 5)
+        self.assertEqual(self.calls, [5])
+
+        before = get_data_version()
+        bump_data_version()
+        self.assertNotEqual(before, get_data_version())
+
+        single_flight(self.slow_square, 5)
+        self.assertEqual(self.calls, [5, 5])
+
+    def test_errors_are_propagated_to_waiters(self):
+        def failing():
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        errors = []
+
+        def worker():
+            try:
+                single_flight(failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, ['boom'] * 3)
+
+    def test_base_exceptions_are_propagated_to_waiters(self):
+        def interrupted():
+            time.sleep(0.1)
+            raise KeyboardInterrupt
+
+        errors = []
+
+        def worker():
+            try:
+                single_flight(interrupted)
+            except KeyboardInterrupt as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+
+
+@override_settings(CACHES=TEST_CACHES, SINGLE_FLIGHT_LOCK_DIR=tempfile.mkdtemp())
+class BulkWriteInvalidationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def test_queryset_writes_invalidate_results(self):
+        def totals():
+            return (
+                sorted(StudentAssessmentScore.objects.values_list('normalized', flat=True)),
+                sorted(Enrollment.objects.values_list('status', flat=True)),
+            )
+
+        writes = [
+            lambda: StudentAssessmentScore.objects.update(score=50),
+            lambda: Assessment.objects.update(max_score=200),
+            lambda: Enrollment.objects.update(status='COMPLETED'),
+            lambda: Enrollment.objects.bulk_update(
+                [Enrollment(pk=pk, status='DROPPED') for pk in Enrollment.objects.values_list('pk', flat=True)],
+                ['status'],
+            ),
+        ]
+        for write in writes:
+            before = single_flight(totals)
+            write()
+            self.assertEqual(single_flight(totals), totals())
+            self.assertNotEqual(single_flight(totals), before)
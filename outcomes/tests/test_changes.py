@@ -0,0 +1,102 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from outcomes.models import AssessmentLOMapping, Change, Enrollment, LOPOMapping, StudentAssessmentScore
+from .fixtures import build_dataset
+
+
+class ChangeFeedTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.cs101, self.cs201 = self.data['courses']
+        self.start = Change.objects.order_by('-seq').values_list('seq', flat=True).first()
+
+    def changes(self):
+        return list(
+            Change.objects.filter(seq__gt=self.start).values_list('model_label', 'object_id', 'action')
+        )
+
+    def test_fixtures_are_recorded(self):
+        labels = set(Change.objects.values_list('model_label', flat=True))
+        self.assertEqual(labels, {
+            'courses.Course', 'outcomes.Enrollment', 'outcomes.StudentAssessmentScore',
+            'outcomes.AssessmentLOMapping', 'outcomes.LOPOMapping',
+        })
+        self.assertEqual(
+            Change.objects.filter(model_label='outcomes.StudentAssessmentScore', action='INSERT').count(),
+            StudentAssessmentScore.objects.count(),
+        )
+
+    def test_saves_and_deletes(self):
+        score = StudentAssessmentScore.objects.filter(enrollment__course=self.cs101).first()
+        score.score = 10
+        score.save()
+        # Fields outside the feed are not recorded
+        score.feedback = 'See me'
+        score.save(update_fields=['feedback'])
+        self.cs101.name = 'Introduction to CS'
+        self.cs101.save()
+        self.cs101.credit = 5
+        self.cs101.save()
+        mapping = LOPOMapping.objects.first()
+        mapping_pk = mapping.pk
+        mapping.delete()
+
+        self.assertEqual(self.changes(), [
+            ('outcomes.StudentAssessmentScore', score.pk, 'UPDATE'),
+            ('courses.Course', self.cs101.pk, 'UPDATE'),
+            ('outcomes.LOPOMapping', mapping_pk, 'DELETE'),
+        ])
+        entry = Change.objects.get(seq__gt=self.start, model_label='outcomes.StudentAssessmentScore')
+        self.assertEqual(entry.data['score'], 10)
+        self.assertEqual(entry.data['enrollment'], score.enrollment_id)
+
+    def test_bulk_writes_record_changed_rows(self):
+        carol = self.data['students'][2]
+        Enrollment.objects.filter(course=self.cs101).update(status='COMPLETED')
+        # Only Carol's enrollment was not completed already
+        self.assertEqual(self.changes(), [
+            ('outcomes.Enrollment', Enrollment.objects.get(student=carol, course=self.cs101).pk, 'UPDATE'),
+        ])
+
+        mappings = list(AssessmentLOMapping.objects.all())
+        for mapping in mappings:
+            mapping.contribution_percentage = 25
+        AssessmentLOMapping.objects.bulk_update(mappings, ['contribution_percentage'])
+        recorded = Change.objects.filter(seq__gt=self.start, model_label='outcomes.AssessmentLOMapping')
+        self.assertEqual(sorted(recorded.values_list('object_id', flat=True)), sorted(m.pk for m in mappings))
+        self.assertEqual({entry.data['contribution_percentage'] for entry in recorded}, {25})
+
+        Course.objects.filter(pk=self.cs201.pk).update(name='DS')
+        Course.objects.filter(pk=self.cs201.pk).update(credit=4)
+        self.assertEqual(
+            list(Change.objects.filter(seq__gt=self.start, model_label='courses.Course').values_list('data', flat=True)),
+            [{'credit': 4}],
+        )
+
+    def test_endpoint_batches(self):
+        last = Change.objects.order_by('-seq').values_list('seq', flat=True).first()
+        response = self.client.get(reverse('changes'), {'after': 0, 'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry['seq'] for entry in response.data['changes']], [1, 2])
+        self.assertTrue(response.data['has_more'])
+
+        response = self.client.get(reverse('changes'), {'after': response.data['last_seq']})
+        self.assertEqual(response.data['changes'][-1]['seq'], last)
+        self.assertFalse(response.data['has_more'])
+
+        response = self.client.get(reverse('changes'), {'after': last})
+        self.assertEqual((response.data['changes'], response.data['last_seq']), ([], last))
+
+        with override_settings(CHANGE_FEED_MAX_BATCH_SIZE=3):
+            response = self.client.get(reverse('changes'), {'limit': 100})
+        self.assertEqual(len(response.data['changes']), 3)
+
+        response = self.client.get(reverse('changes'), {'after': 'x'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from courses.models import Course
+from outcomes.counters import COUNTERS, counter_drift
+from outcomes.models import Assessment, CourseOffering, Enrollment, get_student_po_summary, link_course_offerings
+from outcomes.nplusone import allow_repeated_queries
+from students.models import Student
+from .fixtures import build_dataset
+
+
+class CounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.alice, self.bob, self.carol = self.data['students']
+        self.cs101, self.cs201 = self.data['courses']
+        self.offering = self.data['CS101']['offering']
+
+    def assertCountersMatch(self):
+        for label in COUNTERS:
+            self.assertEqual(list(counter_drift(label).values_list('pk', flat=True)), [], label)
+
+    def counters(self, obj):
+        obj = type(obj).objects.get(pk=obj.pk)
+        if isinstance(obj, Student):
+            return obj.completed_courses, obj.completed_credits
+        return obj.enrolled_count, obj.assessment_count
+
+    def test_kept_in_step_on_create(self):
+        self.assertEqual(self.counters(self.cs101), (3, 2))
+        self.assertEqual(self.counters(self.offering), (3, 2))
+        # Alice completed CS101 (4 credits) and CS201 (3 credits); Carol is still active
+        self.assertEqual(self.counters(self.alice), (2, 7))
+        self.assertEqual(self.counters(self.carol), (0, 0))
+        self.assertCountersMatch()
+
+    def test_kept_in_step_on_save_and_delete(self):
+        enrollment = Enrollment.objects.get(student=self.carol, course=self.cs101)
+        enrollment.status = 'COMPLETED'
+        enrollment.save(update_fields=['status'])
+        self.assertEqual(self.counters(self.carol), (1, 4))
+
+        # Fields left out of update_fields are not counted
+        enrollment.status = 'DROPPED'
+        enrollment.save(update_fields=['grade'])
+        self.assertEqual(self.counters(self.carol), (1, 4))
+
+        self.cs101.credit = 5
+        self.cs101.save()
+        self.assertEqual(self.counters(self.carol), (1, 5))
+        self.assertEqual(self.counters(self.alice), (2, 8))
+
+        Assessment.objects.create(
+            course_offering=self.offering, name='Quiz', assessment_type='QUIZ', max_score=10, weight_percentage=0
+        )
+        self.assertEqual(self.counters(self.offering), (3, 3))
+
+        Enrollment.objects.filter(student=self.alice).delete()
+        self.assertEqual(self.counters(self.alice), (0, 0))
+        self.assertEqual(self.counters(self.cs101), (2, 3))
+        self.assertCountersMatch()
+
+    def test_kept_in_step_on_bulk_writes(self):
+        Enrollment.objects.filter(status='ACTIVE').update(status='COMPLETED', completed_at=None)
+        self.assertEqual(self.counters(self.carol), (2, 7))
+
+        enrollments = Enrollment.objects.bulk_create([
+            Enrollment(student=self.carol, course=self.cs101, semester='SPRING', year=2025, status='COMPLETED'),
+            Enrollment(student=self.bob, course=self.cs201, semester='SPRING', year=2025),
+        ])
+        self.assertEqual(self.counters(self.carol), (3, 11))
+        self.assertEqual(self.counters(self.cs201), (4, 2))
+
+        spring = CourseOffering.objects.create(
+            course=self.cs101, professor=self.data['professor'], semester='SPRING', year=2025
+        )
+        self.assertEqual(link_course_offerings(), 1)
+        self.assertEqual(self.counters(spring), (1, 0))
+
+        for enrollment in enrollments:
+            enrollment.status = 'DROPPED'
+        Enrollment.objects.bulk_update(enrollments, ['status'])
+        self.assertEqual(self.counters(self.carol), (2, 7))
+
+        Course.objects.filter(pk=self.cs201.pk).update(credit=1)
+        self.assertEqual(self.counters(self.carol), (2, 5))
+
+        Assessment.objects.filter(course_offering=self.offering).update(course_offering=spring)
+        self.assertEqual(self.counters(spring), (1, 2))
+        self.assertEqual(self.counters(self.offering), (3, 0))
+        self.assertCountersMatch()
+
+    def test_summary_reads_counters(self):
+        with allow_repeated_queries():
+            statistics = get_student_po_summary(self.alice)['statistics']
+        self.assertEqual((statistics['completed_courses'], statistics['total_credits']), (2, 7))
+
+    def test_repair_counters(self):
+        # Raw writes bypass the counters
+        Student.objects.filter(pk=self.alice.pk).update(completed_credits=99)
+        CourseOffering.objects.filter(pk=self.offering.pk).update(enrolled_count=0)
+
+        with self.assertRaises(CommandError):
+            call_command('repair_counters', '--check', stdout=StringIO())
+        self.assertEqual(self.counters(self.alice), (2, 99))
+
+        out = StringIO()
+        call_command('repair_counters', stdout=out)
+        self.assertIn('completed_credits 99 -> 7', out.getvalue())
+        self.assertIn('2 rows repaired', out.getvalue())
+        self.assertCountersMatch()
+
+    def test_counter_writes_stamp_updated_at(self):
+        def stamps():
+            return [type(obj).objects.get(pk=obj.pk).updated_at for obj in (self.alice, self.cs101, self.offering)]
+
+        before = stamps()
+        Enrollment.objects.create(
+            student=self.alice, course=self.cs101, course_offering=self.offering,
+            semester='SPRING', year=2025, status='COMPLETED',
+        )
+        after = stamps()
+        self.assertTrue(all(new > old for new, old in zip(after, before)))
+
+        # repair_counters stamps only the rows it fixes
+        Student.objects.filter(pk=self.bob.pk).update(completed_credits=99)
+        drifted = Student.objects.get(pk=self.bob.pk).updated_at
+        call_command('repair_counters', stdout=StringIO())
+        self.assertEqual(stamps(), after)
+        self.assertGreater(Student.objects.get(pk=self.bob.pk).updated_at, drifted)
+        self.assertCountersMatch()
@@ -0,0 +1,110 @@
+from django.core.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from outcomes import engines
+from outcomes.models import (
+    Assessment,
+    AssessmentLOMapping,
+    CourseOffering,
+    Enrollment,
+    StudentAssessmentScore,
+    calculate_lo_score,
+    link_course_offerings,
+)
+from outcomes.nplusone import allow_repeated_queries
+from students.models import Student
+from .fixtures import build_dataset
+
+
+class CourseOfferingLinkTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        cls.course = cls.data['courses'][0]
+        cls.offering = cls.data['CS101']['offering']
+        cls.section_2 = CourseOffering.objects.create(
+            course=cls.course, professor=cls.data['professor'], semester='FALL', year=2024, section='02'
+        )
+        cls.new_student = Student.objects.create(
+            name='Dan', student_number='S0009', email='dan@example.edu', enrollment_year=2023
+        )
+
+    def test_backfill_links_by_scores_then_by_term(self):
+        # Bob's midterm score is moved to an assessment of section 02
+        bob = self.data['students'][1]
+        quiz = Assessment.objects.create(
+            course_offering=self.section_2, name='Quiz', assessment_type='QUIZ', max_score=10, weight_percentage=10
+        )
+        StudentAssessmentScore.objects.filter(
+            student=bob, assessment=self.data['CS101']['assessments'][0]
+        ).update(assessment=quiz)
+        unscored = Enrollment.objects.create(student=self.new_student, course=self.course, semester='FALL', year=2024)
+        Enrollment.objects.update(course_offering=None)
+
+        self.assertEqual(link_course_offerings(), Enrollment.objects.count())
+        self.assertEqual(link_course_offerings(), 0)
+        self.assertEqual(Enrollment.objects.get(student=bob, course=self.course).course_offering, self.section_2)
+        self.assertEqual(Enrollment.objects.get(pk=unscored.pk).course_offering, self.offering)
+        self.assertEqual(
+            Enrollment.objects.get(student=self.data['students'][0], course=self.course).course_offering,
+            self.offering
+        )
+
+    def test_clean_rejects_an_offering_of_another_term(self):
+        enrollment = Enrollment(
+            student=self.new_student, course=self.course, semester='SPRING', year=2024,
+            course_offering=self.offering,
+        )
+        with self.assertRaises(ValidationError):
+            enrollment.full_clean()
+
+    def test_api_resolves_and_validates_the_offering(self):
+        payload = {'student': self.new_student.pk, 'course': self.course.pk, 'semester': 'FALL', 'year': 2024}
+        response = self.client.post('/api/enrollments/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['course_offering'], self.offering.pk)
+        url = f'/api/enrollments/{response.data["id"]}/'
+
+        response = self.client.patch(url, {'course_offering': self.section_2.pk}, format='json')
+        self.assertEqual(response.data['course_offering'], self.section_2.pk)
+
+        response = self.client.patch(url, {'semester': 'SPRING'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['course_offering'])
+
+        response = self.client.patch(url, {'course_offering': self.offering.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('course_offering', response.data)
+
+    def test_scores_must_belong_to_the_enrollment_offering(self):
+        enrollment = Enrollment.objects.create(
+            student=self.new_student, course=self.course, semester='FALL', year=2024, course_offering=self.section_2
+        )
+        payload = {
+            'student': self.new_student.pk, 'assessment': self.data['CS101']['assessments'][0].pk,
+            'enrollment': enrollment.pk, 'score': 50,
+        }
+        response = self.client.post('/api/student-scores/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assessment', response.data)
+
+    def test_engines_only_use_assessments_of_the_linked_offering(self):
+        student = self.data['students'][0]
+        lo = self.data['CS101']['lo']
+        enrollment = Enrollment.objects.get(student=student, course=self.course)
+        with allow_repeated_queries():
+            expected = calculate_lo_score(lo, student, enrollment)
+
+        # A stray score on another section's assessment no longer counts once linked
+        stray = Assessment.objects.create(
+            course_offering=self.section_2, name='Stray', assessment_type='QUIZ', max_score=10, weight_percentage=10
+        )
+        AssessmentLOMapping.objects.create(assessment=stray, learning_outcome=lo, contribution_percentage=100)
+        StudentAssessmentScore.objects.create(student=student, assessment=stray, enrollment=enrollment, score=0)
+        enrollment.course_offering = self.offering
+        enrollment.save()
+
+        with allow_repeated_queries():
+            for engine in engines.ENGINES:
+                self.assertAlmostEqual(engines.call(engine, 'calculate_lo_score', lo, student, enrollment), expected)
@@ -0,0 +1,261 @@
+"""
+Randomized equivalence tests between the reference calculators and every
+other engine in ``outcomes.engines.ENGINES``.
+
+Each case builds a random mapping graph and score set from its own seed,
+with the edge cases the formulas treat specially: assessments with
+``max_score == 0``, missing scores, zero scores (so zero LO scores that PO
+scores skip), inactive LOs and POs, LOs without mappings, retaken courses,
+enrollments without a linked offering and enrollments that are not
+completed. All engines must agree with the
+reference within ``TOLERANCE`` for every function, in both the
+credit-weighted and simple-average modes.
+
+``EQUIVALENCE_CASES`` sets the number of cases (default 15);
+``EQUIVALENCE_SEED`` runs the single case printed in a failure message.
+
+The term snapshots (``outcomes.snapshots``) compute LO and PO results for
+one term at a time, so they are not an engine; ``SnapshotEquivalenceTests``
+checks them against the reference calculators on a synthetic dataset.
+"""
+import os
+import random
+
+from django.db import transaction
+from django.test import TestCase
+
+from courses.models import Course
+from outcomes import engines
+from outcomes.models import (
+    Assessment,
+    AssessmentLOMapping,
+    CourseOffering,
+    Enrollment,
+    LearningOutcome,
+    LOPOMapping,
+    ProgramOutcome,
+    StudentAssessmentScore,
+    calculate_lo_score,
+    calculate_po_score,
+)
+from outcomes.nplusone import allow_repeated_queries
+from outcomes.snapshots import LO, PO, compute_term_results
+from outcomes.synthetic import TERMS as SYNTHETIC_TERMS, generate_dataset
+from professors.models import Professor
+from students.models import Student
+
+
+TOLERANCE = 1e-6
+
+TERMS = [(2023, 'FALL'), (2024, 'SPRING'), (2024, 'FALL')]
+
+
+def build_case(rng):
+    """Create a random graph; returns the students, courses, LOs and POs."""
+    professor = Professor.objects.create(name='Dr. Random', department='CE', email='random@example.edu')
+    courses = [
+        Course.objects.create(name=f'Course {n}', code=f'EQ{n}', credit=rng.randint(1, 6))
+        for n in range(rng.randint(1, 4))
+    ]
+    program_outcomes = [
+        ProgramOutcome.objects.create(
+            code=f'EQ-PO{n}', title=f'Outcome {n}', description='...', is_active=rng.random() < 0.85
+        )
+        for n in range(rng.randint(1, 3))
+    ]
+
+    los = []
+    offerings = {}
+    for course in courses:
+        course_los = [
+            LearningOutcome.objects.create(
+                course=course, code=f'CLO-{n}', description='...', bloom_level='APPLY',
+                is_active=rng.random() < 0.9,
+            )
+            for n in range(rng.randint(0, 3))
+        ]
+        los.extend(course_los)
+        for lo in course_los:
+            for po in program_outcomes:
+                if rng.random() < 0.6:
+                    LOPOMapping.objects.create(learning_outcome=lo, program_outcome=po, weight=rng.randint(1, 5))
+
+        for year, semester in TERMS:
+            offering = CourseOffering.objects.create(course=course, professor=professor, semester=semester, year=year)
+            assessments = [
+                Assessment.objects.create(
+                    course_offering=offering, name=f'A{n}', assessment_type='EXAM',
+                    max_score=rng.choice([0, 10, 37.5, 50, 100]), weight_percentage=rng.choice([10, 40, 50]),
+                )
+                for n in range(rng.randint(0, 3))
+            ]
+            offerings[(course.pk, year, semester)] = offering, assessments
+            for assessment in assessments:
+                for lo in course_los:
+                    if rng.random() < 0.6:
+                        AssessmentLOMapping.objects.create(
+                            assessment=assessment, learning_outcome=lo,
+                            contribution_percentage=rng.choice([0, 10, 25, 50, 100]),
+                        )
+
+    students = []
+    for n in range(rng.randint(1, 4)):
+        student = Student.objects.create(
+            name=f'Student {n}', student_number=f'EQ{n:04d}', email=f'eq{n}@example.edu', enrollment_year=2022
+        )
+        students.append(student)
+        for course in courses:
+            if rng.random() < 0.3:
+                continue
+            first = rng.randrange(len(TERMS))
+            terms = [first]
+            if first + 1 < len(TERMS) and rng.random() < 0.3:
+                # Retake in a later term
+                terms.append(rng.randrange(first + 1, len(TERMS)))
+            for term in terms:
+                year, semester = TERMS[term]
+                offering, assessments = offerings[(course.pk, year, semester)]
+                enrollment = Enrollment.objects.create(
+                    student=student, course=course, year=year, semester=semester,
+                    course_offering=offering if rng.random() < 0.8 else None,
+                    status=rng.choices(['COMPLETED', 'ACTIVE', 'DROPPED'], weights=[7, 2, 1])[0],
+                )
+                for assessment in assessments:
+                    roll = rng.random()
+                    if roll < 0.2:
+                        continue  # missing score
+                    score = 0.0 if roll < 0.35 else round(rng.uniform(0, assessment.max_score or 10), 1)
+                    StudentAssessmentScore.objects.create(
+                        student=student, assessment=assessment, enrollment=enrollment, score=score
+                    )
+
+    return students, courses, los, program_outcomes
+
+
+class EngineEquivalenceTests(TestCase):
+
+    def cases(self):
+        if os.environ.get('EQUIVALENCE_SEED'):
+            return [int(os.environ['EQUIVALENCE_SEED'])]
+        return range(int(os.environ.get('EQUIVALENCE_CASES', 15)))
+
+    def other_engines(self):
+        return [engine for engine in engines.ENGINES if engine != engines.REFERENCE]
+
+    def compare(self, seed, function, *args, **kwargs):
+        with allow_repeated_queries():
+            expected = engines.call(engines.REFERENCE, function, *args, **kwargs)
+            for engine in self.other_engines():
+                actual = engines.call(engine, function, *args, **kwargs)
+                self.assertResultsEqual(
+                    expected, actual,
+                    f'{engine}.{function}{args!r} {kwargs or ""} differs (EQUIVALENCE_SEED={seed})'
+                )
+
+    def assertResultsEqual(self, expected, actual, msg):
+        if isinstance(expected, dict):
+            # Model instance keys are compared by primary key
+            expected = {getattr(key, 'pk', key): value for key, value in expected.items()}
+            actual = {getattr(key, 'pk', key): value for key, value in actual.items()}
+            self.assertEqual(set(expected), set(actual), msg)
+            for key, value in expected.items():
+                self.assertResultsEqual(value, actual[key], msg)
+        elif isinstance(expected, float):
+            self.assertAlmostEqual(expected, actual, delta=TOLERANCE, msg=msg)
+        else:
+            self.assertEqual(expected, actual, msg)
+
+    def test_engines_agree_with_reference(self):
+        for seed in self.cases():
+            with self.subTest(seed=seed), transaction.atomic():
+                students, courses, los, program_outcomes = build_case(random.Random(seed))
+
+                for student in students:
+                    enrollments = list(student.enrollments.all())
+                    for lo in los:
+                        self.compare(seed, 'calculate_lo_score', lo, student)
+                        for enrollment in enrollments:
+                            if enrollment.course_id == lo.course_id:
+                                self.compare(seed, 'calculate_lo_score', lo, student, enrollment)
+
+                    for po in program_outcomes:
+                        self.compare(seed, 'calculate_po_score', po, student)
+                        for course in courses:
+                            self.compare(seed, 'calculate_po_score', po, student, course)
+
+                    for use_credits in (True, False):
+                        self.compare(seed, 'calculate_all_po_scores', student, use_credits=use_credits)
+                    self.compare(seed, 'get_student_po_summary', student)
+
+                transaction.set_rollback(True)
+
+    def test_cases_cover_the_edge_cases(self):
+        """The generator must keep producing the situations the formulas special-case."""
+        seen = set()
+        for seed in range(15):
+            with transaction.atomic():
+                build_case(random.Random(seed))
+                if Assessment.objects.filter(max_score=0, student_scores__isnull=False).exists():
+                    seen.add('max_score == 0')
+                if StudentAssessmentScore.objects.filter(score=0).exists():
+                    seen.add('zero score')
+                if AssessmentLOMapping.objects.filter(assessment__student_scores__isnull=True).exists():
+                    seen.add('missing score')
+                if Enrollment.objects.filter(course_offering__isnull=True).exists():
+                    seen.add('unlinked enrollment')
+                retaken = Enrollment.objects.filter(status='COMPLETED').values('student', 'course')
+                if len(retaken) != len({(row['student'], row['course']) for row in retaken}):
+                    seen.add('retake')
+                transaction.set_rollback(True)
+        self.assertEqual(seen, {'max_score == 0', 'zero score', 'missing score', 'retake', 'unlinked enrollment'})
+
+
+class SnapshotEquivalenceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(students=15, courses=6, courses_per_student=5, missing_score_rate=0.1, seed=3)
+        # Some unlinked enrollments and scores without a stored normalized value
+        enrollments = list(Enrollment.objects.order_by('pk').values_list('pk', flat=True))
+        Enrollment.objects.filter(pk__in=enrollments[::5]).update(course_offering=None)
+        scores = list(StudentAssessmentScore.objects.order_by('pk').values_list('pk', flat=True))
+        StudentAssessmentScore.objects.filter(pk__in=scores[::7]).update(normalized=None)
+
+    def test_term_results_agree_with_reference(self):
+        completed = Enrollment.objects.filter(status='COMPLETED')
+        # Without retakes a term's enrollment is the latest one of its course,
+        # which is the one the reference reads
+        self.assertEqual(completed.count(), len(set(completed.values_list('student', 'course'))))
+        pos = list(ProgramOutcome.objects.filter(is_active=True))
+
+        terms = 0
+        for year, semester in SYNTHETIC_TERMS:
+            enrollments = list(completed.filter(year=year, semester=semester).select_related('student', 'course'))
+            if not enrollments:
+                continue
+            terms += 1
+            rows = compute_term_results(semester, year)
+            lo_results = {(enrollment_id, lo_id): score for kind, lo_id, _, enrollment_id, score in rows if kind == LO}
+            po_results = {(student_id, po_id): score for kind, po_id, student_id, _, score in rows if kind == PO}
+
+            expected_po = {}
+            with allow_repeated_queries():
+                for enrollment in enrollments:
+                    for lo in LearningOutcome.objects.filter(course=enrollment.course):
+                        self.assertAlmostEqual(
+                            lo_results.get((enrollment.pk, lo.pk), 0.0),
+                            calculate_lo_score(lo, enrollment.student, enrollment),
+                            delta=TOLERANCE, msg=f'LO {lo.pk} of enrollment {enrollment.pk}',
+                        )
+                    for po in pos:
+                        score = calculate_po_score(po, enrollment.student, enrollment.course)
+                        if score > 0:
+                            total = expected_po.setdefault((enrollment.student_id, po.pk), [0.0, 0])
+                            total[0] += score * enrollment.course.credit
+                            total[1] += enrollment.course.credit
+
+            expected_po = {key: total / credits for key, (total, credits) in expected_po.items()}
+            self.assertEqual(set(po_results), set(expected_po), f'{semester} {year}')
+            for key, score in expected_po.items():
+                self.assertAlmostEqual(po_results[key], score, delta=TOLERANCE, msg=f'PO {key} in {semester} {year}')
+        self.assertGreater(terms, 1)
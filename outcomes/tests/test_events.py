@@ -0,0 +1,110 @@
+import json
+import threading
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from outcomes.events import ChangeNotifier, notifier
+from outcomes.models import StudentAssessmentScore
+from outcomes.term_close import complete_enrollments
+
+from .fixtures import build_dataset
+
+
+def read_events(response):
+    """Parse a finished SSE body into ``[(event, data), ...]``."""
+    body = b''.join(response.streaming_content).decode()
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class ChangeNotifierTests(APITestCase):
+
+    def test_wait_returns_only_newer_events(self):
+        changes = ChangeNotifier()
+        first = changes.publish({'n': 1})
+        changes.publish({'n': 2})
+        self.assertEqual([event for _, event in changes.wait(first, timeout=0)], [{'n': 2}])
+        self.assertEqual(changes.wait(changes.cursor(), timeout=0), [])
+
+    def test_wait_wakes_up_on_publish(self):
+        changes = ChangeNotifier()
+        timer = threading.Timer(0.05, changes.publish, args=[{'n': 1}])
+        timer.start()
+        self.assertEqual(changes.wait(0, timeout=5), [(1, {'n': 1})])
+        timer.join()
+
+
+@override_settings(SSE_HEARTBEAT=0.05, SSE_MAX_DURATION=0.2)
+class StreamTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        cls.student = cls.data['students'][0]
+        cls.offering = cls.data['CS101']['offering']
+
+    def update_score(self, value):
+        score = StudentAssessmentScore.objects.get(
+            student=self.student, assessment=self.data['CS101']['assessments'][0]
+        )
+        score.score = value
+        with self.captureOnCommitCallbacks(execute=True):
+            score.save()
+        return score
+
+    def test_offering_stream_sends_score_and_lo_delta(self):
+        response = self.client.get(f'/api/stream/offerings/{self.offering.pk}/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        score = self.update_score(90)
+        self.update_score(90)
+
+        events = read_events(response)
+        names = [name for name, _ in events]
+        self.assertEqual(names, ['score', 'lo_scores', 'score'])
+        self.assertEqual(events[0][1]['id'], score.pk)
+        self.assertEqual(events[1][1]['enrollment_id'], score.enrollment_id)
+
+    def test_offering_stream_ignores_other_offerings(self):
+        other = self.data['CS201']['offering']
+        response = self.client.get(f'/api/stream/offerings/{other.pk}/')
+        self.update_score(90)
+        self.assertEqual(read_events(response), [])
+
+    def test_student_stream_sends_po_delta(self):
+        response = self.client.get(f'/api/stream/students/{self.student.pk}/')
+        self.update_score(100)
+        events = dict(read_events(response))
+        self.assertIn('po_scores', events)
+        self.assertEqual(events['po_scores']['student_id'], self.student.pk)
+
+    def test_resume_from_last_event_id(self):
+        cursor = notifier.cursor()
+        self.update_score(95)
+        response = self.client.get(
+            f'/api/stream/students/{self.student.pk}/', HTTP_LAST_EVENT_ID=str(cursor)
+        )
+        self.assertIn('score', [name for name, _ in read_events(response)])
+
+    def test_bulk_writes_reach_streams(self):
+        response = self.client.get(f'/api/stream/offerings/{self.offering.pk}/')
+        scores = StudentAssessmentScore.objects.filter(student=self.student, assessment__course_offering=self.offering)
+        with self.captureOnCommitCallbacks(execute=True):
+            scores.update(score=50)
+        events = read_events(response)
+        self.assertEqual([name for name, _ in events], ['score', 'lo_scores', 'score'])
+        self.assertEqual({data['id'] for name, data in events if name == 'score'}, {score.pk for score in scores})
+
+        # Carol's enrollments only count towards her POs once the term closes
+        carol = self.data['students'][2]
+        response = self.client.get(f'/api/stream/students/{carol.pk}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            complete_enrollments('FALL', 2024)
+        self.assertIn('po_scores', [name for name, _ in read_events(response)])
+
+    def test_unknown_offering(self):
+        self.assertEqual(self.client.get('/api/stream/offerings/999999/').status_code, 404)
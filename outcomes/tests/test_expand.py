@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from outcomes.models import Assessment, AssessmentLOMapping, CourseOffering, LearningOutcome
+
+from .fixtures import build_dataset
+
+
+class ExpandTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def count_queries(self, url, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return len(ctx.captured_queries), response
+
+    def add_rows(self, year):
+        """Add another offering with assessments and LOs to grow every list."""
+        course = self.data['courses'][0]
+        offering = CourseOffering.objects.create(
+            course=course, professor=self.data['professor'], semester='SPRING', year=year
+        )
+        for i in range(3):
+            lo = LearningOutcome.objects.create(
+                course=course, code=f'CLO-{year}-{i}', description='extra', bloom_level='CREATE'
+            )
+            assessment = Assessment.objects.create(
+                course_offering=offering, name=f'Quiz {i}', assessment_type='QUIZ',
+                max_score=10, weight_percentage=5,
+            )
+            assessment.learning_outcomes.add(lo, self.data['CS101']['lo'])
+            AssessmentLOMapping.objects.create(assessment=assessment, learning_outcome=lo, contribution_percentage=10)
+
+    def test_expanded_ids_are_replaced_by_objects(self):
+        _, response = self.count_queries('/api/offerings/', {'expand': 'course,professor'})
+        row = response.data['results'][0]
+        self.assertEqual(row['professor']['email'], 'prof@example.edu')
+        self.assertIn(row['course']['code'], {'CS101', 'CS201'})
+        # Method fields are not rendered for expanded objects
+        self.assertNotIn('prerequisite_codes', row['course'])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        cases = [
+            ('/api/offerings/', 'course,professor'),
+            ('/api/assessments/', 'course_offering.course,course_offering.professor,learning_outcomes.course'),
+            ('/api/assessment-lo-mappings/', 'assessment.learning_outcomes,learning_outcome.plo'),
+            ('/api/courses/', 'prerequisites,learning_outcomes'),
+            ('/api/professors/', 'course_offerings.course'),
+        ]
+        # Populate every relation first so no prefetch is skipped for lack of rows
+        self.add_rows(2025)
+        before = {url: self.count_queries(url, {'expand': expand})[0] for url, expand in cases}
+        self.add_rows(2026)
+        after = {url: self.count_queries(url, {'expand': expand})[0] for url, expand in cases}
+        self.assertEqual(before, after)
+
+    def test_unknown_expansion_is_rejected(self):
+        response = self.client.get('/api/offerings/', {'expand': 'course.nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expand', response.data)
+
+    def test_expand_falls_back_from_values_path(self):
+        _, response = self.count_queries('/api/student-scores/', {'expand': 'enrollment.course'})
+        row = response.data['results'][0]
+        self.assertIsInstance(row['enrollment'], dict)
+        self.assertIsInstance(row['enrollment']['course'], dict)
+        self.assertNotIn('lo_scores', row['enrollment'])
@@ -0,0 +1,46 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from outcomes.models import Enrollment, StudentAssessmentScore
+from outcomes.serializers import (
+    EnrollmentSerializer,
+    EnrollmentValuesSerializer,
+    StudentAssessmentScoreSerializer,
+    StudentAssessmentScoreValuesSerializer,
+)
+
+from .fixtures import build_dataset
+
+
+class ValuesSerializerTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        build_dataset()
+
+    def assertRendersIdentically(self, serializer_class, values_serializer_class, queryset):
+        renderer = JSONRenderer()
+        expected = renderer.render(serializer_class(queryset, many=True).data)
+        fast = values_serializer_class()
+        actual = renderer.render(fast.serialize(fast.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_enrollments_render_identically(self):
+        self.assertRendersIdentically(
+            EnrollmentSerializer, EnrollmentValuesSerializer,
+            Enrollment.objects.select_related('student', 'course'),
+        )
+
+    def test_student_scores_render_identically(self):
+        StudentAssessmentScore.objects.filter(pk=StudentAssessmentScore.objects.first().pk).update(score=0)
+        self.assertRendersIdentically(
+            StudentAssessmentScoreSerializer, StudentAssessmentScoreValuesSerializer,
+            StudentAssessmentScore.objects.select_related('student', 'assessment', 'enrollment__course'),
+        )
+
+    def test_list_endpoint_uses_values_rows(self):
+        response = self.client.get('/api/student-scores/', {'ordering': 'score'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], StudentAssessmentScore.objects.count())
+        scores = [row['score'] for row in response.data['results']]
+        self.assertEqual(scores, sorted(scores))
@@ -0,0 +1,129 @@
+import time
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from outcomes.grading import GRADE_CUTOFFS, grade_cutoffs, grade_offering, letter_grades
+from outcomes.models import Assessment, CourseOffering, Enrollment, StudentAssessmentScore
+from outcomes.nplusone import allow_repeated_queries
+from students.models import Student
+from .fixtures import build_dataset
+
+
+class GradingTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.alice, self.bob, self.carol = self.data['students']
+        self.offering = self.data['CS101']['offering']
+
+    def grades(self):
+        return dict(
+            Enrollment.objects.filter(course_offering=self.offering).values_list('student_id', 'grade')
+        )
+
+    def test_grades_offering(self):
+        # Alice and Bob completed the course, Carol is still active
+        results, updated = grade_offering(self.offering)
+        # Weighted totals: Alice 70, Bob 80
+        self.assertEqual(sorted(total for total, _ in results.values()), [70.0, 80.0])
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.grades(), {self.alice.pk: 'CC', self.bob.pk: 'BB', self.carol.pk: None})
+        # Other offerings are left alone
+        self.assertFalse(Enrollment.objects.exclude(course_offering=self.offering).exclude(grade=None).exists())
+
+        # Nothing changed, nothing written
+        self.assertEqual(grade_offering(self.offering)[1], 0)
+
+        Enrollment.objects.filter(course_offering=self.offering, student=self.bob).update(status='DROPPED')
+        with allow_repeated_queries():
+            # Active enrollments only on request: Carol's total is 90
+            results, updated = grade_offering(self.offering, include_active=True)
+        self.assertEqual((len(results), updated), (2, 1))
+        self.assertEqual(self.grades()[self.carol.pk], 'AA')
+
+    def test_cut_points(self):
+        self.assertEqual(grade_cutoffs(), [(float(minimum), grade) for minimum, grade in GRADE_CUTOFFS])
+        cutoffs = grade_cutoffs({'AA': 95, 'BA': 88})
+        self.assertEqual(
+            letter_grades({'a': 94.9, 'b': 95, 'c': 87.5, 'd': -1}, cutoffs),
+            {'a': 'BA', 'b': 'AA', 'c': 'BB', 'd': 'FF'},
+        )
+        for overrides in ({'AA': 84}, {'A': 90}, {'AA': 'high'}, {'AA': 120}, ['AA']):
+            with self.assertRaises(ValueError):
+                grade_cutoffs(overrides)
+
+        lowered = [(minimum - 10, grade) for minimum, grade in GRADE_CUTOFFS[:-1]] + [(0, 'FF')]
+        with override_settings(GRADE_CUTOFFS=lowered):
+            grade_offering(self.offering, include_active=True)
+        self.assertEqual(self.grades(), {self.alice.pk: 'BB', self.bob.pk: 'AA', self.carol.pk: 'AA'})
+
+    def test_endpoint(self):
+        url = reverse('offering-compute-grades', args=[self.offering.pk])
+        response = self.client.post(url, {'cutoffs': {'AA': 95}}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['graded'], response.data['updated']), (2, 2))
+        self.assertEqual(response.data['cutoffs']['AA'], 95)
+        self.assertEqual([row['grade'] for row in response.data['grades']], ['CC', 'BB'])
+        self.assertIsNone(self.grades()[self.carol.pk])
+
+        # Form data sends the flag as a string
+        response = self.client.post(url, {'include_active': 'false'})
+        self.assertEqual(response.data['graded'], 2)
+        self.assertIsNone(self.grades()[self.carol.pk])
+        self.assertEqual(self.client.post(url, {'include_active': 'maybe'}).status_code, 400)
+
+        response = self.client.post(url, {'cutoffs': {'AA': 95}, 'include_active': True}, format='json')
+        self.assertEqual((response.data['graded'], response.data['updated']), (3, 1))
+        self.assertEqual([row['grade'] for row in response.data['grades']], ['CC', 'BB', 'BA'])
+
+        response = self.client.post(url, {'cutoffs': {'BA': 99}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('BA', response.data['error'])
+        response = self.client.post(reverse('offering-compute-grades', args=[0]), {}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_large_offering(self):
+        offering = CourseOffering.objects.create(
+            course=self.data['courses'][0], professor=self.data['professor'], semester='SPRING', year=2025
+        )
+        assessments = [
+            Assessment.objects.create(
+                course_offering=offering, name=name, assessment_type='EXAM', max_score=100, weight_percentage=weight,
+            )
+            for name, weight in [('Midterm', 30), ('Final', 40), ('Project', 20), ('Quiz', 10)]
+        ]
+        students = Student.objects.bulk_create([
+            Student(name=f'Student {i}', student_number=f'L{i:05d}', email=f'l{i}@example.edu', enrollment_year=2024)
+            for i in range(1000)
+        ])
+        enrollments = Enrollment.objects.bulk_create([
+            Enrollment(
+                student=student, course=offering.course, course_offering=offering, semester='SPRING', year=2025,
+                status='COMPLETED',
+            )
+            for student in students
+        ])
+        StudentAssessmentScore.objects.bulk_create([
+            StudentAssessmentScore(
+                student_id=enrollment.student_id, enrollment=enrollment, assessment=assessment,
+                score=(i * 7 + j * 13) % 101,
+            )
+            for i, enrollment in enumerate(enrollments)
+            for j, assessment in enumerate(assessments)
+        ], batch_size=2000)
+
+        started = time.perf_counter()
+        results, updated = grade_offering(offering)
+        elapsed = time.perf_counter() - started
+        self.assertEqual((len(results), updated), (1000, 1000))
+        self.assertLess(elapsed, 1.0)
+
+        first = enrollments[0]
+        total = sum((j * 13) % 101 * weight / 100 for j, weight in enumerate([30, 40, 20, 10]))
+        self.assertAlmostEqual(results[first.pk][0], total)
+        self.assertEqual(Enrollment.objects.get(pk=first.pk).grade, results[first.pk][1])
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .fixtures import build_dataset
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for part in header.split(', '):
+        name, *params = part.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+class RequestMetricsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, 'metrics.log')
+        override = override_settings(REQUEST_METRICS_LOG=self.log)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/enrollments/')
+        timing = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(timing), {'db', 'serializer', 'calc', 'total'})
+        queries = int(timing['db']['desc'].strip('"').split()[0])
+        self.assertGreater(queries, 0)
+        self.assertGreater(float(timing['calc']['dur']), 0)
+
+    def test_log_and_report(self):
+        for _ in range(3):
+            self.client.get('/api/learning-outcomes/')
+        self.client.post(
+            '/api/student-scores/student_po_summary/',
+            {'student_id': self.data['students'][0].pk}, format='json'
+        )
+
+        with open(self.log) as handle:
+            entries = [json.loads(line) for line in handle]
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(entries[0]['view'], 'learning-outcome-list')
+
+        out = StringIO()
+        call_command('request_metrics_report', '--json', '--sort', 'requests', stdout=out)
+        rows = json.loads(out.getvalue())
+        self.assertEqual(rows[0]['view'], 'GET learning-outcome-list')
+        self.assertEqual(rows[0]['requests'], 3)
+        self.assertEqual(rows[1]['view'], 'POST student-score-student-po-summary')
@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from outcomes.models import Assessment, StudentAssessmentScore
+from .fixtures import build_dataset
+
+
+class NormalizedScoreTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.midterm, self.final = self.data['CS101']['assessments']
+        self.score = StudentAssessmentScore.objects.filter(assessment=self.final).order_by('score').first()
+
+    def normalized(self, assessment):
+        return sorted(StudentAssessmentScore.objects.filter(assessment=assessment).values_list('normalized', flat=True))
+
+    def test_stored_on_create_and_save(self):
+        # Final is out of 50: 35, 40 and 45 points
+        self.assertEqual(self.normalized(self.final), [70.0, 80.0, 90.0])
+        self.score.score = 20
+        self.score.save(update_fields=['score'])
+        self.score.refresh_from_db()
+        self.assertEqual(self.score.normalized, 40.0)
+        self.assertEqual(self.score.normalized_score(), 40.0)
+
+    def test_kept_in_step_on_bulk_writes(self):
+        scores = list(StudentAssessmentScore.objects.filter(assessment=self.final))
+        for score in scores:
+            score.score = 25
+        StudentAssessmentScore.objects.bulk_update(scores, ['score'])
+        self.assertEqual(self.normalized(self.final), [50.0, 50.0, 50.0])
+
+        StudentAssessmentScore.objects.filter(assessment=self.final).update(score=10)
+        self.assertEqual(self.normalized(self.final), [20.0, 20.0, 20.0])
+
+        # Moving a score onto the midterm (out of 100) uses the new maximum
+        StudentAssessmentScore.objects.filter(pk=self.score.pk).update(assessment=self.data['CS201']['assessments'][0])
+        self.assertEqual(StudentAssessmentScore.objects.get(pk=self.score.pk).normalized, 10.0)
+
+    def test_max_score_change_refreshes_scores(self):
+        self.final.max_score = 100
+        self.final.save()
+        self.assertEqual(self.normalized(self.final), [35.0, 40.0, 45.0])
+
+        # Saving other fields does not rewrite the scores
+        with CaptureQueriesContext(connection) as ctx:
+            self.final.save(update_fields=['name'])
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        # Plus the change feed's read of the scores and its INSERT, and the
+        # stream events' read of the scores
+        with CaptureQueriesContext(connection) as ctx:
+            Assessment.objects.filter(pk=self.final.pk).update(max_score=40)
+        self.assertEqual(len(ctx.captured_queries), 6)
+        self.assertEqual(self.normalized(self.final), [87.5, 100.0, 112.5])
+
+    def test_score_statistics(self):
+        response = self.client.get(reverse('assessment-score-statistics', args=[self.final.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['scored_students'], 3)
+        self.assertAlmostEqual(response.data['avg_normalized'], 80.0)
+        self.assertEqual(response.data['min_normalized'], 70.0)
+        self.assertEqual(response.data['max_normalized'], 90.0)
+        self.assertEqual(response.data['below_50'], 0)
+
+        response = self.client.get(reverse('assessment-score-statistics', args=[0]))
+        self.assertEqual(response.status_code, 404)
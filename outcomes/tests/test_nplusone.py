@@ -0,0 +1,146 @@
+import io
+import unittest
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.test.runner import DebugSQLTextTestResult, PDBDebugResult, RemoteTestResult
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from outcomes.models import Enrollment, ProgramLearningOutcome, StudentPLOAchievement, calculate_lo_score
+from outcomes.nplusone import (
+    DetectingResultMixin,
+    NPlusOneError,
+    NPlusOneTestRunner,
+    allow_repeated_queries,
+    detect_queries,
+)
+
+from .fixtures import build_dataset
+
+
+def load_courses(ids):
+    return [Course.objects.get(pk=pk).code for pk in ids]
+
+
+class DetectorTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        cls.course_ids = [course.pk for course in cls.data['courses']] * 2
+
+    def test_raise_mode(self):
+        with detect_queries('raise') as scope:
+            with self.assertRaises(NPlusOneError) as raised:
+                load_courses(self.course_ids)
+        self.assertIn('courses_course', scope.reported[0])
+        # The stack points at the code issuing the query
+        self.assertIn('load_courses', str(raised.exception))
+
+    def test_log_mode(self):
+        with self.assertLogs('outcomes.nplusone', level='WARNING'):
+            with detect_queries('log'):
+                load_courses(self.course_ids)
+
+    def test_in_lists_share_a_fingerprint(self):
+        with detect_queries('log') as scope:
+            with self.assertLogs('outcomes.nplusone'):
+                for size in range(1, 4):
+                    list(Course.objects.filter(pk__in=self.course_ids[:size]))
+        self.assertEqual(len(scope.reported), 1)
+
+    def test_allowed_block_and_writes_are_ignored(self):
+        with detect_queries('raise') as scope:
+            with allow_repeated_queries():
+                load_courses(self.course_ids)
+            for i in range(4):
+                Course.objects.create(name=f'Elective {i}', code=f'EL{i}', credit=3)
+        self.assertEqual(scope.reported, [])
+
+
+class RunnerTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def test_every_result_class_detects(self):
+        for options, base in [
+            ({}, unittest.TextTestResult),
+            ({'debug_sql': True}, DebugSQLTextTestResult),
+            ({'pdb': True}, PDBDebugResult),
+        ]:
+            with self.subTest(**options):
+                resultclass = NPlusOneTestRunner(**options).get_resultclass()
+                self.assertTrue(issubclass(resultclass, base))
+                self.assertTrue(issubclass(resultclass, DetectingResultMixin))
+        # --parallel workers
+        resultclass = NPlusOneTestRunner.parallel_test_suite.runner_class.resultclass
+        self.assertTrue(issubclass(resultclass, RemoteTestResult))
+        self.assertTrue(issubclass(resultclass, DetectingResultMixin))
+
+    @override_settings(NPLUSONE_THRESHOLD=2)
+    def test_result_reports_repeated_queries(self):
+        # Loops in test modules are not reported, so one in project code: a
+        # score read per assessment mapped to the LO
+        data = self.data
+
+        class Inner(unittest.TestCase):
+            def test_loop(self):
+                calculate_lo_score(data['CS101']['lo'], data['students'][0])
+
+        result = NPlusOneTestRunner(debug_sql=True).get_resultclass()(io.StringIO(), descriptions=False, verbosity=0)
+        Inner('test_loop').run(result)
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn('NPlusOneError', result.errors[0][1])
+
+
+@override_settings(NPLUSONE_MODE='raise')
+class EndpointTests(APITestCase):
+    """Endpoints that used to query once per row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        cs101, cs201 = cls.data['courses']
+        for i in range(3):
+            course = Course.objects.create(name=f'Course {i}', code=f'CS3{i:02d}', credit=3)
+            course.prerequisites.add(cs101, cs201)
+
+    def test_score_course_codes(self):
+        student = self.data['students'][0]
+        response = self.client.get('/api/student-scores/by_student/', {'student_id': student.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({score['course_code'] for score in response.json()}, {'CS101', 'CS201'})
+
+    def test_course_prerequisite_codes(self):
+        response = self.client.get('/api/courses/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][-1]['prerequisite_codes'], ['CS101', 'CS201'])
+
+    def test_enrollment_lists(self):
+        for path in ['/api/enrollments/', '/api/enrollments/by_student/']:
+            response = self.client.get(path, {'student_id': self.data['students'][0].pk})
+            self.assertEqual(response.status_code, 200)
+
+    def test_browsable_api_forms(self):
+        for path in ['/api/student-scores/', '/api/achievements/', '/api/assessment-lo-mappings/']:
+            response = self.client.get(path, HTTP_ACCEPT='text/html')
+            self.assertEqual(response.status_code, 200, path)
+
+    def test_admin_changelists(self):
+        plo = ProgramLearningOutcome.objects.create(number=1, description='...', short_name='Knowledge')
+        for enrollment in Enrollment.objects.all():
+            StudentPLOAchievement.objects.create(
+                student=enrollment.student, plo=plo, enrollment=enrollment,
+                achievement_level='ACHIEVED', score=75,
+            )
+        User.objects.create_superuser('admin', 'admin@example.edu', 'password')
+        self.client.login(username='admin', password='password')
+        for model in [
+            'enrollment', 'studentploachievement', 'studentassessmentscore',
+            'assessment', 'assessmentlomapping', 'lopomapping',
+        ]:
+            response = self.client.get(f'/admin/outcomes/{model}/')
+            self.assertEqual(response.status_code, 200, model)
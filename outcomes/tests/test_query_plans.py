@@ -0,0 +1,92 @@
+"""
+EXPLAIN QUERY PLAN checks for the lookups the calculation engines repeat
+per LO, per PO and per course. Each must be answered from an index; a
+``SCAN`` of the table means an index was dropped or a filter changed shape.
+"""
+from django.db import connection
+from django.test import TestCase
+
+from outcomes import engines
+from outcomes.models import AssessmentLOMapping, Enrollment, LOPOMapping, StudentAssessmentScore
+from outcomes.nplusone import allow_repeated_queries
+from .fixtures import build_dataset
+
+
+HOT_TABLES = {
+    model._meta.db_table
+    for model in (Enrollment, StudentAssessmentScore, AssessmentLOMapping, LOPOMapping)
+}
+
+
+def explain(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def query_plan(queryset):
+    return explain(*queryset.query.sql_with_params())
+
+
+class QueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def assertUsesIndex(self, queryset, index, covering=False):
+        plan = query_plan(queryset)
+        table = queryset.model._meta.db_table
+        expected = f'SEARCH {table} USING {"COVERING " if covering else ""}INDEX {index} '
+        self.assertTrue(any(step.startswith(expected) for step in plan), plan)
+        self.assertFalse([step for step in plan if step.startswith(f'SCAN {table}')], plan)
+        return plan
+
+    def test_latest_completed_enrollment(self):
+        student = self.data['students'][0]
+        course = self.data['courses'][0]
+        queryset = Enrollment.objects.filter(
+            student=student, course=course, status='COMPLETED'
+        ).order_by('-term_key')[:1]
+        plan = self.assertUsesIndex(queryset, 'enrollment_latest_idx')
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_scores_of_an_enrollment(self):
+        student = self.data['students'][0]
+        enrollment = student.enrollments.first()
+        queryset = StudentAssessmentScore.objects.filter(
+            student=student, enrollment=enrollment,
+            assessment_id__in=[assessment.pk for assessment in self.data['CS101']['assessments']],
+        ).only('assessment_id', 'normalized').order_by()
+        self.assertUsesIndex(queryset, 'score_by_enrollment_idx', covering=True)
+
+    def test_assessment_mappings_of_an_lo(self):
+        queryset = AssessmentLOMapping.objects.filter(learning_outcome=self.data['CS101']['lo'])
+        self.assertUsesIndex(queryset, 'assessment_lo_by_lo_idx', covering=True)
+
+    def test_lo_mappings_of_a_po(self):
+        queryset = LOPOMapping.objects.filter(program_outcome=self.data['po'])
+        self.assertUsesIndex(queryset, 'lo_po_by_po_idx', covering=True)
+
+    def test_engine_queries_never_scan_hot_tables(self):
+        captured = []
+
+        def capture(execute, sql, params, many, context):
+            captured.append((sql, params))
+            return execute(sql, params, many, context)
+
+        student = self.data['students'][0]
+        with connection.execute_wrapper(capture), allow_repeated_queries():
+            for engine in engines.ENGINES:
+                engines.call(engine, 'get_student_po_summary', student)
+                engines.call(engine, 'calculate_all_po_scores', student, use_credits=False)
+                engines.call(engine, 'calculate_lo_score', self.data['CS101']['lo'], student)
+
+        selects = {(sql, tuple(params or ())) for sql, params in captured if sql.startswith('SELECT')}
+        self.assertTrue(selects)
+        for sql, params in selects:
+            scans = [
+                step for step in explain(sql, params)
+                if any(step.startswith(f'SCAN {table}') for table in HOT_TABLES)
+            ]
+            self.assertEqual(scans, [], sql)
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from outcomes.management.commands.replay_requests import percentile
+from .fixtures import build_dataset
+
+
+class RequestRecorderTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, 'requests.jsonl')
+        override = override_settings(REQUEST_RECORDER_LOG=self.log)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(self.tmp.cleanup)
+
+    def read_log(self):
+        with open(self.log) as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_records_requests(self):
+        student = self.data['students'][0]
+        self.client.get('/api/enrollments/', {'status': 'COMPLETED', 'year': ['2023', '2024']})
+        self.client.post('/api/student-scores/student_po_summary/', {'student_id': student.pk}, format='json')
+
+        first, second = self.read_log()
+        self.assertEqual(first['method'], 'GET')
+        self.assertEqual(first['path'], '/api/enrollments/')
+        self.assertEqual(first['params'], {'status': ['COMPLETED'], 'year': ['2023', '2024']})
+        self.assertIsNone(first['body'])
+        self.assertEqual(first['view'], 'enrollment-list')
+        self.assertEqual(second['method'], 'POST')
+        self.assertEqual(json.loads(second['body']), {'student_id': student.pk})
+        self.assertEqual(second['content_type'], 'application/json')
+        self.assertEqual(second['status'], 200)
+        self.assertNotEqual(first['request_id'], second['request_id'])
+
+    @override_settings(REQUEST_RECORDER_EXCLUDE=['/api/enrollments/'])
+    def test_excluded_paths_are_not_recorded(self):
+        self.client.get('/api/enrollments/')
+        self.client.get('/api/courses/')
+        self.assertEqual([entry['path'] for entry in self.read_log()], ['/api/courses/'])
+
+    def test_replay(self):
+        student = self.data['students'][0]
+        self.client.get('/api/enrollments/')
+        self.client.get('/api/courses/')
+        self.client.post('/api/student-scores/student_po_summary/', {'student_id': student.pk}, format='json')
+        with open(self.log, 'a') as handle:
+            handle.write('{"method": "GET"}\n')
+        output = os.path.join(self.tmp.name, 'results.json')
+
+        out = StringIO()
+        call_command(
+            'replay_requests', self.log, concurrency=1, repeat=2, host='testserver',
+            include_writes=True, output=output, stdout=out,
+        )
+        self.assertIn('1 lines skipped', out.getvalue())
+        with open(output) as handle:
+            report = json.load(handle)
+        self.assertEqual(report['requests'], 6)
+        endpoints = {row['endpoint']: row for row in report['endpoints']}
+        self.assertEqual(
+            set(endpoints),
+            {'GET enrollment-list', 'GET course-list', 'POST student-score-student-po-summary'}
+        )
+        for row in endpoints.values():
+            self.assertEqual(row['requests'], 2)
+            self.assertEqual(row['errors'], 0)
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+        # Replayed requests are not recorded again
+        self.assertEqual(len(self.read_log()), 4)
+
+    def test_replay_skips_writes_by_default(self):
+        self.client.post('/api/student-scores/student_po_summary/', {'student_id': 0}, format='json')
+        with self.assertRaises(CommandError):
+            call_command('replay_requests', self.log, concurrency=1, host='testserver', stdout=StringIO())
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
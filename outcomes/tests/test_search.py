@@ -0,0 +1,84 @@
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from outcomes.models import Assessment, LearningOutcome, ProgramOutcome
+from outcomes.search import SEARCH_INDEXES, fts_table
+
+from .fixtures import build_dataset
+
+
+def results(response):
+    data = response.json()
+    return data['results'] if isinstance(data, dict) else data
+
+
+class FullTextSearchTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        ProgramOutcome.objects.create(
+            code='PO-B', title='Teamwork', description='Function effectively on multidisciplinary teams'
+        )
+        ProgramOutcome.objects.create(
+            code='PO-C', title='Team communication',
+            description='Communicate with teams; teams of engineers and teams of managers'
+        )
+
+    def search(self, path, term, **params):
+        return results(self.client.get(path, {'search': term, **params}))
+
+    def test_matches_icontains_semantics(self):
+        for term in ['team', 'TEAM', 'ngineer', 'effectively team', 'PO-B']:
+            expected = set(
+                po.code for po in ProgramOutcome.objects.all()
+                if all(
+                    any(word.lower() in value.lower() for value in (po.code, po.title, po.description))
+                    for word in term.split()
+                )
+            )
+            found = {po['code'] for po in self.search('/api/program-outcomes/', term)}
+            self.assertEqual(found, expected, term)
+
+    def test_results_are_ranked(self):
+        codes = [po['code'] for po in self.search('/api/program-outcomes/', 'teams')]
+        self.assertEqual(codes, ['PO-C', 'PO-B'])
+        codes = [po['code'] for po in self.search('/api/program-outcomes/', 'teams', ordering='code')]
+        self.assertEqual(codes, ['PO-B', 'PO-C'])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        codes = {po['code'] for po in self.search('/api/program-outcomes/', 'te B')}
+        self.assertEqual(codes, {'PO-B'})
+
+    def test_index_follows_writes(self):
+        lo = self.data['CS101']['lo']
+        self.assertEqual(len(self.search('/api/learning-outcomes/', 'Intro to')), 1)
+
+        Course.objects.filter(pk=lo.course_id).update(name='Programming Basics')
+        self.assertEqual(self.search('/api/learning-outcomes/', 'Intro to'), [])
+        self.assertEqual(len(self.search('/api/learning-outcomes/', 'basics')), 1)
+
+        LearningOutcome.objects.filter(pk=lo.pk).update(description='Design recursive algorithms')
+        self.assertEqual([item['id'] for item in self.search('/api/learning-outcomes/', 'recursive')], [lo.pk])
+
+        lo.delete()
+        self.assertEqual(self.search('/api/learning-outcomes/', 'recursive'), [])
+
+    def test_assessment_rubric_and_course_code(self):
+        midterm = self.data['CS201']['assessments'][0]
+        Assessment.objects.filter(pk=midterm.pk).update(rubric='Full marks for amortized analysis')
+        self.assertEqual([a['id'] for a in self.search('/api/assessments/', 'amortized')], [midterm.pk])
+        self.assertEqual(len(self.search('/api/assessments/', 'CS201 final')), 1)
+
+    def test_uses_shadow_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {fts_table(ProgramOutcome._meta.db_table)}")
+            self.assertEqual(cursor.fetchone()[0], ProgramOutcome.objects.count())
+
+            # Every trigger sits on the table it indexes
+            cursor.execute("SELECT name, tbl_name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_%'")
+            triggers = cursor.fetchall()
+        self.assertEqual(len(triggers), 3 * len(SEARCH_INDEXES))
+        for name, table in triggers:
+            self.assertTrue(name.startswith(fts_table(table)), name)
@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from outcomes.models import (
+    StudentAssessmentScore,
+    TermResult,
+    TermSnapshot,
+    calculate_all_po_scores,
+    calculate_lo_score,
+)
+from outcomes.nplusone import allow_repeated_queries
+from outcomes.snapshots import TermFrozenError, freeze_term, term_results
+from .fixtures import build_dataset
+
+
+class TermSnapshotTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.alice, self.bob, self.carol = self.data['students']
+        self.po = self.data['po']
+
+    def test_matches_live_calculations(self):
+        snapshot = freeze_term('FALL', 2024)
+        results = {
+            (kind, outcome_id, student_id): score
+            for kind, outcome_id, student_id, score in snapshot.results.values_list(
+                'kind', 'outcome_id', 'student_id', 'score'
+            )
+        }
+        with allow_repeated_queries():
+            for student in (self.alice, self.bob):
+                po_scores = calculate_all_po_scores(student)
+                self.assertAlmostEqual(results['PO', self.po.pk, student.pk], po_scores[self.po])
+                for code in ('CS101', 'CS201'):
+                    lo = self.data[code]['lo']
+                    self.assertAlmostEqual(results['LO', lo.pk, student.pk], calculate_lo_score(lo, student))
+        # Carol's enrollments are still active
+        self.assertFalse(any(student_id == self.carol.pk for _, _, student_id in results))
+
+        po_summary = snapshot.summary['PO'][0]
+        self.assertEqual((po_summary['code'], po_summary['students']), ('PO-A', 2))
+
+    def test_frozen_term_ignores_later_changes(self):
+        before = term_results('FALL', 2024, student_id=self.alice.pk)
+        self.assertFalse(before['frozen'])
+        freeze_term('FALL', 2024)
+
+        StudentAssessmentScore.objects.filter(student=self.alice).update(score=0)
+        frozen = term_results('FALL', 2024, student_id=self.alice.pk)
+        self.assertTrue(frozen['frozen'])
+        self.assertEqual((frozen['summary'], frozen['results']), (before['summary'], before['results']))
+
+        response = self.client.get(
+            reverse('term-outcomes', args=['fall', 2024]), {'student_id': self.alice.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['frozen'])
+        self.assertEqual(response.data['results'], before['results'])
+
+    def test_snapshots_are_immutable(self):
+        snapshot = freeze_term('FALL', 2024)
+        with self.assertRaises(TermFrozenError):
+            freeze_term('FALL', 2024)
+        with self.assertRaises(ValueError):
+            snapshot.save()
+        with self.assertRaises(ValueError):
+            snapshot.results.first().save()
+
+        StudentAssessmentScore.objects.filter(student=self.alice).update(score=0)
+        out = StringIO()
+        # Each attempt looks the term up again
+        with allow_repeated_queries():
+            with self.assertRaises(CommandError):
+                call_command('freeze_term', 'FALL', '2024', stdout=StringIO())
+            call_command('freeze_term', 'fall', '2024', '--replace', stdout=out)
+        self.assertIn('Froze FALL 2024', out.getvalue())
+        self.assertEqual(TermSnapshot.objects.count(), 1)
+        # Alice scored 0 everywhere, so only Bob has positive PO results left
+        self.assertEqual(list(TermResult.objects.filter(kind='PO').values_list('student_id', flat=True)), [self.bob.pk])
+
+    def test_invalid_term(self):
+        response = self.client.get(reverse('term-outcomes', args=['WINTER', 2024]))
+        self.assertEqual(response.status_code, 400)
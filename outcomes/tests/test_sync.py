@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from outcomes.models import Enrollment, StudentAssessmentScore, Tombstone
+from students.models import Student
+from .fixtures import build_dataset
+
+
+class UpdatedAtTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.cs101 = self.data['courses'][0]
+        self.past = timezone.now() - timedelta(days=1)
+        # Everything the fixtures created counts as long unchanged
+        for model in (Course, Enrollment, Student, StudentAssessmentScore):
+            model.objects.update(updated_at=self.past)
+
+    def updated(self, model):
+        return set(model.objects.filter(updated_at__gt=self.past).values_list('pk', flat=True))
+
+    def test_bumped_on_save(self):
+        enrollment = Enrollment.objects.filter(course=self.cs101).first()
+        enrollment.grade = 'BA'
+        enrollment.save(update_fields=['grade'])
+        self.assertEqual(self.updated(Enrollment), {enrollment.pk})
+
+        self.cs101.name = 'Introduction to CS'
+        self.cs101.save()
+        self.assertEqual(self.updated(Course), {self.cs101.pk})
+
+    def test_bumped_on_bulk_writes(self):
+        scores = list(StudentAssessmentScore.objects.filter(enrollment__course=self.cs101))
+        for score in scores:
+            score.feedback = 'Reviewed'
+        StudentAssessmentScore.objects.bulk_update(scores, ['feedback'])
+        self.assertEqual(self.updated(StudentAssessmentScore), {score.pk for score in scores})
+
+        Enrollment.objects.filter(course=self.cs101).update(grade='AA')
+        self.assertEqual(
+            self.updated(Enrollment), set(Enrollment.objects.filter(course=self.cs101).values_list('pk', flat=True))
+        )
+
+    def test_updated_since(self):
+        enrollment = Enrollment.objects.filter(course=self.cs101).first()
+        enrollment.grade = 'CB'
+        enrollment.save(update_fields=['grade'])
+        deleted = Enrollment.objects.exclude(pk=enrollment.pk).first()
+        deleted_pk = deleted.pk
+        deleted.delete()
+
+        since = (self.past + timedelta(hours=1)).isoformat()
+        response = self.client.get(reverse('enrollment-list'), {'updated_since': since})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [enrollment.pk])
+        self.assertEqual(response.data['deleted'], [deleted_pk])
+
+        # synced_at is the cursor of the next pull, which sees nothing new
+        response = self.client.get(reverse('enrollment-list'), {'updated_since': response.data['synced_at']})
+        self.assertEqual((response.data['results'], response.data['deleted']), ([], []))
+
+        # Without the parameter the list is unchanged
+        response = self.client.get(reverse('enrollment-list'))
+        self.assertNotIn('deleted', response.data)
+
+    def test_tombstones_only_for_deletes_of_the_model(self):
+        score = StudentAssessmentScore.objects.first()
+        score_pk = score.pk
+        score.delete()
+        self.assertEqual(
+            list(Tombstone.objects.values_list('model_label', 'object_id')),
+            [('outcomes.StudentAssessmentScore', score_pk)],
+        )
+        response = self.client.get(reverse('course-list'), {'updated_since': self.past.isoformat()})
+        self.assertEqual(response.data['deleted'], [])
+
+    def test_invalid_updated_since(self):
+        response = self.client.get(reverse('enrollment-list'), {'updated_since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.data)
+
+    def test_counter_changes_sync(self):
+        carol = self.data['students'][2]
+        Enrollment.objects.filter(student=carol, status='ACTIVE').update(status='COMPLETED')
+        since = (self.past + timedelta(hours=1)).isoformat()
+        response = self.client.get(reverse('student-list'), {'updated_since': since})
+        self.assertEqual(
+            [(row['id'], row['completed_courses']) for row in response.data['results']], [(carol.pk, 2)]
+        )
+
+    def test_updated_since_students(self):
+        alice, bob, _ = self.data['students']
+        alice.email = 'alice@example.org'
+        alice.save()
+        bob_pk = bob.pk
+        bob.delete()
+
+        since = (self.past + timedelta(hours=1)).isoformat()
+        response = self.client.get(reverse('student-list'), {'updated_since': since})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [alice.pk])
+        self.assertEqual(response.data['deleted'], [bob_pk])
+        response = self.client.get(reverse('student-list'), {'updated_since': response.data['synced_at']})
+        self.assertEqual((response.data['results'], response.data['deleted']), ([], []))
+
+        response = self.client.get(reverse('student-list'), {'updated_since': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        # Without the parameter the list stays one plain page
+        response = self.client.get(reverse('student-list'))
+        self.assertEqual(len(response.data), Student.objects.count())
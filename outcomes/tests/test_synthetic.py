@@ -0,0 +1,62 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from courses.models import Course
+from outcomes.grading import GRADE_CUTOFFS, letter_grade
+from outcomes.models import Enrollment, StudentAssessmentScore
+from outcomes.synthetic import generate_dataset
+from students.models import Student
+
+
+class GenerateDatasetTests(TestCase):
+
+    def test_same_seed_gives_same_data(self):
+        first = generate_dataset(students=20, courses=5, retake_rate=0.5, prefix='A', seed=7)
+        second = generate_dataset(students=20, courses=5, retake_rate=0.5, prefix='B', seed=7)
+        self.assertEqual(first, second)
+
+        def scores(prefix):
+            return list(
+                StudentAssessmentScore.objects.filter(student__student_number__startswith=prefix)
+                .order_by('id').values_list('score', flat=True)
+            )
+
+        self.assertEqual(scores('A'), scores('B'))
+
+    def test_counts_match_rows(self):
+        counts = generate_dataset(students=30, courses=6, courses_per_student=4, retake_rate=1.0)
+        self.assertEqual(Student.objects.count(), counts['students'])
+        self.assertEqual(Enrollment.objects.count(), counts['enrollments'])
+        self.assertEqual(StudentAssessmentScore.objects.count(), counts['scores'])
+        self.assertEqual(counts['enrollments'], 30 * 4 + counts['retakes'])
+
+    def test_completed_enrollments_are_graded(self):
+        generate_dataset(students=30, courses=6)
+        completed = Enrollment.objects.filter(status='COMPLETED')
+        self.assertTrue(completed.exists())
+        self.assertFalse(completed.filter(grade__isnull=True).exists())
+        self.assertFalse(Enrollment.objects.filter(status='ACTIVE', grade__isnull=False).exists())
+
+    def test_letter_grade_cutoffs(self):
+        for cutoff, grade in GRADE_CUTOFFS:
+            self.assertEqual(letter_grade(cutoff), grade)
+        self.assertEqual(letter_grade(89.9), 'BA')
+
+
+class PopulateScaleCommandTests(TestCase):
+
+    def test_scale(self):
+        out = StringIO()
+        call_command('populate_test_data', scale=25, courses=5, courses_per_student=3, stdout=out)
+        self.assertEqual(Student.objects.filter(student_number__startswith='SYN').count(), 25)
+        self.assertEqual(Course.objects.filter(code__startswith='SYN').count(), 5)
+        self.assertIn('25 students', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('populate_test_data', scale=25, courses=5, stdout=StringIO())
+
+    def test_rejects_more_courses_per_student_than_courses(self):
+        with self.assertRaises(CommandError):
+            call_command('populate_test_data', scale=5, courses=3, courses_per_student=4, stdout=StringIO())
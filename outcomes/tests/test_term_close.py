@@ -0,0 +1,102 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from outcomes import term_close
+from outcomes.caching import get_data_version
+from outcomes.models import (
+    Change,
+    Enrollment,
+    LearningOutcome,
+    ProgramLearningOutcome,
+    StudentPLOAchievement,
+    TermCloseCheckpoint,
+    TermSnapshot,
+)
+from outcomes.nplusone import allow_repeated_queries
+from outcomes.term_close import STAGE_NAMES, close_term
+from .fixtures import build_dataset
+
+
+class TermCloseTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+        cls.plo = ProgramLearningOutcome.objects.create(number=1, description='...', short_name='Knowledge')
+        LearningOutcome.objects.update(plo=cls.plo)
+
+    def setUp(self):
+        self.alice, self.bob, self.carol = self.data['students']
+
+    def test_closes_term(self):
+        versions = [get_data_version()]
+        checkpoints = close_term('FALL', 2024, progress=lambda checkpoint, skipped: versions.append(get_data_version()))
+        self.assertEqual([checkpoint.stage for checkpoint in checkpoints], STAGE_NAMES)
+
+        enrollments = Enrollment.objects.filter(semester='FALL', year=2024)
+        self.assertFalse(enrollments.exclude(status='COMPLETED').exists())
+        self.assertFalse(enrollments.filter(student=self.carol, completed_at__isnull=True).exists())
+        # Weighted totals: Alice 70, Bob 80, Carol 90 in both courses
+        self.assertEqual(
+            {(e.student_id, e.grade) for e in enrollments},
+            {(self.alice.pk, 'CC'), (self.bob.pk, 'BB'), (self.carol.pk, 'AA')},
+        )
+        self.assertEqual(
+            Change.objects.filter(model_label='outcomes.Enrollment', data__grade='AA').count(), 2
+        )
+
+        achievements = StudentPLOAchievement.objects.filter(plo=self.plo)
+        self.assertEqual(achievements.count(), 6)
+        carol = achievements.filter(student=self.carol).first()
+        self.assertAlmostEqual(carol.score, 90.0)
+        self.assertEqual(carol.achievement_level, 'EXCEEDED')
+
+        snapshot = TermSnapshot.objects.get(semester='FALL', year=2024)
+        self.assertEqual(
+            {kind: len(outcomes) for kind, outcomes in snapshot.summary.items()}, {'LO': 2, 'PO': 1, 'PLO': 1}
+        )
+        self.assertEqual(snapshot.summary['PLO'][0]['students'], 3)
+        # The enrollment and grade UPDATEs invalidate results as they run,
+        # not only once the caches stage is reached
+        self.assertNotEqual(versions[1], versions[0])
+        self.assertNotEqual(versions[2], versions[1])
+        self.assertNotEqual(versions[-1], versions[-2])
+
+        # Stage rows: 2 enrollments completed, 6 graded, 6 achievements
+        self.assertEqual([checkpoint.rows for checkpoint in checkpoints[:3]], [2, 6, 6])
+
+    def test_resumes_after_failure(self):
+        with mock.patch.object(
+            term_close, 'STAGES',
+            [(name, stage) if name != 'achievements' else (name, mock.Mock(side_effect=RuntimeError))
+             for name, stage in term_close.STAGES],
+        ):
+            with self.assertRaises(RuntimeError):
+                close_term('FALL', 2024)
+        self.assertEqual(
+            list(TermCloseCheckpoint.objects.values_list('stage', flat=True)), ['enrollments', 'grades']
+        )
+        self.assertFalse(StudentPLOAchievement.objects.exists())
+
+        skipped = []
+        with allow_repeated_queries():
+            close_term('FALL', 2024, progress=lambda checkpoint, was_skipped: skipped.append(was_skipped))
+        self.assertEqual(skipped, [True, True, False, False, False])
+        self.assertEqual(StudentPLOAchievement.objects.count(), 6)
+
+        # A restart runs every stage again; the upsert keeps one achievement per enrollment
+        out = StringIO()
+        with allow_repeated_queries():
+            call_command('close_term', 'fall', '2024', '--restart', stdout=out)
+        self.assertIn('achievements: 6 rows', out.getvalue())
+        self.assertIn('Closed FALL 2024', out.getvalue())
+        self.assertEqual(StudentPLOAchievement.objects.count(), 6)
+        self.assertEqual(TermCloseCheckpoint.objects.count(), len(STAGE_NAMES))
+
+        out = StringIO()
+        with allow_repeated_queries():
+            call_command('close_term', 'FALL', '2024', stdout=out)
+        self.assertEqual(out.getvalue().count('skipped'), len(STAGE_NAMES))
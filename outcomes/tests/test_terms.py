@@ -0,0 +1,84 @@
+from django.test import TestCase
+
+from outcomes import engines
+from outcomes.models import CourseOffering, Enrollment, calculate_lo_score, term_key
+from outcomes.nplusone import allow_repeated_queries
+from .fixtures import build_dataset
+
+
+class TermKeyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = build_dataset()
+
+    def setUp(self):
+        self.student = self.data['students'][0]
+        self.course = self.data['courses'][0]
+
+    def test_term_key(self):
+        self.assertEqual(term_key(2024, 'FALL'), 20243)
+        self.assertLess(term_key(2024, 'SPRING'), term_key(2024, 'SUMMER'))
+        self.assertLess(term_key(2024, 'FALL'), term_key(2025, 'SPRING'))
+
+    def test_kept_in_step_on_save(self):
+        enrollment = Enrollment.objects.get(student=self.student, course=self.course)
+        self.assertEqual(enrollment.term_key, 20243)
+
+        enrollment.year = 2023
+        enrollment.save(update_fields=['year'])
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.term_key, 20233)
+
+        offering = self.data['CS101']['offering']
+        offering.semester = 'SPRING'
+        offering.save()
+        offering.refresh_from_db()
+        self.assertEqual(offering.term_key, 20241)
+
+    def test_kept_in_step_on_bulk_writes(self):
+        professor = self.data['professor']
+        offerings = CourseOffering.objects.bulk_create([
+            CourseOffering(course=self.course, professor=professor, semester='SPRING', year=2025),
+            CourseOffering(course=self.course, professor=professor, semester='SUMMER', year=2025),
+        ])
+        self.assertEqual(
+            list(CourseOffering.objects.filter(year=2025).values_list('term_key', flat=True).order_by('term_key')),
+            [20251, 20252]
+        )
+
+        for offering in offerings:
+            offering.year = 2026
+        CourseOffering.objects.bulk_update(offerings, ['year'])
+        self.assertEqual(set(CourseOffering.objects.filter(year=2026).values_list('term_key', flat=True)), {20261, 20262})
+
+        Enrollment.objects.filter(student=self.student).update(semester='SPRING')
+        Enrollment.objects.filter(student=self.student, course=self.course).update(year=2022)
+        self.assertEqual(
+            dict(Enrollment.objects.filter(student=self.student).values_list('course', 'term_key')),
+            {self.course.pk: 20221, self.data['courses'][1].pk: 20241}
+        )
+
+    def test_ordering_is_chronological(self):
+        for year, semester in [(2025, 'SPRING'), (2024, 'SUMMER'), (2024, 'SPRING')]:
+            Enrollment.objects.create(
+                student=self.student, course=self.course, year=year, semester=semester, status='COMPLETED'
+            )
+        terms = [
+            (enrollment.year, enrollment.semester)
+            for enrollment in Enrollment.objects.filter(student=self.student, course=self.course)
+        ]
+        self.assertEqual(terms, [(2025, 'SPRING'), (2024, 'FALL'), (2024, 'SUMMER'), (2024, 'SPRING')])
+
+    def test_latest_enrollment_is_the_latest_term(self):
+        # A retake in the spring of the same year is older than the fall enrollment
+        retake = Enrollment.objects.create(
+            student=self.student, course=self.course, year=2024, semester='SPRING', status='COMPLETED'
+        )
+        lo = self.data['CS101']['lo']
+        fall = Enrollment.objects.get(student=self.student, course=self.course, semester='FALL')
+        with allow_repeated_queries():
+            expected = calculate_lo_score(lo, self.student, fall)
+            self.assertNotEqual(calculate_lo_score(lo, self.student, retake), expected)
+            for engine in engines.ENGINES:
+                self.assertEqual(engines.call(engine, 'calculate_lo_score', lo, self.student), expected)
@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views, streams
 from .views import (
     ProgramLearningOutcomeViewSet,
     EnrollmentViewSet,
@@ -11,7 +12,10 @@ from .views import (
     AssessmentViewSet,
     AssessmentLOMappingViewSet,
     LOPOMappingViewSet,
-    StudentAssessmentScoreViewSet
+    StudentAssessmentScoreViewSet,
+    BatchView,
+    ChangeFeedView,
+    TermOutcomesView
 )
 
 router = DefaultRouter()
@@ -28,5 +32,13 @@ router.register(r'lo-po-mappings', LOPOMappingViewSet, basename='lo-po-mapping')
 router.register(r'student-scores', StudentAssessmentScoreViewSet, basename='student-score')
 
 urlpatterns = [
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('changes/', ChangeFeedView.as_view(), name='changes'),
+    path('terms/<str:semester>/<int:year>/outcomes/', TermOutcomesView.as_view(), name='term-outcomes'),
+    path('async/calculate_po_scores/', async_views.calculate_po_scores, name='async-calculate-po-scores'),
+    path('async/student_po_summary/', async_views.student_po_summary, name='async-student-po-summary'),
+    path('async/plo_statistics/', async_views.plo_statistics, name='async-plo-statistics'),
+    path('stream/offerings/<int:offering_id>/', streams.offering_stream, name='offering-stream'),
+    path('stream/students/<int:student_id>/', streams.student_stream, name='student-stream'),
     path('', include(router.urls)),
 ]
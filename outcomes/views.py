@@ -1,7 +1,19 @@
+import json
+import logging
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField
 from rest_framework.response import Response
-from django.db.models import Avg, Count, Q
+from rest_framework.views import APIView
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Min, Q
+from django.http import Http404, HttpRequest, QueryDict
+from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
 from .models import (
     ProgramLearningOutcome, 
     Enrollment, 
@@ -18,8 +30,13 @@ from .models import (
     calculate_po_score,
     calculate_all_po_scores,
     calculate_student_lo_scores,
-    get_student_po_summary
+    get_student_po_summary,
+    SEMESTER_ORDER,
 )
+from .caching import cached_call, request_cache, single_flight
+from .changes import read_changes
+from .grading import grade_cutoffs, grade_offering
+from .snapshots import term_results
 from .serializers import (
     ProgramLearningOutcomeSerializer,
     EnrollmentSerializer,
@@ -31,32 +48,41 @@ from .serializers import (
     AssessmentSerializer,
     AssessmentLOMappingSerializer,
     LOPOMappingSerializer,
-    StudentAssessmentScoreSerializer
+    StudentAssessmentScoreSerializer,
+    EnrollmentValuesSerializer,
+    StudentAssessmentScoreValuesSerializer
 )
+from .expand import ExpandMixin
+from .fastpath import ValuesListMixin
+from .sync import UpdatedSinceMixin
+from .search import FullTextSearchFilter
+
+logger = logging.getLogger(__name__)
 
 
-class ProgramLearningOutcomeViewSet(viewsets.ModelViewSet):
+class ProgramLearningOutcomeViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     queryset = ProgramLearningOutcome.objects.all()
     serializer_class = ProgramLearningOutcomeSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
     search_fields = ['short_name', 'description']
     ordering_fields = ['number', 'category']
 
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Get only active PLOs"""
-        active_plos = self.queryset.filter(is_active=True)
+        active_plos = self.get_queryset().filter(is_active=True)
         serializer = self.get_serializer(active_plos, many=True)
         return Response(serializer.data)
 
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+class EnrollmentViewSet(ExpandMixin, UpdatedSinceMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Enrollment.objects.select_related('student', 'course').all()
     serializer_class = EnrollmentSerializer
+    values_serializer_class = EnrollmentValuesSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['student__name', 'course__code', 'course__name']
-    ordering_fields = ['year', 'semester', 'enrolled_at']
-    filterset_fields = ['student', 'course', 'semester', 'year', 'status']
+    ordering_fields = ['term_key', 'year', 'semester', 'enrolled_at']
+    filterset_fields = ['student', 'course', 'course_offering', 'semester', 'year', 'status']
 
     @action(detail=False, methods=['get'])
     def by_student(self, request):
@@ -65,7 +91,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         if not student_id:
             return Response({'error': 'student_id is required'}, status=400)
         
-        enrollments = self.queryset.filter(student_id=student_id)
+        enrollments = self.get_queryset().filter(student_id=student_id)
         serializer = self.get_serializer(enrollments, many=True)
         return Response(serializer.data)
 
@@ -76,17 +102,17 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         if not course_id:
             return Response({'error': 'course_id is required'}, status=400)
         
-        enrollments = self.queryset.filter(course_id=course_id)
+        enrollments = self.get_queryset().filter(course_id=course_id)
         serializer = self.get_serializer(enrollments, many=True)
         return Response(serializer.data)
 
 
-class CourseOfferingViewSet(viewsets.ModelViewSet):
+class CourseOfferingViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     queryset = CourseOffering.objects.select_related('course', 'professor').all()
     serializer_class = CourseOfferingSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['course__code', 'course__name', 'professor__name']
-    ordering_fields = ['year', 'semester']
+    ordering_fields = ['term_key', 'year', 'semester', 'enrolled_count', 'assessment_count']
     filterset_fields = ['course', 'professor', 'semester', 'year', 'is_active']
 
     @action(detail=False, methods=['get'])
@@ -95,12 +121,42 @@ class CourseOfferingViewSet(viewsets.ModelViewSet):
         semester = request.query_params.get('semester', 'FALL')
         year = request.query_params.get('year', 2025)
         
-        offerings = self.queryset.filter(semester=semester, year=year, is_active=True)
+        offerings = self.get_queryset().filter(semester=semester, year=year, is_active=True)
         serializer = self.get_serializer(offerings, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def compute_grades(self, request, pk=None):
+        """
+        Recompute the letter grades of this offering's completed enrollments from their scores.
+        POST body: {"cutoffs": {"AA": 88, "BA": 82}} (optional, overrides single cut points),
+        {"include_active": true} (optional, also grades the ACTIVE enrollments)
+        """
+        offering = get_object_or_404(CourseOffering, pk=pk)
+        try:
+            cutoffs = grade_cutoffs(request.data.get('cutoffs'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        try:
+            # Form posts send the flag as a string, "false" included
+            include_active = BooleanField().to_internal_value(request.data.get('include_active', False))
+        except ValidationError:
+            return Response({'error': 'include_active must be a boolean'}, status=400)
 
-class CoursePLOMappingViewSet(viewsets.ModelViewSet):
+        results, updated = grade_offering(offering, cutoffs, include_active=include_active)
+        return Response({
+            'offering_id': offering.pk,
+            'cutoffs': {grade: minimum for minimum, grade in cutoffs},
+            'graded': len(results),
+            'updated': updated,
+            'grades': [
+                {'enrollment_id': enrollment_id, 'total': round(total, 2), 'grade': grade}
+                for enrollment_id, (total, grade) in sorted(results.items())
+            ],
+        })
+
+
+class CoursePLOMappingViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     queryset = CoursePLOMapping.objects.select_related('course', 'plo').all()
     serializer_class = CoursePLOMappingSerializer
     filter_backends = [filters.OrderingFilter]
@@ -114,7 +170,7 @@ class CoursePLOMappingViewSet(viewsets.ModelViewSet):
         if not course_id:
             return Response({'error': 'course_id is required'}, status=400)
         
-        mappings = self.queryset.filter(course_id=course_id)
+        mappings = self.get_queryset().filter(course_id=course_id)
         serializer = self.get_serializer(mappings, many=True)
         return Response(serializer.data)
 
@@ -125,12 +181,12 @@ class CoursePLOMappingViewSet(viewsets.ModelViewSet):
         if not plo_id:
             return Response({'error': 'plo_id is required'}, status=400)
         
-        mappings = self.queryset.filter(plo_id=plo_id)
+        mappings = self.get_queryset().filter(plo_id=plo_id)
         serializer = self.get_serializer(mappings, many=True)
         return Response(serializer.data)
 
 
-class StudentPLOAchievementViewSet(viewsets.ModelViewSet):
+class StudentPLOAchievementViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     queryset = StudentPLOAchievement.objects.select_related(
         'student', 'plo', 'enrollment__course'
     ).all()
@@ -146,7 +202,7 @@ class StudentPLOAchievementViewSet(viewsets.ModelViewSet):
         if not student_id:
             return Response({'error': 'student_id is required'}, status=400)
         
-        achievements = self.queryset.filter(student_id=student_id)
+        achievements = self.get_queryset().filter(student_id=student_id)
         
         # Calculate average score per PLO
         plo_summary = achievements.values('plo__number', 'plo__short_name').annotate(
@@ -167,7 +223,7 @@ class StudentPLOAchievementViewSet(viewsets.ModelViewSet):
         if not plo_id:
             return Response({'error': 'plo_id is required'}, status=400)
         
-        achievements = self.queryset.filter(plo_id=plo_id)
+        achievements = self.get_queryset().filter(plo_id=plo_id)
         
         stats = achievements.aggregate(
             avg_score=Avg('score'),
@@ -181,14 +237,14 @@ class StudentPLOAchievementViewSet(viewsets.ModelViewSet):
         return Response(stats)
 
 
-class LearningOutcomeViewSet(viewsets.ModelViewSet):
+class LearningOutcomeViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     """
     ViewSet for Course Learning Outcomes (CLOs)
     Automatically calculates and shows scores for all students.
     """
     queryset = LearningOutcome.objects.select_related('course', 'plo').all()
     serializer_class = LearningOutcomeSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
     search_fields = ['code', 'description', 'course__code', 'course__name']
     ordering_fields = ['course', 'code', 'bloom_level']
     filterset_fields = ['course', 'plo', 'bloom_level', 'is_active']
@@ -200,7 +256,7 @@ class LearningOutcomeViewSet(viewsets.ModelViewSet):
         if not course_id:
             return Response({'error': 'course_id is required'}, status=400)
         
-        outcomes = self.queryset.filter(course_id=course_id, is_active=True)
+        outcomes = self.get_queryset().filter(course_id=course_id, is_active=True)
         serializer = self.get_serializer(outcomes, many=True)
         return Response(serializer.data)
 
@@ -211,19 +267,19 @@ class LearningOutcomeViewSet(viewsets.ModelViewSet):
         if not plo_id:
             return Response({'error': 'plo_id is required'}, status=400)
         
-        outcomes = self.queryset.filter(plo_id=plo_id, is_active=True)
+        outcomes = self.get_queryset().filter(plo_id=plo_id, is_active=True)
         serializer = self.get_serializer(outcomes, many=True)
         return Response(serializer.data)
 
 
-class ProgramOutcomeViewSet(viewsets.ModelViewSet):
+class ProgramOutcomeViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     """
     ViewSet for Program Outcomes (broader institutional goals)
     Automatically calculates and shows scores for all students.
     """
     queryset = ProgramOutcome.objects.prefetch_related('related_plos').all()
     serializer_class = ProgramOutcomeSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
     search_fields = ['code', 'title', 'description']
     ordering_fields = ['code', 'outcome_type']
     filterset_fields = ['outcome_type', 'is_active']
@@ -235,7 +291,7 @@ class ProgramOutcomeViewSet(viewsets.ModelViewSet):
         if not outcome_type:
             return Response({'error': 'type parameter is required'}, status=400)
         
-        outcomes = self.queryset.filter(outcome_type=outcome_type, is_active=True)
+        outcomes = self.get_queryset().filter(outcome_type=outcome_type, is_active=True)
         serializer = self.get_serializer(outcomes, many=True)
         return Response(serializer.data)
 
@@ -248,7 +304,7 @@ class ProgramOutcomeViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class AssessmentViewSet(viewsets.ModelViewSet):
+class AssessmentViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     """
     ViewSet for course assessments (exams, projects, assignments, etc.)
     """
@@ -257,8 +313,8 @@ class AssessmentViewSet(viewsets.ModelViewSet):
         'course_offering__professor'
     ).prefetch_related('learning_outcomes').all()
     serializer_class = AssessmentSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'description', 'course_offering__course__code']
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter]
+    search_fields = ['name', 'description', 'rubric', 'course_offering__course__code']
     ordering_fields = ['due_date', 'name', 'weight_percentage']
     filterset_fields = ['course_offering', 'assessment_type', 'is_graded']
 
@@ -269,7 +325,7 @@ class AssessmentViewSet(viewsets.ModelViewSet):
         if not offering_id:
             return Response({'error': 'offering_id is required'}, status=400)
         
-        assessments = self.queryset.filter(course_offering_id=offering_id)
+        assessments = self.get_queryset().filter(course_offering_id=offering_id)
         serializer = self.get_serializer(assessments, many=True)
         return Response(serializer.data)
 
@@ -277,7 +333,7 @@ class AssessmentViewSet(viewsets.ModelViewSet):
     def upcoming(self, request):
         """Get upcoming assessments"""
         from django.utils import timezone
-        assessments = self.queryset.filter(
+        assessments = self.get_queryset().filter(
             due_date__gte=timezone.now(),
             is_graded=False
         ).order_by('due_date')
@@ -292,8 +348,21 @@ class AssessmentViewSet(viewsets.ModelViewSet):
         serializer = LearningOutcomeSerializer(learning_outcomes, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def score_statistics(self, request, pk=None):
+        """Normalized score statistics of this assessment, aggregated in SQL"""
+        assessment = get_object_or_404(Assessment, pk=pk)
+        stats = StudentAssessmentScore.objects.filter(assessment=assessment).aggregate(
+            scored_students=Count('id'),
+            avg_normalized=Avg('normalized'),
+            min_normalized=Min('normalized'),
+            max_normalized=Max('normalized'),
+            below_50=Count('id', filter=Q(normalized__lt=50)),
+        )
+        return Response({'assessment_id': assessment.pk, 'max_score': assessment.max_score, **stats})
+
 
-class AssessmentLOMappingViewSet(viewsets.ModelViewSet):
+class AssessmentLOMappingViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     """
     ViewSet for mapping assessments to learning outcomes with contribution percentages.
     """
@@ -307,7 +376,7 @@ class AssessmentLOMappingViewSet(viewsets.ModelViewSet):
     filterset_fields = ['assessment', 'learning_outcome']
 
 
-class LOPOMappingViewSet(viewsets.ModelViewSet):
+class LOPOMappingViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     """
     ViewSet for mapping learning outcomes to program outcomes with weights.
     """
@@ -321,17 +390,18 @@ class LOPOMappingViewSet(viewsets.ModelViewSet):
     filterset_fields = ['learning_outcome', 'program_outcome', 'weight']
 
 
-class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
+class StudentAssessmentScoreViewSet(ExpandMixin, UpdatedSinceMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for student assessment scores.
     """
     queryset = StudentAssessmentScore.objects.select_related(
-        'student', 'assessment', 'enrollment'
+        'student', 'assessment', 'enrollment__course'
     ).all()
     serializer_class = StudentAssessmentScoreSerializer
+    values_serializer_class = StudentAssessmentScoreValuesSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['student__name', 'assessment__name']
-    ordering_fields = ['graded_at', 'score']
+    ordering_fields = ['graded_at', 'score', 'normalized']
     filterset_fields = ['student', 'assessment', 'enrollment']
 
     @action(detail=False, methods=['get'])
@@ -341,7 +411,7 @@ class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
         if not student_id:
             return Response({'error': 'student_id is required'}, status=400)
         
-        scores = self.queryset.filter(student_id=student_id)
+        scores = self.get_queryset().filter(student_id=student_id)
         serializer = self.get_serializer(scores, many=True)
         return Response(serializer.data)
 
@@ -352,7 +422,7 @@ class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
         if not enrollment_id:
             return Response({'error': 'enrollment_id is required'}, status=400)
         
-        scores = self.queryset.filter(enrollment_id=enrollment_id)
+        scores = self.get_queryset().filter(enrollment_id=enrollment_id)
         serializer = self.get_serializer(scores, many=True)
         return Response(serializer.data)
 
@@ -381,7 +451,7 @@ class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=404)
         
         # Calculate LO scores
-        lo_scores = calculate_student_lo_scores(student, course)
+        lo_scores = cached_call(calculate_student_lo_scores, student, course)
         
         result = {
             'student': student.name,
@@ -418,7 +488,7 @@ class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Student not found'}, status=404)
         
         # Calculate PO scores
-        po_scores = calculate_all_po_scores(student, use_credits=use_credits)
+        po_scores = single_flight(calculate_all_po_scores, student, use_credits=use_credits)
         
         result = {
             'student': student.name,
@@ -454,7 +524,7 @@ class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Student not found'}, status=404)
         
         # Get comprehensive summary
-        summary = get_student_po_summary(student)
+        summary = single_flight(get_student_po_summary, student)
         
         # Format for response
         result = {
@@ -469,3 +539,153 @@ class StudentAssessmentScoreViewSet(viewsets.ModelViewSet):
         
         return Response(result)
 
+
+
+class BatchView(APIView):
+    """
+    Run several GET requests in one round trip.
+
+    POST body: {"requests": ["/api/students/", {"path": "/api/plos/?page=2"}]}
+
+    Sub-requests are resolved and dispatched in-process, skipping middleware,
+    and share the caller's user, database connection and calculation cache.
+    Async views are run to completion; streaming endpoints get a 400 entry.
+    """
+
+    def post(self, request):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'requests must be a non-empty list'}, status=400)
+
+        max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', 50)
+        if len(items) > max_requests:
+            return Response(
+                {'error': f'A batch may contain at most {max_requests} requests'},
+                status=400
+            )
+
+        with request_cache():
+            responses = [self._run(request, item) for item in items]
+
+        return Response({'responses': responses})
+
+    def _run(self, request, item):
+        if isinstance(item, str):
+            item = {'path': item}
+        if not isinstance(item, dict):
+            return {'path': None, 'status': 400, 'body': {'error': 'Each request must be a path or an object'}}
+
+        path = item.get('path')
+        method = str(item.get('method', 'GET')).upper()
+        result = {'path': path}
+
+        if method != 'GET':
+            return dict(result, status=405, body={'error': 'Only GET requests can be batched'})
+
+        parts = urlsplit(path) if isinstance(path, str) else None
+        if parts is None or parts.scheme or parts.netloc or not parts.path.startswith('/'):
+            return dict(result, status=400, body={'error': 'path must be a relative URL starting with /'})
+
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            return dict(result, status=404, body={'detail': 'Not found.'})
+
+        sub_request = self._build_sub_request(request._request, parts, match)
+        view = match.func
+        if iscoroutinefunction(view):
+            # Async views run to completion on their own event loop
+            view = async_to_sync(view)
+        try:
+            response = view(sub_request, *match.args, **match.kwargs)
+        except Http404:
+            return dict(result, status=404, body={'detail': 'Not found.'})
+        except Exception:
+            logger.exception('Batched request to %s failed', path)
+            return dict(result, status=500, body={'error': 'Internal server error'})
+
+        if response.streaming:
+            response.close()
+            return dict(result, status=400, body={'error': 'Streaming endpoints cannot be batched'})
+
+        if hasattr(response, 'data'):
+            body = response.data
+        else:
+            if hasattr(response, 'render'):
+                response.render()
+            try:
+                body = json.loads(response.content or b'null')
+            except ValueError:
+                body = response.content.decode(response.charset, errors='replace')
+
+        return dict(result, status=response.status_code, body=body)
+
+    def _build_sub_request(self, parent, parts, match):
+        sub_request = HttpRequest()
+        sub_request.method = 'GET'
+        sub_request.path = sub_request.path_info = parts.path
+        sub_request.META = dict(
+            parent.META,
+            REQUEST_METHOD='GET',
+            PATH_INFO=parts.path,
+            QUERY_STRING=parts.query,
+            HTTP_ACCEPT='application/json',
+        )
+        sub_request.META.pop('CONTENT_TYPE', None)
+        sub_request.META.pop('CONTENT_LENGTH', None)
+        sub_request.GET = QueryDict(parts.query)
+        sub_request.COOKIES = parent.COOKIES
+        sub_request.resolver_match = match
+        for attr in ('user', 'session'):
+            if hasattr(parent, attr):
+                setattr(sub_request, attr, getattr(parent, attr))
+        return sub_request
+
+
+class ChangeFeedView(APIView):
+    """
+    Page through the change feed: GET /api/changes/?after=<seq>&limit=<n>
+
+    Returns {"changes": [...], "last_seq": ..., "has_more": ...}; pass
+    ``last_seq`` as ``after`` to read the next batch.
+    """
+
+    def get(self, request):
+        try:
+            after = int(request.query_params.get('after', 0))
+            limit = int(request.query_params.get('limit', getattr(settings, 'CHANGE_FEED_BATCH_SIZE', 500)))
+        except ValueError:
+            return Response({'error': 'after and limit must be integers'}, status=400)
+        if after < 0 or limit < 1:
+            return Response({'error': 'after must be 0 or more and limit at least 1'}, status=400)
+
+        limit = min(limit, getattr(settings, 'CHANGE_FEED_MAX_BATCH_SIZE', 5000))
+        changes, has_more = read_changes(after, limit)
+        return Response({
+            'changes': changes,
+            'last_seq': changes[-1]['seq'] if changes else after,
+            'has_more': has_more,
+        })
+
+
+class TermOutcomesView(APIView):
+    """
+    LO, PO and PLO results of a term: GET /api/terms/<semester>/<year>/outcomes/?student_id=<id>
+
+    Frozen terms (``freeze_term``) are read from their snapshot; other terms
+    are computed from the live tables.
+    """
+
+    def get(self, request, semester, year):
+        semester = semester.upper()
+        if semester not in SEMESTER_ORDER:
+            return Response({'error': f'semester must be one of {", ".join(SEMESTER_ORDER)}'}, status=400)
+        student_id = request.query_params.get('student_id')
+        if student_id is not None:
+            try:
+                student_id = int(student_id)
+            except ValueError:
+                return Response({'error': 'student_id must be an integer'}, status=400)
+
+        result = term_results(semester, year, student_id=student_id)
+        return Response({'semester': semester, 'year': year, **result})
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='professor',
+            name='updated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
 from django.utils import timezone
 
+from core.timestamps import TimestampedMixin, TimestampedQuerySet
 
-class Professor(models.Model):
+
+class Professor(TimestampedMixin, models.Model):
     name = models.CharField(max_length=100)
     title = models.CharField(
         max_length=50,
@@ -22,7 +24,9 @@ class Professor(models.Model):
     research_interests = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
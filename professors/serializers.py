@@ -1,8 +1,14 @@
 from rest_framework import serializers
+from outcomes.expand import ExpandableSerializerMixin
+from outcomes.instrumentation import TimedSerializerMixin
 from .models import Professor
 
 
-class ProfessorSerializer(serializers.ModelSerializer):
+class ProfessorSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'course_offerings': 'outcomes.serializers.CourseOfferingSerializer',
+    }
+
     title_display = serializers.CharField(source='get_title_display', read_only=True)
     
     class Meta:
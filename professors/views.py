@@ -1,7 +1,9 @@
 from rest_framework import viewsets
 from .models import Professor
+from outcomes.expand import ExpandMixin
+from outcomes.sync import UpdatedSinceMixin
 from .serializers import ProfessorSerializer
 
-class ProfessorViewSet(viewsets.ModelViewSet):
+class ProfessorViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     queryset = Professor.objects.all()
     serializer_class = ProfessorSerializer
@@ -0,0 +1,134 @@
+"""
+In-memory prefix index for student autocomplete.
+
+Every worker keeps sorted lists of lowercased keys pointing at students:
+
+* whole values - name, student number, email;
+* words - the separate words of the name and of the email's local part.
+
+A lookup is a binary search for the first key starting with the query
+followed by a walk over the following keys, so it costs O(log n + k) and
+never touches the database. Whole-value matches rank before word matches,
+and within each group keys come in alphabetical order.
+
+Writes to students, ``update()``, ``bulk_update()`` and ``bulk_create()``
+included, bump a version token in the shared ``calculations`` cache (see
+``students/signals.py``); each worker rebuilds its index on the first
+lookup after the version changed. ``bench_autocomplete`` times lookups on a
+synthetic index.
+"""
+import bisect
+import re
+import threading
+import uuid
+
+from django.core.cache import caches
+
+from outcomes.caching import CACHE_ALIAS
+
+
+INDEX_VERSION_KEY = 'students:autocomplete_version'
+
+# Student columns the index is built from
+INDEXED_FIELDS = ('name', 'student_number', 'email')
+
+_WORD_SPLIT = re.compile(r'[\s._+\-@]+')
+
+
+def get_index_version():
+    cache = caches[CACHE_ALIAS]
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(INDEX_VERSION_KEY)
+    return version
+
+
+def bump_index_version(sender=None, **kwargs):
+    caches[CACHE_ALIAS].set(INDEX_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+class _SortedKeys:
+    """Sorted ``(key, student_id)`` pairs searchable by prefix."""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.ids = [student_id for _, student_id in pairs]
+
+    def iter_prefix(self, prefix):
+        position = bisect.bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            yield self.ids[position]
+            position += 1
+
+
+class StudentIndex:
+
+    def __init__(self, rows):
+        """``rows`` are ``(id, name, student_number, email)`` tuples."""
+        self.students = {}
+        values = []
+        words = []
+        for student_id, name, student_number, email in rows:
+            self.students[student_id] = {
+                'id': student_id, 'name': name, 'student_number': student_number, 'email': email,
+            }
+            for value in (name, student_number, email):
+                values.append((value.lower(), student_id))
+            local_part = email.split('@', 1)[0]
+            for word in set(_WORD_SPLIT.split(f'{name} {local_part}'.lower())):
+                if word:
+                    words.append((word, student_id))
+        self.values = _SortedKeys(values)
+        self.words = _SortedKeys(words)
+        self._words_of = {}
+        for word, student_id in words:
+            self._words_of.setdefault(student_id, []).append(word)
+
+    def search(self, query, limit=10):
+        terms = [term for term in _WORD_SPLIT.split(query.lower()) if term]
+        if not terms:
+            return []
+        whole = query.strip().lower()
+
+        found = {}
+        for student_id in self.values.iter_prefix(whole):
+            found.setdefault(student_id, None)
+            if len(found) >= limit:
+                break
+
+        if len(found) < limit:
+            # Match the longest term through the index, check the others per candidate
+            terms.sort(key=len, reverse=True)
+            first, rest = terms[0], terms[1:]
+            for student_id in self.words.iter_prefix(first):
+                if student_id in found:
+                    continue
+                words = self._words_of[student_id]
+                if all(any(word.startswith(term) for word in words) for term in rest):
+                    found[student_id] = None
+                    if len(found) >= limit:
+                        break
+
+        return [self.students[student_id] for student_id in found]
+
+
+_index = None
+_index_version = None
+_build_lock = threading.Lock()
+
+
+def get_student_index():
+    """Return this worker's index, rebuilding it if students changed since it was built."""
+    global _index, _index_version
+    from .models import Student
+
+    version = get_index_version()
+    if _index is None or _index_version != version:
+        with _build_lock:
+            if _index is None or _index_version != version:
+                rows = Student.objects.values_list('id', *INDEXED_FIELDS)
+                _index = StudentIndex(rows.order_by())
+                _index_version = version
+    return _index
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from students.autocomplete import StudentIndex
+
+
+PREFIXES = ['stu', 's0123', 'family12', 'student5 fam']
+
+
+class Command(BaseCommand):
+    help = 'Times student autocomplete lookups on a synthetic in-memory index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=100_000, help='Students in the synthetic index')
+        parser.add_argument('--repeat', type=int, default=100, help='Lookups per prefix (best time is reported)')
+
+    def handle(self, *args, **options):
+        size = options['students']
+        start = time.perf_counter()
+        index = StudentIndex(
+            (i, f'Student{i % 997} Family{i}', f'S{i:06d}', f'student{i}@example.edu')
+            for i in range(size)
+        )
+        self.stdout.write(f'Built an index of {size} students in {(time.perf_counter() - start) * 1000:.0f} ms')
+
+        for prefix in PREFIXES:
+            best = None
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                found = index.search(prefix)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write(f'{prefix!r}: {len(found)} results in {best * 1000:.3f} ms')
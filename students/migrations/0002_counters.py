@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='completed_courses',
+            field=models.IntegerField(default=0, editable=False, help_text='Completed enrollments'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='completed_credits',
+            field=models.IntegerField(default=0, editable=False, help_text='Credits of the completed enrollments'),
+        ),
+    ]
@@ -2,8 +2,12 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from core.denormalized import ProtectedColumnsMixin
+from core.timestamps import TimestampedMixin
+from core.tracking import TrackedQuerySet
 
-class Student(models.Model):
+
+class Student(TimestampedMixin, ProtectedColumnsMixin, models.Model):
     name = models.CharField(max_length=100)
     student_number = models.CharField(max_length=20, unique=True)
     email = models.EmailField(unique=True)
@@ -32,8 +36,16 @@ class Student(models.Model):
         ],
         default='ACTIVE'
     )
+    completed_courses = models.IntegerField(default=0, editable=False, help_text="Completed enrollments")
+    completed_credits = models.IntegerField(
+        default=0, editable=False, help_text="Credits of the completed enrollments"
+    )
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TrackedQuerySet.as_manager()
+
+    protected_columns = ('completed_courses', 'completed_credits')
 
     class Meta:
         ordering = ['student_number']
@@ -1,13 +1,19 @@
 from rest_framework import serializers
+from outcomes.expand import ExpandableSerializerMixin
+from outcomes.instrumentation import TimedSerializerMixin
 from .models import Student
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(TimedSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'enrollments': 'outcomes.serializers.EnrollmentSerializer',
+    }
+
     class Meta:
         model = Student
         fields = [
             'id', 'name', 'student_number', 'email', 'department',
             'grade_average', 'enrollment_year', 'expected_graduation_year',
-            'status', 'created_at', 'updated_at'
+            'status', 'completed_courses', 'completed_credits', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
@@ -0,0 +1,31 @@
+"""
+Signal receivers that keep the autocomplete index in step with students.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from core.tracking import rows_created, rows_updating, updated_fields
+
+from .autocomplete import INDEXED_FIELDS, bump_index_version
+
+
+def invalidate_autocomplete(sender=None, **kwargs):
+    bump_index_version()
+    if not transaction.get_autocommit():
+        transaction.on_commit(bump_index_version)
+
+
+def autocomplete_updating(sender, values, **kwargs):
+    """``rows_updating`` receiver: invalidate once an UPDATE of indexed columns ran."""
+    if updated_fields(sender, values) & set(INDEXED_FIELDS):
+        return invalidate_autocomplete
+    return None
+
+
+def connect_signals():
+    from .models import Student
+
+    post_save.connect(invalidate_autocomplete, sender=Student, dispatch_uid='autocomplete-save-student')
+    post_delete.connect(invalidate_autocomplete, sender=Student, dispatch_uid='autocomplete-delete-student')
+    rows_created.connect(invalidate_autocomplete, sender=Student, dispatch_uid='autocomplete-bulk-create-student')
+    rows_updating.connect(autocomplete_updating, sender=Student, dispatch_uid='autocomplete-update-student')
@@ -1,3 +1,76 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .autocomplete import StudentIndex, get_student_index
+from .models import Student
+
+
+class StudentAutocompleteTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for number, name, email in [
+            ('S0001', 'Alice Smith', 'alice.smith@example.edu'),
+            ('S0002', 'Alina Brown', 'abrown@example.edu'),
+            ('S0010', 'Bob Alibek', 'bob@example.edu'),
+            ('T0001', 'Carol White', 'cw@example.edu'),
+        ]:
+            Student.objects.create(name=name, student_number=number, email=email, enrollment_year=2022)
+
+    def autocomplete(self, q, **params):
+        response = self.client.get('/api/students/autocomplete/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [student['student_number'] for student in response.json()]
+
+    def test_matches_name_number_and_email(self):
+        self.assertEqual(self.autocomplete('ali'), ['S0001', 'S0002', 'S0010'])
+        self.assertEqual(self.autocomplete('s00'), ['S0001', 'S0002', 'S0010'])
+        self.assertEqual(self.autocomplete('abrown@'), ['S0002'])
+        self.assertEqual(self.autocomplete('smi ali'), ['S0001'])
+        self.assertEqual(self.autocomplete('ali', limit=1), ['S0001'])
+        self.assertEqual(self.autocomplete('zzz'), [])
+
+    def test_index_follows_writes(self):
+        self.assertEqual(self.autocomplete('dave'), [])
+        Student.objects.create(name='Dave Green', student_number='S0099', email='dg@example.edu', enrollment_year=2023)
+        self.assertEqual(self.autocomplete('dave'), ['S0099'])
+        Student.objects.get(student_number='S0099').delete()
+        self.assertEqual(self.autocomplete('dave'), [])
+
+    def test_requires_query(self):
+        self.assertEqual(self.client.get('/api/students/autocomplete/').status_code, 400)
+
+    def test_bulk_writes_refresh_index(self):
+        self.assertEqual(self.autocomplete('dave'), [])
+        Student.objects.bulk_create([
+            Student(name='Dave Green', student_number='S0099', email='dg@example.edu', enrollment_year=2023)
+        ])
+        self.assertEqual(self.autocomplete('dave'), ['S0099'])
+        Student.objects.filter(student_number='S0099').update(name='Erin Green')
+        self.assertEqual(self.autocomplete('dave'), [])
+        self.assertEqual(self.autocomplete('erin'), ['S0099'])
+
+    def test_large_index(self):
+        rows = [
+            (i, f'Student{i % 97} Family{i}', f'S{i:06d}', f'student{i}@example.edu')
+            for i in range(5000)
+        ]
+        index = StudentIndex(rows)
+        for query, limit in [('stu', 10), ('s0012', 20), ('family12', 200), ('student5 fam', 500), ('zzz', 10)]:
+            terms = query.split()
+            expected = {
+                student_id for student_id, name, number, email in rows
+                if any(value.lower().startswith(query) for value in (name, number, email))
+                or all(
+                    any(word.startswith(term) for word in f'{name} {email.split("@")[0]}'.lower().split())
+                    for term in terms
+                )
+            }
+            found = [student['id'] for student in index.search(query, limit=limit)]
+            self.assertEqual(len(found), min(limit, len(expected)), query)
+            self.assertLessEqual(set(found), expected, query)
+
+        # Once built, lookups never touch the database
+        self.autocomplete('ali')
+        with self.assertNumQueries(0):
+            get_student_index().search('ali')
+            get_student_index().search('s00')
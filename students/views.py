@@ -1,15 +1,31 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Student
+from outcomes.expand import ExpandMixin
+from outcomes.sync import UpdatedSinceMixin
+from .autocomplete import get_student_index
 from .serializers import StudentSerializer
 
-class StudentViewSet(viewsets.ModelViewSet):
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+class StudentViewSet(ExpandMixin, UpdatedSinceMixin, viewsets.ModelViewSet):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
+    # The student list has always been one unpaginated page
+    pagination_class = None
 
-    def list(self, request, *args, **kwargs):
-        students = self.get_queryset()
-        serializer = self.get_serializer(students, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Top matches for ?q= by name, student number or email prefix"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), AUTOCOMPLETE_MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
 
+        return Response(get_student_index().search(query, limit=max(limit, 1)))